@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark the job text extraction stage of generate_claude_jobs.py
+Runs extract_job_fields() over a corpus of search-result postings and compares it with the per-field
+extractors it replaced (kept in benchmark_job_extraction_baseline.py), which lowercase and rescan the text per field
+"""
+
+import argparse
+import json
+import random
+import time
+
+import benchmark_job_extraction_baseline as baseline
+import generate_claude_jobs as jobs
+
+DEFAULT_CORPUS_SIZE = 3000
+DEFAULT_REPEAT = 5
+
+# Title/snippet shapes seen in Serper results, filled from the recorded docs/claude-jobs.json
+TITLE_TEMPLATES = [
+    '{title} at {company}',
+    '{company} hiring {title} in {city}',
+    '{company}: {title} - LinkedIn',
+    '{title} - {company} - Indeed',
+    'View {title} - Glassdoor',
+    '{title}',
+    'Jobs, Employment in {city} | Indeed.com',
+]
+SNIPPET_TEMPLATES = [
+    '{description} Salary ${salary}k. {city}.',
+    '{company} is hiring a {title}. {description}',
+    'Remote role using Claude Code. {description}',
+    '{description} Based in {city}, {state}.',
+    'Join {company} as a {title}. Apply now.',
+]
+CITIES = ['Seattle', 'San Francisco', 'Chicago', 'Boston', 'Austin', 'Denver', 'Portland', 'Miami', 'Berlin']
+STATES = ['WA', 'CA', 'IL', 'MA', 'TX', 'CO', 'OR', 'FL']
+
+def load_postings(corpus_path):
+    """Load a JSON Lines corpus of {"title", "snippet", "link"} postings"""
+    with open(corpus_path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def synthesize_postings(size, seed=0, jobs_path='docs/claude-jobs.json'):
+    """
+    Build a deterministic corpus of `size` postings by recombining the titles, companies,
+    descriptions and links recorded in docs/claude-jobs.json with common Serper result shapes.
+    """
+    with open(jobs_path, 'r', encoding='utf-8') as f:
+        recorded = json.load(f)['jobs']
+
+    rng = random.Random(seed)
+    postings = []
+    for _ in range(size):
+        job = rng.choice(recorded)
+        values = {
+            'title': job.get('job_title') or 'Software Engineer',
+            'company': job.get('company') or 'Acme',
+            'description': job.get('description') or '',
+            'city': rng.choice(CITIES),
+            'state': rng.choice(STATES),
+            'salary': rng.randint(80, 300),
+        }
+        postings.append({
+            'title': rng.choice(TITLE_TEMPLATES).format(**values),
+            'snippet': rng.choice(SNIPPET_TEMPLATES).format(**values),
+            'link': job.get('job_link') or '',
+        })
+    return postings
+
+def extract_per_field(title, snippet, link):
+    """The per-field path of the previous implementation: every extractor derives its own text and lowercase copy"""
+    full_text = f"{title} {snippet}"
+    return {
+        'company': baseline.extract_company_name_improved(title, snippet, link),
+        'job_title': baseline.extract_job_title(title, snippet),
+        'location': baseline.extract_location_improved(title, snippet),
+        'salary': baseline.extract_salary_from_text(snippet),
+        'is_claude_code_related': baseline.is_claude_code_related(full_text),
+        'is_job_posting': baseline.is_job_posting(full_text)
+    }
+
+def time_extractor(extractor, postings, repeat):
+    """Best-of-`repeat` seconds for one pass of extractor over all postings"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for posting in postings:
+            extractor(posting['title'], posting['snippet'], posting['link'])
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark job text extraction over a corpus of postings")
+    parser.add_argument(
+        "--corpus",
+        metavar="PATH",
+        help="JSON Lines file of {\"title\", \"snippet\", \"link\"} postings (default: synthesized from docs/claude-jobs.json)",
+    )
+    parser.add_argument(
+        "--size",
+        type=int,
+        default=DEFAULT_CORPUS_SIZE,
+        help=f"Number of postings to synthesize when no corpus is given (default: {DEFAULT_CORPUS_SIZE})",
+    )
+    parser.add_argument(
+        "--save-corpus",
+        metavar="PATH",
+        help="Write the corpus used to PATH as JSON Lines, so later runs can replay it with --corpus",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=DEFAULT_REPEAT,
+        help=f"Passes over the corpus per extractor; the best one is reported (default: {DEFAULT_REPEAT})",
+    )
+    args = parser.parse_args(argv)
+
+    postings = load_postings(args.corpus) if args.corpus else synthesize_postings(args.size)
+    if args.save_corpus:
+        with open(args.save_corpus, 'w', encoding='utf-8') as f:
+            for posting in postings:
+                f.write(json.dumps(posting, ensure_ascii=False) + '\n')
+        print(f"📄 Corpus written to {args.save_corpus}")
+
+    # The current stage must reproduce the previous extractors before their timings mean anything
+    for posting in postings:
+        fields = jobs.extract_job_fields(posting['title'], posting['snippet'], posting['link'])
+        if fields != extract_per_field(posting['title'], posting['snippet'], posting['link']):
+            raise SystemExit(f"❌ Extraction mismatch for posting: {posting}")
+
+    print(f"🔍 Benchmarking job text extraction over {len(postings)} postings (best of {args.repeat})")
+    results = [
+        ('extract_job_fields', time_extractor(jobs.extract_job_fields, postings, args.repeat)),
+        ('per-field extractors', time_extractor(extract_per_field, postings, args.repeat)),
+    ]
+    for name, seconds in results:
+        print(f"  - {name}: {seconds * 1000:.1f}ms ({len(postings) / seconds:,.0f} postings/s)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+The job text extractors of generate_claude_jobs.py as they were before extract_job_fields()
+Kept verbatim so benchmark_job_extraction.py can check the current stage against them and time both
+"""
+
+import re
+
+def is_job_posting(text):
+    """Check if text looks like a job posting"""
+    job_indicators = [
+        'hiring', 'job', 'position', 'career', 'apply', 'join',
+        'engineer', 'developer', 'programmer', 'architect',
+        'we are looking', 'seeking', 'opportunity', 'role'
+    ]
+    text_lower = text.lower()
+    return any(indicator in text_lower for indicator in job_indicators)
+
+def extract_company_name_improved(title, snippet, link):
+    """Improved company name extraction"""
+
+    # Priority: Check for Anthropic first (most common)
+    if 'anthropic' in (title + snippet + link).lower():
+        return 'Anthropic'
+
+    # LinkedIn specific extraction
+    if 'linkedin.com/jobs/view/' in link:
+        # Extract from URL - LinkedIn URLs often contain company info
+        # Format: linkedin.com/jobs/view/job-title-at-company-name-jobid
+        url_parts = link.split('-at-')
+        if len(url_parts) > 1:
+            company_part = url_parts[1].split('-')[0]  # Get first part after -at-
+            if company_part and len(company_part) > 2:
+                return company_part.replace('-', ' ').title()
+
+        # Extract from title patterns like "Job Title at Company Name"
+        at_match = re.search(r'\s+at\s+([^-\d]+)', title)
+        if at_match:
+            company = at_match.group(1).strip()
+            # Clean up common LinkedIn patterns
+            company = re.sub(r'\s*\d+$', '', company)  # Remove trailing numbers
+            company = re.sub(r'\s+\d+$', '', company)  # Remove numbers at end
+            if len(company) > 2 and company.lower() not in ['view', 'join', 'apply']:
+                return company
+
+    # Extract from title patterns
+    hiring_patterns = [
+        r'([A-Z][a-zA-Z\s&.]+)\s+hiring\s+',
+        r'^([A-Z][a-zA-Z\s&.]+):\s+',
+        r'Join\s+([A-Z][a-zA-Z\s&.]+)',
+        r'([A-Z][a-zA-Z\s&.]+)\s+is\s+looking',
+        r'([A-Z][a-zA-Z\s&.]+)\s+seeks?',
+    ]
+
+    for pattern in hiring_patterns:
+        match = re.search(pattern, title)
+        if match:
+            company = match.group(1).strip()
+            if len(company) > 2 and company not in ['View', 'Join', 'Apply', 'Software', 'Senior']:
+                return company
+
+    # Extract from snippet
+    snippet_patterns = [
+        r'Jobs at ([A-Z][a-zA-Z\s&.]+)',
+        r'([A-Z][a-zA-Z\s&.]+) is hiring',
+        r'Work at ([A-Z][a-zA-Z\s&.]+)',
+        r'Join ([A-Z][a-zA-Z\s&.]+)',
+    ]
+
+    for pattern in snippet_patterns:
+        match = re.search(pattern, snippet)
+        if match:
+            company = match.group(1).strip()
+            if len(company) > 2:
+                return company
+
+    # Check if it's a well-known company based on domain or context
+    known_companies = {
+        'google': 'Google',
+        'microsoft': 'Microsoft',
+        'meta': 'Meta',
+        'apple': 'Apple',
+        'amazon': 'Amazon',
+        'openai': 'OpenAI',
+        'github': 'GitHub',
+        'stripe': 'Stripe',
+        'shopify': 'Shopify'
+    }
+
+    text_lower = (title + snippet + link).lower()
+    for keyword, company_name in known_companies.items():
+        if keyword in text_lower:
+            return company_name
+
+    return 'Unknown Company'
+
+def extract_job_title(title, snippet):
+    """Extract job title from search result"""
+
+    # LinkedIn format: "Job Title at Company"
+    at_match = re.search(r'^(.+?)\s+at\s+', title)
+    if at_match:
+        return at_match.group(1).strip()
+
+    # Anthropic hiring format: "Anthropic hiring Job Title in Location"
+    hiring_match = re.search(r'hiring\s+(.+?)\s+in\s+', title)
+    if hiring_match:
+        return hiring_match.group(1).strip()
+
+    # Company: Job Title format
+    colon_match = re.search(r':\s+(.+?)\s+-', title)
+    if colon_match:
+        return colon_match.group(1).strip()
+
+    # Extract from title before dash
+    dash_match = re.search(r'^(.+?)\s+-\s+', title)
+    if dash_match:
+        job_title = dash_match.group(1).strip()
+        # Clean up common patterns
+        job_title = re.sub(r'^(View|Apply to|Join)\s+', '', job_title)
+        if len(job_title) > 5:
+            return job_title
+
+    # Fallback: use full title if it looks like a job title
+    if any(keyword in title.lower() for keyword in ['engineer', 'developer', 'manager', 'analyst', 'scientist', 'architect']):
+        return title.strip()
+
+    return None
+
+def extract_location_improved(title, snippet):
+    """Improved location extraction"""
+    text = f"{title} {snippet}"
+
+    # Remote indicators
+    if any(keyword in text.lower() for keyword in ['remote', 'anywhere', 'distributed', 'work from home']):
+        return 'Remote'
+
+    # City, State patterns
+    city_state_patterns = [
+        r'in\s+([A-Z][a-z]+,\s*[A-Z]{2})',  # "in Seattle, WA"
+        r'([A-Z][a-z]+,\s*[A-Z]{2})\s+',    # "Seattle, WA "
+        r'([San Francisco|New York|Los Angeles|Chicago|Boston|Austin|Denver],\s*[A-Z]{2})',
+    ]
+
+    for pattern in city_state_patterns:
+        match = re.search(pattern, text)
+        if match:
+            return match.group(1)
+
+    # Major cities without state
+    major_cities = ['Seattle', 'Francisco', 'Chicago', 'Boston', 'Austin', 'Denver', 'Portland', 'Miami']
+    for city in major_cities:
+        if city in text:
+            return f"{city}"
+
+    return 'On-site'
+
+def extract_salary_from_text(text):
+    """Extract salary information from job description text"""
+    if not text:
+        return 0
+
+    # Look for common salary patterns
+    salary_patterns = [
+        r'\$(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s*(?:k|thousand)',
+        r'\$(\d{1,3}(?:,\d{3})*)',
+        r'(\d{1,3})k',
+    ]
+
+    for pattern in salary_patterns:
+        matches = re.findall(pattern, text.lower())
+        if matches:
+            try:
+                salary = int(matches[0].replace(',', '').replace('.', ''))
+                if 'k' in text.lower() or 'thousand' in text.lower():
+                    salary *= 1000
+                return salary
+            except:
+                continue
+
+    return 0
+
+def is_claude_code_related(text):
+    """
+    Check if text specifically mentions Claude (very strict filtering)
+    """
+    if not text:
+        return False
+
+    text_lower = str(text).lower()
+
+    # ONLY Claude-specific keywords - must contain "claude"
+    claude_keywords = [
+        'claude code', 'claude-code', 'anthropic claude', 'claude ai',
+        'claude coder', 'claude assistant', 'claude developer', 'claude engineer',
+        'work with claude', 'using claude', 'claude experience', 'claude integration'
+    ]
+
+    # Must explicitly mention Claude in some form
+    has_claude_mention = any(keyword in text_lower for keyword in claude_keywords)
+
+    # Additional check: just "claude" + job context
+    has_claude_word = 'claude' in text_lower
+    job_words = ['hiring', 'position', 'engineer', 'developer', 'role', 'job', 'career', 'experience', 'skills']
+    has_job_context = any(word in text_lower for word in job_words)
+
+    # Return True only if Claude is mentioned AND it's in a job context
+    return has_claude_mention or (has_claude_word and has_job_context)
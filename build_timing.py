@@ -0,0 +1,104 @@
+"""
+Phase timing and profiling helpers shared by the catalog and jobs generators
+(generate_components_json.py, generate_agents_api.py, generate_claude_jobs.py).
+"""
+
+import os
+import json
+import time
+import cProfile
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+class BuildTimer:
+    """
+    Collects wall time, item counts and bytes per named phase (bytes read for input phases,
+    bytes written for serialization).
+    Entering the same phase again accumulates into it, so per-item work can be timed in a loop.
+    """
+
+    def __init__(self, script_name):
+        self.script_name = script_name
+        self.started_at = datetime.now(timezone.utc)
+        self.start = time.perf_counter()
+        self.phases = {}
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time a block as `name`. Yields a dict whose 'count' and 'bytes' the block can increment.
+        """
+        stats = {'count': 0, 'bytes': 0}
+        start = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            self.record(name, time.perf_counter() - start, stats['count'], stats['bytes'])
+
+    def record(self, name, seconds, count=0, bytes_read=0):
+        phase = self.phases.setdefault(name, {'name': name, 'seconds': 0.0, 'count': 0, 'bytes': 0, 'calls': 0})
+        phase['seconds'] += seconds
+        phase['count'] += count
+        phase['bytes'] += bytes_read
+        phase['calls'] += 1
+
+    def report(self):
+        return {
+            'script': self.script_name,
+            'startedAt': self.started_at.isoformat(),
+            'totalSeconds': round(time.perf_counter() - self.start, 6),
+            'phases': [
+                {**phase, 'seconds': round(phase['seconds'], 6)}
+                for phase in self.phases.values()
+            ]
+        }
+
+    def write_report(self, report_path):
+        """
+        Write the timing report as JSON and print a one-line-per-phase summary.
+        """
+        report = self.report()
+
+        report_dir = os.path.dirname(report_path)
+        if report_dir:
+            os.makedirs(report_dir, exist_ok=True)
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+        print(f"\n⏱️ Timing report written to {report_path} ({report['totalSeconds']:.2f}s total)")
+        for phase in report['phases']:
+            print(f"  - {phase['name']}: {phase['seconds']:.3f}s, {phase['count']} items, {phase['bytes']} bytes")
+
+@contextmanager
+def profiled(profile_path):
+    """
+    Run the block under cProfile and dump the stats to profile_path (a no-op when it's None).
+    Inspect the dump with `python -m pstats <file>` or snakeviz.
+    """
+    if not profile_path:
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(profile_path)
+        print(f"📈 cProfile stats written to {profile_path}")
+
+def add_timing_arguments(parser):
+    """
+    Add the --timing-report and --profile options shared by the generator scripts.
+    """
+    parser.add_argument(
+        "--timing-report",
+        metavar="PATH",
+        help="Write a JSON report with wall time, counts and bytes per phase",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        help="Run under cProfile and dump the stats to PATH",
+    )
@@ -0,0 +1,36 @@
+"""
+In-memory model of the component catalog shared by the generator scripts.
+
+generate_components_json.py builds it once while scanning, and the API generators
+(generate_agents_api.py) project their files from it in the same run instead of
+re-reading and re-parsing docs/components.json.
+"""
+
+import json
+
+class Catalog:
+    """
+    The component catalog keyed by type ('agents', 'commands', ...), queryable by type.
+    Entries are the catalog index records: every components.json field except `content`.
+    Non-list top-level values (marketplace metadata) are kept as-is in `metadata`.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.metadata = {key: value for key, value in data.items() if not isinstance(value, list)}
+
+    @classmethod
+    def from_json_file(cls, path):
+        """
+        Load a catalog from docs/components-index.json or the full docs/components.json.
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def types(self):
+        """Component types present in the catalog, in catalog order"""
+        return [key for key, value in self.data.items() if isinstance(value, list)]
+
+    def components(self, component_type):
+        """All entries of a type, in catalog order (empty if the type is unknown)"""
+        return self.data.get(component_type, [])
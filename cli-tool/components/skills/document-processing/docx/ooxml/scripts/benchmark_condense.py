@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Benchmark pack.py's condense_xml against the defusedxml.minidom condenser it replaced.
+
+Runs both on representative .docx, .pptx and .xlsx parts, pretty-printed the way
+unpack.py leaves them, and reports time and peak memory for each. Parts are
+synthesized at a size set by --scale, or taken from real documents with --document.
+
+Example usage:
+    python benchmark_condense.py [--document <office_file> ...] [--scale 1.0] [--repeat 3]
+"""
+
+import argparse
+import multiprocessing
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+import defusedxml.minidom
+import lxml.etree
+
+from pack import condense_xml_bytes
+
+try:
+    import resource
+except ImportError:  # Windows: peak memory is not reported
+    resource = None
+
+DEFAULT_SCALE = 1.0
+DEFAULT_REPEAT = 3
+# Largest XML parts benchmarked from each --document
+PARTS_PER_DOCUMENT = 3
+
+W_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+P_NAMESPACE = "http://schemas.openxmlformats.org/presentationml/2006/main"
+A_NAMESPACE = "http://schemas.openxmlformats.org/drawingml/2006/main"
+S_NAMESPACE = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+R_NAMESPACE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark condense_xml against the minidom condenser"
+    )
+    parser.add_argument(
+        "--document",
+        action="append",
+        default=[],
+        metavar="OFFICE_FILE",
+        help="Benchmark the largest XML parts of this .docx/.pptx/.xlsx file "
+        "instead of synthesized parts (repeatable)",
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=DEFAULT_SCALE,
+        help="Size of the synthesized parts; 1.0 is a few MB each "
+        f"(default: {DEFAULT_SCALE})",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=DEFAULT_REPEAT,
+        help="Runs per condenser and part; the best is reported "
+        f"(default: {DEFAULT_REPEAT})",
+    )
+    args = parser.parse_args()
+
+    if args.document:
+        parts = []
+        for document in args.document:
+            parts.extend(document_parts(document))
+    else:
+        parts = synthesized_parts(args.scale)
+
+    condensers = [
+        ("minidom", condense_with_minidom),
+        ("condense_xml", condense_xml_bytes),
+    ]
+    width = max(len(label) for label, _ in parts)
+    print(
+        f"{'part':<{width}} {'size':>9}"
+        + "".join(f"{name:>20}" for name, _ in condensers)
+    )
+    differing = []
+    for label, data in parts:
+        cells = []
+        for _, condenser in condensers:
+            seconds, peak = measure(condenser, data, args.repeat)
+            memory = "" if peak is None else f"  +{peak / 2**20:,.0f} MB"
+            cells.append(f"{seconds:.2f}s{memory}")
+        print(
+            f"{label:<{width}} {format_size(len(data)):>9}"
+            + "".join(f"{cell:>20}" for cell in cells)
+        )
+
+        minidom_output = canonical(condense_with_minidom(data))
+        if minidom_output != canonical(condense_xml_bytes(data)):
+            differing.append(label)
+
+    for label in differing:
+        print(
+            f"Note: output differs for {label}; minidom drops whitespace-only text "
+            'that condense_xml keeps under xml:space="preserve"'
+        )
+
+
+def measure(condenser, data, repeat):
+    """Best time of repeat runs and peak memory growth (bytes, or None) of condenser.
+
+    Each measurement runs in a freshly spawned process, so peak memory is not
+    inherited from this one or shared between condensers.
+    """
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(_measure_in_process, condenser, data, repeat).result()
+
+
+def _measure_in_process(condenser, data, repeat):
+    baseline = _max_rss()
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        condenser(data)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    if baseline is None:
+        return best, None
+    return best, _max_rss() - baseline
+
+
+def _max_rss():
+    """Peak resident memory of this process in bytes, or None if unknown."""
+    # ru_maxrss survives exec on Linux, so it would include the parent's peak
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def condense_with_minidom(data):
+    """The condenser pack.py used before condense_xml_stream, for comparison."""
+    dom = defusedxml.minidom.parseString(data)
+
+    # Process each element to remove whitespace and comments
+    for element in dom.getElementsByTagName("*"):
+        # Skip w:t elements and their processing
+        if element.tagName.endswith(":t"):
+            continue
+
+        # Remove whitespace-only text nodes and comment nodes
+        for child in list(element.childNodes):
+            if (
+                child.nodeType == child.TEXT_NODE
+                and child.nodeValue
+                and child.nodeValue.strip() == ""
+            ) or child.nodeType == child.COMMENT_NODE:
+                element.removeChild(child)
+
+    return dom.toxml(encoding="UTF-8")
+
+
+def canonical(data):
+    return lxml.etree.tostring(lxml.etree.fromstring(data), method="c14n")
+
+
+def format_size(size):
+    if size >= 2**20:
+        return f"{size / 2**20:.1f} MB"
+    return f"{size / 2**10:.1f} KB"
+
+
+def document_parts(document):
+    """(label, pretty-printed bytes) of the largest XML parts of an Office file."""
+    with zipfile.ZipFile(document) as zf:
+        members = [
+            info
+            for info in zf.infolist()
+            if info.filename.endswith((".xml", ".rels"))
+        ]
+        members.sort(key=lambda info: info.file_size, reverse=True)
+        parts = []
+        for info in members[:PARTS_PER_DOCUMENT]:
+            # Pretty-print like unpack.py does
+            dom = defusedxml.minidom.parseString(zf.read(info))
+            data = dom.toprettyxml(indent="  ", encoding="ascii")
+            parts.append((f"{document}:{info.filename}", data))
+    return parts
+
+
+def synthesized_parts(scale):
+    """(label, pretty-printed bytes) of a docx, pptx and xlsx part each."""
+    return [
+        ("docx word/document.xml", synthesize_document(int(20000 * scale))),
+        ("pptx ppt/slides/slide1.xml", synthesize_slide(int(4000 * scale))),
+        ("xlsx xl/worksheets/sheet1.xml", synthesize_sheet(int(5000 * scale))),
+        ("xlsx xl/sharedStrings.xml", synthesize_shared_strings(int(40000 * scale))),
+    ]
+
+
+def synthesize_document(paragraphs):
+    lines = [f'<w:document xmlns:w="{W_NAMESPACE}">', "  <w:body>"]
+    for i in range(paragraphs):
+        lines += [
+            "    <w:p>",
+            "      <w:pPr>",
+            '        <w:pStyle w:val="BodyText"/>',
+            "      </w:pPr>",
+            "      <w:r>",
+            "        <w:rPr>",
+            "          <w:b/>",
+            "        </w:rPr>",
+            f"        <w:t>Paragraph {i}</w:t>",
+            "      </w:r>",
+            "      <w:r>",
+            f'        <w:t xml:space="preserve"> with some text &amp; a {{{{tag}}}} </w:t>',
+            "      </w:r>",
+            "    </w:p>",
+        ]
+    lines += ["  </w:body>", "</w:document>"]
+    return _pretty_part(lines)
+
+
+def synthesize_slide(shapes):
+    lines = [
+        f'<p:sld xmlns:a="{A_NAMESPACE}" xmlns:p="{P_NAMESPACE}" xmlns:r="{R_NAMESPACE}">',
+        "  <p:cSld>",
+        "    <p:spTree>",
+    ]
+    for i in range(shapes):
+        lines += [
+            "      <p:sp>",
+            "        <p:nvSpPr>",
+            f'          <p:cNvPr id="{i + 2}" name="TextBox {i}"/>',
+            '          <p:cNvSpPr txBox="1"/>',
+            "          <p:nvPr/>",
+            "        </p:nvSpPr>",
+            "        <p:spPr>",
+            "          <a:xfrm>",
+            f'            <a:off x="0" y="{i * 100}"/>',
+            '            <a:ext cx="100" cy="100"/>',
+            "          </a:xfrm>",
+            "        </p:spPr>",
+            "        <p:txBody>",
+            "          <a:bodyPr/>",
+            "          <a:p>",
+            "            <a:r>",
+            '              <a:rPr lang="en-US" dirty="0"/>',
+            f"              <a:t>Shape {i} text</a:t>",
+            "            </a:r>",
+            "          </a:p>",
+            "        </p:txBody>",
+            "      </p:sp>",
+        ]
+    lines += ["    </p:spTree>", "  </p:cSld>", "</p:sld>"]
+    return _pretty_part(lines)
+
+
+def synthesize_sheet(rows):
+    lines = [f'<worksheet xmlns="{S_NAMESPACE}">', "  <sheetData>"]
+    for row in range(1, rows + 1):
+        lines.append(f'    <row r="{row}">')
+        for column in "ABCDEFGH":
+            lines += [
+                f'      <c r="{column}{row}" t="n">',
+                f"        <v>{row * 8 + ord(column)}</v>",
+                "      </c>",
+            ]
+        lines.append("    </row>")
+    lines += ["  </sheetData>", "</worksheet>"]
+    return _pretty_part(lines)
+
+
+def synthesize_shared_strings(strings):
+    lines = [f'<sst xmlns="{S_NAMESPACE}" count="{strings}" uniqueCount="{strings}">']
+    for i in range(strings):
+        # Shared strings use unprefixed <t>; with xml:space="preserve" their spaces
+        # are content, including strings that are nothing but a space
+        text = " " if i % 10 == 0 else f" Item {i} "
+        lines += ["  <si>", f'    <t xml:space="preserve">{text}</t>', "  </si>"]
+    lines.append("</sst>")
+    return _pretty_part(lines)
+
+
+def _pretty_part(lines):
+    return (XML_DECLARATION + "\n".join(lines) + "\n").encode("utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,14 +7,47 @@ Example usage:
 """
 
 import argparse
+import copy
+import hashlib
+import io
+import json
+import os
+import re
 import shutil
 import subprocess
 import sys
 import tempfile
-import defusedxml.minidom
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import lxml.etree
+
+# Office expects [Content_Types].xml to be the first member of the package
+CONTENT_TYPES_NAME = "[Content_Types].xml"
+
+# Members whose XML is condensed before packing
+XML_SUFFIXES = (".xml", ".rels")
+
+# Written by unpack.py into the directory it unpacks to: the package unpacked, and each
+# member's CRC there plus the sha256 and size of the file it was unpacked to (both None
+# for members a selective unpack left in the package). Never packed itself.
+MANIFEST_NAME = ".unpack-manifest.json"
+MANIFEST_VERSION = 1
+
+# Read size for copying and hashing members
+COPY_CHUNK_SIZE = 1 << 20
+
+# Below this many XML parts, condensing in this process is faster than starting a pool
+MIN_PARALLEL_XML_PARTS = 16
+
+XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
+XML_SPACE = f"{{{XML_NAMESPACE}}}space"
+
+# Characters that must be escaped when condensed XML is written back out
+TEXT_ESCAPES = re.compile(r"[&<>\r]")
+ATTRIBUTE_ESCAPES = re.compile(r'[&<>\r"\n\t]')
+
 
 def main():
     parser = argparse.ArgumentParser(description="Pack a directory into an Office file")
@@ -42,13 +75,20 @@ def main():
         sys.exit(f"Error: {e}")
 
 
-def pack_document(input_dir, output_file, validate=False):
+def pack_document(input_dir, output_file, validate=False, workers=None):
     """Pack a directory into an Office file (.docx/.pptx/.xlsx).
 
+    XML parts are condensed as they are written into the zip (in a process pool for
+    larger packages) along with every other file; the input directory is never
+    modified. If unpack.py left a manifest in input_dir, members that are unchanged
+    since unpacking, or that a selective unpack never extracted, are copied from the
+    original package as they were.
+
     Args:
         input_dir: Path to unpacked Office document directory
         output_file: Path to output Office file
         validate: If True, validates with soffice (default: False)
+        workers: Processes condensing XML parts (default: os.cpu_count())
 
     Returns:
         bool: True if successful, False if validation failed
@@ -61,32 +101,198 @@ def pack_document(input_dir, output_file, validate=False):
     if output_file.suffix.lower() not in {".docx", ".pptx", ".xlsx"}:
         raise ValueError(f"{output_file} must be a .docx, .pptx, or .xlsx file")
 
-    # Work in temporary directory to avoid modifying original
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_content_dir = Path(temp_dir) / "content"
-        shutil.copytree(input_dir, temp_content_dir)
+    manifest = read_manifest(input_dir)
+    original = None
+    if manifest is not None and Path(manifest["source"]).is_file():
+        original = zipfile.ZipFile(manifest["source"], "r")
 
-        # Process XML files to remove pretty-printing whitespace
-        for pattern in ["*.xml", "*.rels"]:
-            for xml_file in temp_content_dir.rglob(pattern):
-                condense_xml(xml_file)
+    # Packing back onto the package members are copied from: write a temp file next to
+    # it and only replace the package once the new one is complete and valid
+    package_file = output_file
+    if original is not None and output_file.exists():
+        if output_file.samefile(manifest["source"]):
+            fd, temp_name = tempfile.mkstemp(
+                suffix=output_file.suffix, dir=output_file.parent
+            )
+            os.close(fd)
+            output_file = Path(temp_name)
+
+    try:
+        if manifest is None:
+            members = list_package_members(input_dir)
+        else:
+            members = merge_package_members(input_dir, manifest, original)
+        xml_files = [
+            path
+            for name, path in members
+            if isinstance(path, Path) and name.endswith(XML_SUFFIXES)
+        ]
+        workers = min(workers or os.cpu_count() or 1, len(xml_files))
 
         # Create final Office file as zip archive
         output_file.parent.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
-            for f in temp_content_dir.rglob("*"):
-                if f.is_file():
-                    zf.write(f, f.relative_to(temp_content_dir))
-
-        # Validate if requested
-        if validate:
-            if not validate_document(output_file):
-                output_file.unlink()  # Delete the corrupt file
-                return False
+        if workers > 1 and len(xml_files) >= MIN_PARALLEL_XML_PARTS:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                chunksize = max(1, len(xml_files) // (workers * 4))
+                condensed = pool.map(condense_xml_file, xml_files, chunksize=chunksize)
+                write_package(output_file, members, condensed, original=original)
+        else:
+            write_package(output_file, members, original=original)
+    except BaseException:
+        if output_file != package_file:
+            output_file.unlink(missing_ok=True)
+        raise
+    finally:
+        if original is not None:
+            original.close()
 
+    # Validate if requested
+    if validate:
+        if not validate_document(output_file):
+            output_file.unlink()  # Delete the corrupt file
+            return False
+
+    if output_file != package_file:
+        shutil.copymode(package_file, output_file)
+        os.replace(output_file, package_file)
     return True
 
 
+def list_package_members(input_dir):
+    """(member name, path) of every file under input_dir, [Content_Types].xml first."""
+    members = []
+    for dir_path, dir_names, file_names in os.walk(input_dir):
+        dir_names.sort()
+        for file_name in sorted(file_names):
+            path = Path(dir_path) / file_name
+            members.append((path.relative_to(input_dir).as_posix(), path))
+
+    members = [member for member in members if member[0] != MANIFEST_NAME]
+    members.sort(key=lambda member: member[0] != CONTENT_TYPES_NAME)
+    return members
+
+
+def merge_package_members(input_dir, manifest, original):
+    """Package members of an unpacked directory with a manifest, in original order.
+
+    A member is its path under input_dir if it was added or changed since unpacking,
+    or its zipfile.ZipInfo in original if it is unchanged or was never unpacked.
+    Members unpacked and then deleted are left out. original may be None if the
+    package is gone, as long as every member is in input_dir.
+    """
+    files = dict(list_package_members(input_dir))
+    source = manifest["source"]
+
+    members = []
+    for entry in manifest["members"]:
+        name = entry["name"]
+        path = files.pop(name, None)
+        if path is None and entry["sha256"] is not None:
+            # Deleted after unpacking
+            continue
+
+        # The member as it was unpacked, if original still has it
+        zip_info = None
+        if original is not None:
+            try:
+                zip_info = original.getinfo(name)
+            except KeyError:
+                pass
+            if zip_info is not None and zip_info.CRC != entry["crc"]:
+                zip_info = None
+
+        if path is None:
+            if original is None:
+                raise ValueError(f"{source} not found; {name} was never unpacked")
+            if zip_info is None:
+                raise ValueError(f"{source} has changed since it was unpacked")
+            members.append((name, zip_info))
+        elif zip_info is not None and is_unchanged(path, entry):
+            members.append((name, zip_info))
+        else:
+            members.append((name, path))
+
+    # Files added since unpacking
+    members.extend(files.items())
+    members.sort(key=lambda member: member[0] != CONTENT_TYPES_NAME)
+    return members
+
+
+def write_package(output_file, members, condensed_xml=None, original=None):
+    """Write members to output_file in order, condensing XML parts.
+
+    A member whose path is a zipfile.ZipInfo is copied unchanged from original.
+    condensed_xml, if given, yields the condensed bytes of each other XML member in
+    member order, so parts are written as soon as they are ready rather than
+    collected first. Otherwise each XML part is condensed straight into its zip entry.
+    """
+    if condensed_xml is not None:
+        condensed_xml = iter(condensed_xml)
+    with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, path in members:
+            if isinstance(path, zipfile.ZipInfo):
+                # Keep the original's timestamp and compression along with its bytes
+                with original.open(path) as source:
+                    with zf.open(copy.copy(path), "w") as entry:
+                        shutil.copyfileobj(source, entry, COPY_CHUNK_SIZE)
+                continue
+
+            if not name.endswith(XML_SUFFIXES):
+                zf.write(path, name)
+                continue
+
+            zip_info = zipfile.ZipInfo.from_file(path, name)
+            zip_info.compress_type = zipfile.ZIP_DEFLATED
+            if condensed_xml is not None:
+                zf.writestr(zip_info, next(condensed_xml))
+            else:
+                with open(path, "rb") as source, zf.open(zip_info, "w") as entry:
+                    condense_xml_stream(source, entry)
+
+
+def read_manifest(input_dir):
+    """The manifest unpack.py left in input_dir, or None if there is none."""
+    try:
+        with open(Path(input_dir) / MANIFEST_NAME, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"{MANIFEST_NAME} in {input_dir} is from another unpack.py")
+    return manifest
+
+
+def write_manifest(output_dir, source, members):
+    """Record where output_dir was unpacked from (see MANIFEST_NAME).
+
+    members holds one {"name", "crc", "sha256", "size"} entry per package member, in
+    package order.
+    """
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "source": str(Path(source).resolve()),
+        "members": members,
+    }
+    with open(Path(output_dir) / MANIFEST_NAME, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+
+
+def is_unchanged(path, entry):
+    """True if the file at path is as it was unpacked (see MANIFEST_NAME)."""
+    if entry["sha256"] is None or path.stat().st_size != entry["size"]:
+        return False
+    return file_sha256(path) == entry["sha256"]
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(COPY_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
 def validate_document(doc_path):
     """Validate document by converting to HTML with soffice."""
     # Determine the correct filter based on file extension
@@ -132,27 +338,177 @@ def validate_document(doc_path):
 
 def condense_xml(xml_file):
     """Strip unnecessary whitespace and remove comments."""
-    with open(xml_file, "r", encoding="utf-8") as f:
-        dom = defusedxml.minidom.parse(f)
+    condensed = condense_xml_file(xml_file)
 
-    # Process each element to remove whitespace and comments
-    for element in dom.getElementsByTagName("*"):
-        # Skip w:t elements and their processing
-        if element.tagName.endswith(":t"):
+    # Write back the condensed XML
+    with open(xml_file, "wb") as f:
+        f.write(condensed)
+
+
+def condense_xml_file(xml_file):
+    """Condensed bytes of an XML file (see condense_xml_stream)."""
+    output = io.BytesIO()
+    with open(xml_file, "rb") as f:
+        condense_xml_stream(f, output)
+    return output.getvalue()
+
+
+def condense_xml_bytes(data):
+    """Condensed bytes of an XML document (see condense_xml_stream)."""
+    output = io.BytesIO()
+    condense_xml_stream(io.BytesIO(data), output)
+    return output.getvalue()
+
+
+def condense_xml_stream(source, output):
+    """Write source's XML to the binary file output as UTF-8, condensed.
+
+    Whitespace-only text and comments are removed, except that whitespace is kept
+    where xml:space="preserve" is in effect and w:t (prefixed "t") elements keep
+    their content as is. The document is read with iterparse and written as it is
+    parsed, discarding each element once written, so memory stays flat however large
+    the part is.
+    """
+    writer = io.TextIOWrapper(output, encoding="utf-8", newline="")
+    write = writer.write
+    # (tag, prefix) -> qualified name written in tags
+    qualified_names = {}
+    # Per open element: [qualified name, start tag still open, keep whitespace,
+    # keep everything (w:t), namespace URI -> prefix in scope]
+    stack = []
+    state = None
+    prefixes = {XML_NAMESPACE: "xml"}
+    declared_namespaces = []
+    declaration_written = False
+
+    for event, node in lxml.etree.iterparse(
+        source,
+        events=("start-ns", "start", "end", "comment", "pi"),
+        resolve_entities=False,
+        no_network=True,
+    ):
+        if event == "start-ns":
+            # Declarations arrive before the start event of the element holding them
+            declared_namespaces.append(node)
             continue
 
-        # Remove whitespace-only text nodes and comment nodes
-        for child in list(element.childNodes):
-            if (
-                child.nodeType == child.TEXT_NODE
-                and child.nodeValue
-                and child.nodeValue.strip() == ""
-            ) or child.nodeType == child.COMMENT_NODE:
-                element.removeChild(child)
+        if not declaration_written:
+            # The declaration has been parsed by the time the first node arrives
+            write(_xml_declaration(node.getroottree().docinfo.standalone))
+            declaration_written = True
 
-    # Write back the condensed XML
-    with open(xml_file, "wb") as f:
-        f.write(dom.toxml(encoding="UTF-8"))
+        if event == "end":
+            last = node[-1] if len(node) else None
+            text = _kept_text(node.text if last is None else last.tail, state)
+            if text and state[1]:
+                write(">")
+            if text:
+                write(_escape_text(text))
+            write("/>" if state[1] and not text else f"</{state[0]}>")
+            node.clear(keep_tail=True)
+            stack.pop()
+            state = stack[-1] if stack else None
+            if state is not None:
+                prefixes = state[4]
+            continue
+
+        if state is not None:
+            # Text between the previous sibling (or the parent's start tag) and node
+            previous = node.getprevious()
+            if previous is None:
+                text = node.getparent().text
+            else:
+                text = previous.tail
+                # Written siblings are no longer needed
+                parent = node.getparent()
+                while node.getprevious() is not None:
+                    del parent[0]
+            text = _kept_text(text, state)
+            if state[1] and (text or event != "comment" or state[3]):
+                write(">")
+                state[1] = False
+            if text:
+                write(_escape_text(text))
+
+        if event == "start":
+            key = (node.tag, node.prefix)
+            name = qualified_names.get(key)
+            if name is None:
+                name = node.tag.rpartition("}")[2]
+                if node.prefix:
+                    name = f"{node.prefix}:{name}"
+                qualified_names[key] = name
+            write(f"<{name}")
+
+            if declared_namespaces:
+                prefixes = dict(prefixes)
+                for prefix, uri in declared_namespaces:
+                    if prefix:
+                        prefixes[uri] = prefix
+                        write(f' xmlns:{prefix}="{_escape_attribute(uri)}"')
+                    else:
+                        write(f' xmlns="{_escape_attribute(uri)}"')
+                declared_namespaces = []
+
+            for attribute, value in node.items():
+                if attribute[0] == "{":
+                    uri, _, local_name = attribute[1:].partition("}")
+                    attribute = f"{prefixes[uri]}:{local_name}"
+                write(f' {attribute}="{_escape_attribute(value)}"')
+
+            # xml:space is inherited until an element sets it again
+            space = node.get(XML_SPACE)
+            if space is None:
+                preserve = state is not None and state[2]
+            else:
+                preserve = space == "preserve"
+            verbatim = bool(node.prefix) and name.endswith(":t")
+            state = [name, True, preserve, verbatim, prefixes]
+            stack.append(state)
+        elif event == "pi" or state is None or state[3]:
+            # Processing instructions, and comments outside the root or inside w:t
+            write(lxml.etree.tostring(node, encoding="unicode", with_tail=False))
+
+    writer.flush()
+    # Leave output open for the caller
+    writer.detach()
+
+
+def _xml_declaration(standalone):
+    # lxml reports a declaration without standalone as standalone="no" (False), which
+    # is what it means anyway, so only standalone="yes" is written out
+    if not standalone:
+        return "<?xml version='1.0' encoding='UTF-8'?>\n"
+    return "<?xml version='1.0' encoding='UTF-8' standalone='yes'?>\n"
+
+
+def _kept_text(text, state):
+    """text if condensing keeps it inside state's element, else None."""
+    if text and (state[2] or state[3] or text.strip()):
+        return text
+    return None
+
+
+def _escape_text(text):
+    if TEXT_ESCAPES.search(text) is None:
+        return text
+    return (
+        text.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace(">", "&gt;")
+        .replace("\r", "&#13;")
+    )
+
+
+def _escape_attribute(value):
+    if ATTRIBUTE_ESCAPES.search(value) is None:
+        return value
+    return (
+        _escape_text(value)
+        .replace('"', "&quot;")
+        .replace("\n", "&#10;")
+        .replace("\t", "&#9;")
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,320 @@
+import shutil
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+import lxml.etree
+
+from pack import MANIFEST_NAME, condense_xml_bytes, pack_document
+from unpack import unpack_document
+
+W_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+DECLARATION = b"<?xml version='1.0' encoding='UTF-8'?>\n"
+
+# Members of the package built by make_package, as stored in the zip
+PACKAGE_MEMBERS = {
+    "[Content_Types].xml": (
+        b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        b'<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        b'<Default Extension="png" ContentType="image/png"/></Types>'
+    ),
+    "_rels/.rels": (
+        b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        b'<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/'
+        b'relationships"/>'
+    ),
+    "word/document.xml": (
+        b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        + f'<w:document xmlns:w="{W_NAMESPACE}"><w:body><w:p><w:r>'
+        "<w:t>Original</w:t></w:r></w:p></w:body></w:document>".encode()
+    ),
+    "word/styles.xml": (
+        b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        + f'<w:styles xmlns:w="{W_NAMESPACE}"/>'.encode()
+    ),
+    "word/media/image1.png": b"\x89PNG\r\n\x1a\n not really a png",
+}
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestCondenseXml(unittest.TestCase):
+
+    def assertCondensed(self, xml, expected):
+        """Condensing xml gives expected after the XML declaration"""
+        self.assertEqual(condense_xml_bytes(xml), DECLARATION + expected)
+
+    def assertSameDocument(self, xml):
+        """Condensing xml keeps its elements, attributes and namespaces, whatever
+        prefixes they use (C14N 2.0 with rewritten prefixes and stripped text)"""
+        options = {"rewrite_prefixes": True, "strip_text": True}
+        self.assertEqual(
+            lxml.etree.canonicalize(condense_xml_bytes(xml).decode(), **options),
+            lxml.etree.canonicalize(xml.decode(), **options),
+        )
+
+    def test_strips_whitespace_between_elements(self):
+        """Pretty-printing whitespace is dropped, other text is kept"""
+        self.assertCondensed(
+            b"<a>\n  <b>\n    <c>text</c>\n  </b>\n  <d> x </d>\n</a>",
+            b"<a><b><c>text</c></b><d> x </d></a>",
+        )
+
+    def test_space_preserve_is_inherited_and_reset(self):
+        """xml:space="preserve" applies to descendants until xml:space="default" """
+        self.assertCondensed(
+            b'<r xml:space="preserve">\n'
+            b"  <a> <b/> </a>\n"
+            b'  <c xml:space="default">\n'
+            b"    <d> </d>\n"
+            b"  </c>\n"
+            b"  <e>\n  </e>\n"
+            b"</r>",
+            b'<r xml:space="preserve">\n'
+            b"  <a> <b/> </a>\n"
+            b'  <c xml:space="default"><d/></c>\n'
+            b"  <e>\n  </e>\n"
+            b"</r>",
+        )
+
+    def test_space_preserve_keeps_whitespace_only_text(self):
+        """An unprefixed <t> (xlsx shared strings) that is only a space keeps it"""
+        self.assertCondensed(
+            b'<sst>\n  <si>\n    <t xml:space="preserve"> </t>\n  </si>\n</sst>',
+            b'<sst><si><t xml:space="preserve"> </t></si></sst>',
+        )
+
+    def test_keeps_prefixed_t_verbatim(self):
+        """w:t keeps whitespace-only text and comments as they are"""
+        xml = (
+            f'<w:p xmlns:w="{W_NAMESPACE}">\n'
+            "  <w:r>\n"
+            "    <w:t>  </w:t>\n"
+            "    <w:t> a <!-- kept --> b </w:t>\n"
+            "  </w:r>\n"
+            "</w:p>"
+        ).encode()
+        self.assertCondensed(
+            xml,
+            f'<w:p xmlns:w="{W_NAMESPACE}"><w:r><w:t>  </w:t>'
+            "<w:t> a <!-- kept --> b </w:t></w:r></w:p>".encode(),
+        )
+
+    def test_removes_comments(self):
+        """Comments are dropped, and an element left empty is self-closing"""
+        self.assertCondensed(
+            b"<a>\n"
+            b"  <!-- note -->\n"
+            b"  <b>\n    <!-- note -->\n  </b>\n"
+            b"  <c>x<!-- note -->y</c>\n"
+            b"</a>",
+            b"<a><b/><c>xy</c></a>",
+        )
+
+    def test_cdata_merges_into_text(self):
+        """CDATA is written as escaped text together with the whitespace around it,
+        where minidom kept the section and dropped that whitespace"""
+        self.assertCondensed(
+            b"<a>\n  <b>\n    <![CDATA[x < y]]>\n  </b>\n  <c><![CDATA[  ]]></c>\n</a>",
+            b"<a><b>\n    x &lt; y\n  </b><c/></a>",
+        )
+
+    def test_keeps_processing_instructions(self):
+        self.assertCondensed(b"<a>\n  <?pi data?>\n</a>", b"<a><?pi data?></a>")
+
+    def test_rebound_namespace_prefixes(self):
+        """Attributes use the prefix bound in their element's scope"""
+        xml = (
+            b'<a:root xmlns:a="urn:one">\n'
+            b'  <a:x xmlns:a="urn:two" a:attr="1">\n'
+            b'    <b xmlns="urn:three" a:y="2"/>\n'
+            b"  </a:x>\n"
+            b'  <a:z a:attr="3"/>\n'
+            b"</a:root>"
+        )
+        self.assertCondensed(
+            xml,
+            b'<a:root xmlns:a="urn:one"><a:x xmlns:a="urn:two" a:attr="1">'
+            b'<b xmlns="urn:three" a:y="2"/></a:x><a:z a:attr="3"/></a:root>',
+        )
+        self.assertSameDocument(xml)
+
+    def test_nested_prefixes_for_one_namespace(self):
+        """A namespace bound to a second prefix in a nested scope keeps its elements"""
+        self.assertSameDocument(
+            b'<x:r xmlns:x="urn:one">\n'
+            b'  <y:s xmlns:y="urn:one" x:a="1">\n'
+            b'    <x:t y:b="2"/>\n'
+            b"  </y:s>\n"
+            b'  <x:u x:c="3"/>\n'
+            b"</x:r>"
+        )
+
+    def test_escapes_attributes(self):
+        """Newlines and tabs in attribute values survive as character references"""
+        xml = (
+            b'<a v="line&#10;next&#9;tab &amp; &lt;x&gt; &quot;q&quot;">'
+            b"a &amp; b &lt; c &gt; d</a>"
+        )
+        self.assertCondensed(xml, xml)
+        value = lxml.etree.fromstring(condense_xml_bytes(xml)).get("v")
+        self.assertEqual(value, 'line\nnext\ttab & <x> "q"')
+
+    def test_standalone_declaration(self):
+        """Only standalone="yes" is written; "no" means the same as leaving it out"""
+        self.assertEqual(
+            condense_xml_bytes(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n<a/>'
+            ),
+            b"<?xml version='1.0' encoding='UTF-8' standalone='yes'?>\n<a/>",
+        )
+        self.assertCondensed(
+            b'<?xml version="1.0" encoding="UTF-8" standalone="no"?>\n<a/>', b"<a/>"
+        )
+        self.assertCondensed(b'<?xml version="1.0" encoding="UTF-8"?>\n<a/>', b"<a/>")
+        self.assertCondensed(b"<a/>", b"<a/>")
+
+
+def make_package(path, members=PACKAGE_MEMBERS):
+    """Write members to a zip at path, the way Word stores them"""
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in members.items():
+            zf.writestr(zipfile.ZipInfo(name, (2020, 1, 2, 3, 4, 6)), data)
+    return path
+
+
+def read_package(path):
+    with zipfile.ZipFile(path) as zf:
+        return {info.filename: zf.read(info) for info in zf.infolist()}
+
+
+class TestPackManifest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.original = make_package(self.tmp / "original.docx")
+        self.unpacked = self.tmp / "unpacked"
+        self.output = self.tmp / "output.docx"
+
+    def pack(self):
+        pack_document(self.unpacked, self.output, workers=1)
+        return read_package(self.output)
+
+    def test_copies_unchanged_members_from_original(self):
+        """A full unpack packed without edits gives back the original members"""
+        unpack_document(self.original, self.unpacked)
+
+        self.assertEqual(self.pack(), PACKAGE_MEMBERS)
+        with zipfile.ZipFile(self.output) as zf:
+            self.assertEqual(zf.namelist()[0], "[Content_Types].xml")
+            self.assertEqual(
+                zf.getinfo("word/styles.xml").date_time, (2020, 1, 2, 3, 4, 6)
+            )
+
+    def test_packs_edited_members_from_the_directory(self):
+        """An edited member is condensed from disk; the others come from original"""
+        unpack_document(self.original, self.unpacked)
+        document = self.unpacked / "word" / "document.xml"
+        document.write_text(
+            document.read_text(encoding="utf-8").replace("Original", "Edited"),
+            encoding="utf-8",
+        )
+
+        packed = self.pack()
+        self.assertIn(b"<w:t>Edited</w:t>", packed["word/document.xml"])
+        self.assertNotIn(b"\n  ", packed["word/document.xml"])
+        for name in ["[Content_Types].xml", "word/styles.xml", "word/media/image1.png"]:
+            self.assertEqual(packed[name], PACKAGE_MEMBERS[name])
+
+    def test_leaves_out_members_deleted_after_unpacking(self):
+        unpack_document(self.original, self.unpacked)
+        (self.unpacked / "word" / "media" / "image1.png").unlink()
+
+        packed = self.pack()
+        self.assertNotIn("word/media/image1.png", packed)
+        self.assertEqual(len(packed), len(PACKAGE_MEMBERS) - 1)
+
+    def test_adds_new_members(self):
+        unpack_document(self.original, self.unpacked)
+        (self.unpacked / "word" / "media" / "image2.png").write_bytes(b"new")
+
+        self.assertEqual(self.pack()["word/media/image2.png"], b"new")
+
+    def test_copies_members_never_unpacked(self):
+        """A selective unpack packs the members it left in original unchanged"""
+        unpack_document(self.original, self.unpacked, include=["word/document.xml"])
+        self.assertEqual(
+            sorted(p.name for p in self.unpacked.rglob("*") if p.is_file()),
+            [MANIFEST_NAME, "document.xml"],
+        )
+
+        self.assertEqual(self.pack(), PACKAGE_MEMBERS)
+
+    def test_original_missing_for_members_never_unpacked(self):
+        unpack_document(self.original, self.unpacked, include=["word/document.xml"])
+        self.original.unlink()
+
+        with self.assertRaisesRegex(ValueError, "not found"):
+            self.pack()
+
+    def test_original_changed_for_members_never_unpacked(self):
+        unpack_document(self.original, self.unpacked, include=["word/document.xml"])
+        styles = PACKAGE_MEMBERS["word/styles.xml"] + b" "
+        make_package(self.original, {**PACKAGE_MEMBERS, "word/styles.xml": styles})
+
+        with self.assertRaisesRegex(ValueError, "has changed"):
+            self.pack()
+
+    def test_packs_back_onto_original(self):
+        """Packing onto the unpacked file replaces it, and can be repeated"""
+        unpack_document(self.original, self.unpacked)
+        document = self.unpacked / "word" / "document.xml"
+        for old, new in [("Original", "Edited"), ("Edited", "Edited again")]:
+            document.write_text(
+                document.read_text(encoding="utf-8").replace(old, new),
+                encoding="utf-8",
+            )
+
+            self.assertTrue(pack_document(self.unpacked, self.original, workers=1))
+            packed = read_package(self.original)
+            self.assertIn(f"<w:t>{new}</w:t>".encode(), packed["word/document.xml"])
+            self.assertEqual(
+                packed["word/styles.xml"], PACKAGE_MEMBERS["word/styles.xml"]
+            )
+
+        # No temp file left behind
+        self.assertEqual(
+            [path.name for path in self.tmp.iterdir() if path.is_file()],
+            ["original.docx"],
+        )
+
+    def test_selective_unpack_packs_back_onto_original(self):
+        unpack_document(self.original, self.unpacked, include=["word/document.xml"])
+        document = self.unpacked / "word" / "document.xml"
+        document.write_text(
+            document.read_text(encoding="utf-8").replace("Original", "Edited"),
+            encoding="utf-8",
+        )
+
+        pack_document(self.unpacked, self.original, workers=1)
+        packed = read_package(self.original)
+        self.assertIn(b"<w:t>Edited</w:t>", packed["word/document.xml"])
+        self.assertEqual(
+            packed["word/media/image1.png"], PACKAGE_MEMBERS["word/media/image1.png"]
+        )
+
+    def test_full_unpack_packs_without_original(self):
+        """Every member is on disk, so original is not needed"""
+        unpack_document(self.original, self.unpacked)
+        self.original.unlink()
+
+        packed = self.pack()
+        self.assertEqual(set(packed), set(PACKAGE_MEMBERS))
+        self.assertEqual(
+            packed["word/media/image1.png"], PACKAGE_MEMBERS["word/media/image1.png"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
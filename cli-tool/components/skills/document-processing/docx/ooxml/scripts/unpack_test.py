@@ -0,0 +1,88 @@
+import shutil
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from pack import pack_document, read_manifest
+from unpack import unpack_document
+
+W_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestSelectiveUnpack(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.original = self.tmp / "original.pptx"
+        with zipfile.ZipFile(self.original, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("[Content_Types].xml", "<Types/>")
+            for number in (1, 2, 3):
+                zf.writestr(
+                    f"ppt/slides/slide{number}.xml",
+                    f'<p:sld xmlns:p="urn:p"><p:t>Slide {number}</p:t></p:sld>',
+                )
+            zf.writestr("ppt/media/image1.png", b"\x89PNG")
+        self.unpacked = self.tmp / "unpacked"
+
+    def unpacked_files(self):
+        return sorted(
+            path.relative_to(self.unpacked).as_posix()
+            for path in self.unpacked.rglob("*")
+            if path.is_file() and path.name != ".unpack-manifest.json"
+        )
+
+    def test_unpacks_matching_members_only(self):
+        unpacked = unpack_document(
+            self.original, self.unpacked, include=["ppt/slides/slide2.xml"]
+        )
+
+        self.assertEqual(unpacked, ["ppt/slides/slide2.xml"])
+        self.assertEqual(self.unpacked_files(), ["ppt/slides/slide2.xml"])
+        manifest = read_manifest(self.unpacked)
+        self.assertEqual(manifest["source"], str(self.original.resolve()))
+        self.assertEqual(len(manifest["members"]), 5)
+
+    def test_rerun_keeps_edits(self):
+        """Unpacking more members keeps the files already there as they are"""
+        unpack_document(self.original, self.unpacked, include=["ppt/slides/slide2.xml"])
+        slide = self.unpacked / "ppt" / "slides" / "slide2.xml"
+        slide.write_text(slide.read_text().replace("Slide 2", "Edited"))
+
+        unpacked = unpack_document(self.original, self.unpacked, include=["ppt/slides/*"])
+
+        self.assertEqual(unpacked, ["ppt/slides/slide1.xml", "ppt/slides/slide3.xml"])
+        self.assertIn("Edited", slide.read_text())
+
+        output = self.tmp / "output.pptx"
+        pack_document(self.unpacked, output, workers=1)
+        with zipfile.ZipFile(output) as zf:
+            self.assertIn(b"<p:t>Edited</p:t>", zf.read("ppt/slides/slide2.xml"))
+            self.assertEqual(zf.read("ppt/media/image1.png"), b"\x89PNG")
+
+    def test_rerun_restores_deleted_members_only_if_matched(self):
+        unpack_document(self.original, self.unpacked, include=["ppt/slides/*"])
+        (self.unpacked / "ppt" / "slides" / "slide3.xml").unlink()
+
+        unpack_document(self.original, self.unpacked, include=["ppt/media/*"])
+        self.assertNotIn("ppt/slides/slide3.xml", self.unpacked_files())
+
+        unpack_document(self.original, self.unpacked, include=["*/slide3.xml"])
+        self.assertIn("ppt/slides/slide3.xml", self.unpacked_files())
+
+    def test_full_unpack_overwrites(self):
+        """Without include, every member is extracted again"""
+        unpack_document(self.original, self.unpacked, include=["ppt/slides/slide1.xml"])
+        slide = self.unpacked / "ppt" / "slides" / "slide1.xml"
+        slide.write_text("<edited/>")
+
+        unpack_document(self.original, self.unpacked)
+
+        self.assertIn("Slide 1", slide.read_text())
+        self.assertEqual(len(self.unpacked_files()), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,20 +4,27 @@ Command line tool to validate Office document XML files against XSD schemas and
 
 Usage:
     python validate.py <dir> --original <original_file>
+    python validate.py <edited_file> --original <original_file>
 """
 
 import argparse
 import sys
 from pathlib import Path
 
-from validation import DOCXSchemaValidator, PPTXSchemaValidator, RedliningValidator
+from validation import (
+    BaseSchemaValidator,
+    DOCXSchemaValidator,
+    PPTXSchemaValidator,
+    RedliningValidator,
+)
 
 
 def main():
     parser = argparse.ArgumentParser(description="Validate Office document XML files")
     parser.add_argument(
         "unpacked_dir",
-        help="Path to unpacked Office document directory",
+        help="Path to unpacked Office document directory, or to a packed .docx/.pptx/.xlsx "
+        "file (validated in memory, without unpacking)",
     )
     parser.add_argument(
         "--original",
@@ -30,13 +37,20 @@ def main():
         action="store_true",
         help="Enable verbose output",
     )
+    parser.add_argument(
+        "--no-baseline-cache",
+        action="store_true",
+        help="Recompute XSD errors of the original file instead of reusing cached ones",
+    )
     args = parser.parse_args()
 
     # Validate paths
     unpacked_dir = Path(args.unpacked_dir)
     original_file = Path(args.original)
     file_extension = original_file.suffix.lower()
-    assert unpacked_dir.is_dir(), f"Error: {unpacked_dir} is not a directory"
+    assert unpacked_dir.is_dir() or unpacked_dir.is_file(), (
+        f"Error: {unpacked_dir} is not a directory or file"
+    )
     assert original_file.is_file(), f"Error: {original_file} is not a file"
     assert file_extension in [".docx", ".pptx", ".xlsx"], (
         f"Error: {original_file} must be a .docx, .pptx, or .xlsx file"
@@ -55,7 +69,15 @@ def main():
     # Run validators
     success = True
     for V in validators:
-        validator = V(unpacked_dir, original_file, verbose=args.verbose)
+        if issubclass(V, BaseSchemaValidator):
+            validator = V(
+                unpacked_dir,
+                original_file,
+                verbose=args.verbose,
+                baseline_cache=not args.no_baseline_cache,
+            )
+        else:
+            validator = V(unpacked_dir, original_file, verbose=args.verbose)
         if not validator.validate():
             success = False
 
@@ -0,0 +1,600 @@
+import contextlib
+import copy
+import io
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+import unittest
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+import lxml.etree
+
+from validation import BaseSchemaValidator, DOCXSchemaValidator, PPTXSchemaValidator
+from validation import base as validation_base
+from validation.package_graph import PackageGraph
+
+W_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+MC_NAMESPACE = "http://schemas.openxmlformats.org/markup-compatibility/2006"
+W14_NAMESPACE = "http://schemas.microsoft.com/office/word/2010/wordml"
+R_NAMESPACE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+RELS_NAMESPACE = "http://schemas.openxmlformats.org/package/2006/relationships"
+REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+CONTENT_TYPES = (
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" '
+    'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    "</Types>"
+)
+ROOT_RELS = (
+    f'<Relationships xmlns="{RELS_NAMESPACE}">'
+    f'<Relationship Id="rId1" Type="{REL_TYPE}/officeDocument" '
+    'Target="word/document.xml"/></Relationships>'
+)
+DOCUMENT_RELS = (
+    f'<Relationships xmlns="{RELS_NAMESPACE}">'
+    f'<Relationship Id="rId1" Type="{REL_TYPE}/styles" Target="styles.xml"/>'
+    "</Relationships>"
+)
+STYLES = f'<w:styles xmlns:w="{W_NAMESPACE}"/>'
+
+
+def document_xml(body):
+    return (
+        f'<w:document xmlns:w="{W_NAMESPACE}" xmlns:mc="{MC_NAMESPACE}" '
+        f'xmlns:w14="{W14_NAMESPACE}" mc:Ignorable="w14"><w:body>{body}'
+        "</w:body></w:document>"
+    )
+
+
+# The original's package rels already have an XSD error (the Bogus attribute); the
+# edit keeps it and adds another (a missing Type). The edited document holds markup the
+# XSD preprocessing has to remove before validating. Errors are kept out of wml.xsd
+# parts, as libxml2 takes about a second to report one there, and out of the .rels
+# files under word/, whose relationships the namespace cleaning removes.
+RELS_MEMBER = "_rels/.rels"
+ORIGINAL_MEMBERS = {
+    "[Content_Types].xml": CONTENT_TYPES,
+    RELS_MEMBER: ROOT_RELS.replace('Target="word/', 'Bogus="1" Target="word/'),
+    "word/_rels/document.xml.rels": DOCUMENT_RELS,
+    "word/document.xml": document_xml("<w:p><w:r><w:t>Original</w:t></w:r></w:p>"),
+    "word/styles.xml": STYLES,
+}
+EDITED_MEMBERS = {
+    **ORIGINAL_MEMBERS,
+    RELS_MEMBER: ORIGINAL_MEMBERS[RELS_MEMBER].replace(
+        "</Relationships>",
+        '<Relationship Id="rId2" Target="numbering.xml"/></Relationships>',
+    ),
+    "word/document.xml": document_xml(
+        '<w:p w14:paraId="1A2B3C4D">{{greeting}}<w:r><w:t>{{name}}</w:t></w:r>'
+        "<w14:extra/></w:p>"
+    ),
+}
+
+
+def write_package(path, members):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, xml in members.items():
+            zf.writestr(name, xml)
+
+
+def write_directory(path, members):
+    for name, xml in members.items():
+        (path / name).parent.mkdir(parents=True, exist_ok=True)
+        (path / name).write_text(xml, encoding="utf-8")
+
+
+def old_preprocess_for_xsd(validator, xml_doc, clean_ignorable):
+    """The three XSD preprocessing passes _preprocess_for_xsd replaced, each working on
+    a serialized copy: template tag removal, mc:Ignorable removal and namespace cleaning
+    """
+    template_pattern = re.compile(r"\{\{[^}]*\}\}")
+    root = lxml.etree.fromstring(lxml.etree.tostring(xml_doc, encoding="unicode"))
+    for elem in root.iter():
+        if not hasattr(elem, "tag") or callable(elem.tag):
+            continue
+        if str(elem.tag).endswith("}t") or str(elem.tag) == "t":
+            continue
+        if elem.text:
+            elem.text = template_pattern.sub("", elem.text)
+        if elem.tail:
+            elem.tail = template_pattern.sub("", elem.tail)
+
+    mc_ignorable = f"{{{MC_NAMESPACE}}}Ignorable"
+    if mc_ignorable in root.attrib:
+        del root.attrib[mc_ignorable]
+
+    if not clean_ignorable:
+        return lxml.etree.ElementTree(root)
+
+    root = lxml.etree.fromstring(lxml.etree.tostring(root, encoding="unicode"))
+    for elem in root.iter():
+        for attr in [a for a in elem.attrib if "{" in a]:
+            if attr.split("}")[0][1:] not in validator.OOXML_NAMESPACES:
+                del elem.attrib[attr]
+
+    def remove_ignorable_elements(parent):
+        elements_to_remove = []
+        for elem in list(parent):
+            if not hasattr(elem, "tag") or callable(elem.tag):
+                continue
+            tag_str = str(elem.tag)
+            if tag_str.startswith("{"):
+                if tag_str.split("}")[0][1:] not in validator.OOXML_NAMESPACES:
+                    elements_to_remove.append(elem)
+                    continue
+            remove_ignorable_elements(elem)
+        for elem in elements_to_remove:
+            parent.remove(elem)
+
+    remove_ignorable_elements(root)
+    return lxml.etree.ElementTree(root)
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class ValidatorTestCase(unittest.TestCase):
+    """Original and edited packages in a temp dir, with the baseline cache kept there"""
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.cache_dir = self.tmp / "cache"
+        patcher = mock.patch.object(
+            BaseSchemaValidator, "BASELINE_CACHE_DIR", self.cache_dir
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(BaseSchemaValidator._shutdown_xsd_pool)
+
+        self.original = self.tmp / "original.docx"
+        write_package(self.original, ORIGINAL_MEMBERS)
+        self.unpacked = self.tmp / "unpacked"
+        write_directory(self.unpacked, EDITED_MEMBERS)
+        self.packed = self.tmp / "edited.docx"
+        write_package(self.packed, EDITED_MEMBERS)
+
+    def make_validator(self, source, cls=DOCXSchemaValidator, **kwargs):
+        kwargs.setdefault("workers", 1)
+        validator = cls(source, self.original, **kwargs)
+        self.addCleanup(validator.close)
+        return validator
+
+    def xsd_results(self, source, **kwargs):
+        """{member name: (is_valid, new errors)} of the XSD check of source"""
+        validator = self.make_validator(source, **kwargs)
+        results = validator._validate_files_against_xsd(validator.xml_files)
+        return {
+            xml_file.relative_to(validator.unpacked_dir).as_posix(): result
+            for xml_file, result in zip(validator.xml_files, results)
+        }
+
+
+class TestXsdValidation(ValidatorTestCase):
+
+    def in_memory_package(self):
+        return zipfile.ZipFile(io.BytesIO(self.packed.read_bytes()))
+
+    def test_reports_only_new_errors(self):
+        results = self.xsd_results(self.unpacked, baseline_cache=False)
+
+        self.assertEqual(set(results), set(EDITED_MEMBERS))
+        is_valid, new_errors = results[RELS_MEMBER]
+        self.assertFalse(is_valid)
+        self.assertEqual(len(new_errors), 1)
+        self.assertIn("'Type' is required", new_errors.pop())
+        # Template tags, mc:Ignorable and w14 markup are dropped before validating
+        self.assertEqual(results["word/document.xml"], (True, set()))
+        self.assertEqual(results["word/styles.xml"], (True, set()))
+
+    def test_same_results_unpacked_packed_and_in_memory(self):
+        """Every input form gives the same results, with the cache off, cold and warm"""
+        expected = self.xsd_results(self.unpacked, baseline_cache=False)
+
+        for baseline_cache in (False, True, True):
+            for source in (self.unpacked, self.packed, self.in_memory_package()):
+                with self.subTest(source=source, baseline_cache=baseline_cache):
+                    self.assertEqual(
+                        self.xsd_results(source, baseline_cache=baseline_cache),
+                        expected,
+                    )
+
+    def test_validate_against_xsd_agrees_across_inputs(self):
+        for source in (self.unpacked, self.packed, self.in_memory_package()):
+            with self.subTest(source=source):
+                validator = self.make_validator(source)
+                with contextlib.redirect_stdout(io.StringIO()) as output:
+                    self.assertFalse(validator.validate_against_xsd())
+                self.assertIn("_rels/.rels: 1 new error(s)", output.getvalue())
+
+    def test_parallel_matches_serial(self):
+        expected = self.xsd_results(self.unpacked, baseline_cache=False)
+
+        with mock.patch.object(BaseSchemaValidator, "MIN_PARALLEL_XML_FILES", 1):
+            for source in (self.unpacked, self.packed):
+                with self.subTest(source=source):
+                    self.assertEqual(
+                        self.xsd_results(source, workers=2, baseline_cache=False),
+                        expected,
+                    )
+            self.assertIsNotNone(BaseSchemaValidator._xsd_pool)
+
+    def test_reads_original_members_with_errors_only(self):
+        """The original is only opened for members that fail validation"""
+        read_members = []
+        read_original_member = DOCXSchemaValidator._read_original_member
+
+        def record_read(validator, member_name):
+            read_members.append(member_name)
+            return read_original_member(validator, member_name)
+
+        with mock.patch.object(
+            DOCXSchemaValidator, "_read_original_member", record_read
+        ):
+            self.xsd_results(self.packed, baseline_cache=False)
+
+        self.assertEqual(read_members, [RELS_MEMBER])
+
+    def test_leaves_shared_trees_untouched(self):
+        """XSD preprocessing works on a copy of the tree the other checks share"""
+        validator = self.make_validator(self.unpacked, baseline_cache=False)
+        document = validator.unpacked_dir / "word" / "document.xml"
+        tree = validator._parse_xml(document)
+        before = lxml.etree.tostring(tree)
+
+        validator._validate_files_against_xsd(validator.xml_files)
+
+        self.assertIs(validator._parse_xml(document), tree)
+        self.assertEqual(lxml.etree.tostring(tree), before)
+        root = tree.getroot()
+        self.assertEqual(root.get(f"{{{MC_NAMESPACE}}}Ignorable"), "w14")
+        self.assertIn(b"{{greeting}}", before)
+        self.assertIsNotNone(root.find(f".//{{{W14_NAMESPACE}}}extra"))
+
+
+class TestBaselineCache(ValidatorTestCase):
+
+    def cached_files(self):
+        if not self.cache_dir.exists():
+            return []
+        return sorted(path for path in self.cache_dir.rglob("*") if path.is_file())
+
+    def test_cache_hit_skips_original(self):
+        expected = self.xsd_results(self.unpacked)
+        self.assertEqual(len(self.cached_files()), 1)
+
+        with mock.patch.object(
+            DOCXSchemaValidator,
+            "_validate_original_member",
+            side_effect=AssertionError("original validated again"),
+        ):
+            self.assertEqual(self.xsd_results(self.packed), expected)
+
+    def test_cache_layout(self):
+        validator = self.make_validator(self.unpacked)
+        validator._validate_files_against_xsd(validator.xml_files)
+
+        cache_path = validator._baseline_cache_path(RELS_MEMBER)
+        self.assertEqual(self.cached_files(), [cache_path])
+        self.assertEqual(
+            cache_path.relative_to(self.cache_dir).parts[:3],
+            (
+                f"v{BaseSchemaValidator.BASELINE_CACHE_VERSION}",
+                validator._validator_fingerprint(),
+                validator._original_sha256,
+            ),
+        )
+        entry = json.loads(cache_path.read_text(encoding="utf-8"))
+        self.assertEqual(entry["member"], RELS_MEMBER)
+        self.assertEqual(len(entry["errors"]), 1)
+        self.assertIn("Bogus", entry["errors"][0])
+
+    def test_no_baseline_cache_writes_nothing(self):
+        validator = self.make_validator(self.unpacked, baseline_cache=False)
+        validator._validate_files_against_xsd(validator.xml_files)
+
+        self.assertIsNone(validator._baseline_cache_path(RELS_MEMBER))
+        self.assertFalse(self.cache_dir.exists())
+
+    def test_malformed_entry_is_a_miss(self):
+        validator = self.make_validator(self.unpacked)
+        cache_path = validator._baseline_cache_path(RELS_MEMBER)
+        cache_path.parent.mkdir(parents=True)
+        entries = [
+            "not json",
+            json.dumps(["errors"]),
+            json.dumps({"member": "word/styles.xml", "errors": []}),
+            json.dumps({"member": RELS_MEMBER, "errors": "bogus"}),
+            json.dumps({"member": RELS_MEMBER, "errors": [1]}),
+        ]
+        for entry in entries:
+            with self.subTest(entry=entry):
+                cache_path.write_text(entry, encoding="utf-8")
+                self.assertIsNone(validator._load_baseline_errors(RELS_MEMBER))
+
+        # A miss is recomputed and overwrites the bad entry
+        self.assertEqual(
+            self.xsd_results(self.unpacked),
+            self.xsd_results(self.unpacked, baseline_cache=False),
+        )
+        entry = json.loads(cache_path.read_text(encoding="utf-8"))
+        self.assertEqual(entry["member"], RELS_MEMBER)
+
+    def test_fingerprint_depends_on_validator_and_schemas(self):
+        schemas_dir = self.tmp / "schemas"
+        schemas_dir.mkdir()
+        schema = schemas_dir / "wml.xsd"
+        schema.write_text("<schema/>")
+
+        def fingerprint(cls=DOCXSchemaValidator):
+            validator = self.make_validator(self.unpacked, cls=cls)
+            validator.schemas_dir = schemas_dir
+            return validator._validator_fingerprint()
+
+        with mock.patch.dict(BaseSchemaValidator._validator_fingerprints, clear=True):
+            docx_fingerprint = fingerprint()
+            self.assertEqual(fingerprint(), docx_fingerprint)
+            self.assertNotEqual(fingerprint(PPTXSchemaValidator), docx_fingerprint)
+
+        with mock.patch.dict(BaseSchemaValidator._validator_fingerprints, clear=True):
+            stat = schema.stat()
+            os.utime(schema, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            self.assertNotEqual(fingerprint(), docx_fingerprint)
+
+        with mock.patch.dict(BaseSchemaValidator._validator_fingerprints, clear=True):
+            (schemas_dir / "shared.xsd").write_text("<schema/>")
+            self.assertNotEqual(fingerprint(), docx_fingerprint)
+
+    def test_evicts_other_versions_and_stale_packages(self):
+        validator = self.make_validator(self.unpacked)
+        package_dir = validator._baseline_cache_path(RELS_MEMBER).parent
+        fingerprint_dir = package_dir.parent
+        old_version = self.cache_dir / "v1" / "fingerprint" / "package"
+        stale = fingerprint_dir / "stale-package"
+        recent = fingerprint_dir / "recent-package"
+        stale_fingerprint = fingerprint_dir.parent / "old-fingerprint" / "package"
+        for directory in (package_dir, old_version, stale, recent, stale_fingerprint):
+            directory.mkdir(parents=True)
+        long_ago = time.time() - BaseSchemaValidator.BASELINE_CACHE_MAX_AGE - 60
+        for directory in (package_dir, stale, stale_fingerprint):
+            os.utime(directory, (long_ago, long_ago))
+
+        validator._validate_files_against_xsd(validator.xml_files)
+
+        self.assertFalse((self.cache_dir / "v1").exists())
+        self.assertFalse(stale.exists())
+        self.assertFalse(stale_fingerprint.parent.exists())
+        self.assertTrue(recent.exists())
+        # The package being validated counts as used, so it survives eviction
+        self.assertTrue(package_dir.exists())
+        self.assertGreater(package_dir.stat().st_mtime, long_ago)
+
+
+class TestPreprocessForXsd(ValidatorTestCase):
+
+    DOCUMENTS = [
+        EDITED_MEMBERS["word/document.xml"],
+        (
+            f'<w:document xmlns:w="{W_NAMESPACE}" xmlns:mc="{MC_NAMESPACE}" '
+            f'xmlns:x="urn:foreign" mc:Ignorable="x" x:root="1">'
+            "<!-- {{comment}} --><?pi {{data}}?>"
+            '<w:body x:attr="1" w:val="kept">{{a}} text {{b}}'
+            "<x:foreign>{{c}}<w:p/></x:foreign> tail {{d}}"
+            "<w:t>{{kept}}</w:t> after t {{e}}"
+            "<w:p><x:nested x:deep='1'><x:deeper/></x:nested>{{f}}</w:p>"
+            "</w:body></w:document>"
+        ),
+        "<doc><t>{{kept}}</t>{{gone}}<item>{{x}}y</item></doc>",
+        ROOT_RELS,
+    ]
+
+    def setUp(self):
+        super().setUp()
+        self.validator = self.make_validator(self.unpacked)
+
+    def test_matches_the_passes_it_replaced(self):
+        for document in self.DOCUMENTS:
+            for clean_ignorable in (False, True):
+                with self.subTest(document=document, clean_ignorable=clean_ignorable):
+                    xml_doc = lxml.etree.ElementTree(lxml.etree.fromstring(document))
+                    expected = old_preprocess_for_xsd(
+                        self.validator, xml_doc, clean_ignorable
+                    )
+                    actual = self.validator._preprocess_for_xsd(
+                        copy.deepcopy(xml_doc), clean_ignorable
+                    )
+                    # C14N, as the old passes left "" where the fused pass leaves None
+                    self.assertEqual(
+                        lxml.etree.canonicalize(
+                            lxml.etree.tostring(actual, encoding="unicode")
+                        ),
+                        lxml.etree.canonicalize(
+                            lxml.etree.tostring(expected, encoding="unicode")
+                        ),
+                    )
+
+
+class TestSchemaCacheAndPool(unittest.TestCase):
+
+    def setUp(self):
+        self.schemas_dir = Path(__file__).parent.parent / "schemas"
+        patcher = mock.patch.dict(BaseSchemaValidator._schema_cache, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_schema_compiled_once(self):
+        schema_path = self.schemas_dir / BaseSchemaValidator.SCHEMA_MAPPINGS[".rels"]
+        schema = BaseSchemaValidator._load_schema(schema_path)
+
+        self.assertIsInstance(schema, lxml.etree.XMLSchema)
+        with mock.patch.object(lxml.etree, "XMLSchema") as xml_schema:
+            self.assertIs(BaseSchemaValidator._load_schema(schema_path), schema)
+        xml_schema.assert_not_called()
+
+    def test_schema_errors_are_cached(self):
+        schema_path = self.schemas_dir / "missing.xsd"
+        with self.assertRaises(OSError) as first:
+            BaseSchemaValidator._load_schema(schema_path)
+        with self.assertRaises(OSError) as second:
+            BaseSchemaValidator._load_schema(schema_path)
+        self.assertIs(second.exception, first.exception)
+
+    def test_pool_reused_until_workers_or_schemas_change(self):
+        with (
+            mock.patch.multiple(
+                BaseSchemaValidator,
+                _xsd_pool=None,
+                _xsd_pool_workers=None,
+                _xsd_pool_schemas=frozenset(),
+            ),
+            mock.patch.object(
+                validation_base,
+                "ProcessPoolExecutor",
+                side_effect=lambda **kwargs: mock.Mock(kwargs=kwargs),
+            ),
+            mock.patch.object(validation_base.atexit, "register") as register,
+        ):
+            pool = BaseSchemaValidator._get_xsd_pool(2, {"a.xsd"})
+            self.assertEqual(pool.kwargs["max_workers"], 2)
+            self.assertEqual(pool.kwargs["initargs"], (["a.xsd"],))
+            self.assertIs(BaseSchemaValidator._get_xsd_pool(2, {"a.xsd"}), pool)
+            self.assertIs(BaseSchemaValidator._get_xsd_pool(2, set()), pool)
+            pool.shutdown.assert_not_called()
+
+            wider = BaseSchemaValidator._get_xsd_pool(2, {"a.xsd", "b.xsd"})
+            self.assertIsNot(wider, pool)
+            pool.shutdown.assert_called_once()
+
+            resized = BaseSchemaValidator._get_xsd_pool(3, {"a.xsd"})
+            self.assertIsNot(resized, wider)
+            wider.shutdown.assert_called_once()
+
+            register.assert_called_once_with(BaseSchemaValidator._shutdown_xsd_pool)
+            BaseSchemaValidator._shutdown_xsd_pool()
+            resized.shutdown.assert_called_once()
+            self.assertIsNone(BaseSchemaValidator._xsd_pool)
+
+
+class TestPackageGraph(unittest.TestCase):
+
+    MEMBERS = {
+        "[Content_Types].xml": CONTENT_TYPES,
+        "_rels/.rels": ROOT_RELS,
+        "word/document.xml": (
+            f'<w:document xmlns:w="{W_NAMESPACE}" xmlns:r="{R_NAMESPACE}"><w:body>'
+            '<w:hyperlink r:id="rId3"/><w:p><w:drawing r:id="rId2"/></w:p>'
+            "</w:body></w:document>"
+        ),
+        "word/_rels/document.xml.rels": (
+            f'<Relationships xmlns="{RELS_NAMESPACE}">'
+            f'<Relationship Id="rId1" Type="{REL_TYPE}/styles" Target="styles.xml"/>'
+            f'<Relationship Id="rId2" Type="{REL_TYPE}/image" '
+            'Target="media/image1.png"/>'
+            f'<Relationship Id="rId3" Type="{REL_TYPE}/hyperlink" '
+            'Target="https://example.com" TargetMode="External"/>'
+            f'<Relationship Id="rId1" Type="{REL_TYPE}/theme" '
+            'Target="../missing.xml"/>'
+            "</Relationships>"
+        ),
+        "word/styles.xml": STYLES,
+        "word/media/image1.png": "not really a png",
+        "word/orphan.xml": STYLES,
+        "word/_rels/orphan.xml.rels": (
+            f'<Relationships xmlns="{RELS_NAMESPACE}">'
+            f'<Relationship Id="rId1" Type="{REL_TYPE}/styles" '
+            'Target="unreachable.xml"/></Relationships>'
+        ),
+        "word/unreachable.xml": STYLES,
+    }
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.unpacked = self.tmp / "unpacked"
+        write_directory(self.unpacked, self.MEMBERS)
+        self.graph = PackageGraph(self.unpacked)
+
+    def test_files_and_content_types(self):
+        self.assertEqual(set(self.graph.files), set(self.MEMBERS))
+        self.assertEqual(self.graph.override_parts, {"word/document.xml"})
+        self.assertEqual(self.graph.default_extensions, {"rels", "xml"})
+
+    def test_relationships(self):
+        rels_name = "word/_rels/document.xml.rels"
+        self.assertEqual(
+            [rel.target_part for rel in self.graph.relationships[rels_name]],
+            ["word/styles.xml", "word/media/image1.png", None, "missing.xml"],
+        )
+        # The later declaration of a duplicate id wins, and the duplicate is recorded
+        self.assertEqual(
+            self.graph.relationship_types[rels_name],
+            {"rId1": "theme", "rId2": "image", "rId3": "hyperlink"},
+        )
+        self.assertEqual(
+            [rid for rid, _ in self.graph.duplicate_ids[rels_name]], ["rId1"]
+        )
+        self.assertEqual(self.graph.duplicate_ids["_rels/.rels"], [])
+        self.assertEqual(
+            [
+                (usage.id, usage.element)
+                for usage in self.graph.rid_usages("word/document.xml")
+            ],
+            [("rId3", "hyperlink"), ("rId2", "drawing")],
+        )
+
+    def test_orphan_and_unreachable_parts(self):
+        self.assertEqual(self.graph.orphan_parts(), ["word/orphan.xml"])
+        self.assertEqual(
+            self.graph.reachable_parts(),
+            {"word/document.xml", "word/styles.xml", "word/media/image1.png"},
+        )
+        # unreachable.xml is referenced, but only from the orphan
+        self.assertEqual(
+            self.graph.unreachable_parts(), ["word/orphan.xml", "word/unreachable.xml"]
+        )
+
+    def test_resolve_target(self):
+        rels_name = "word/_rels/document.xml.rels"
+        self.assertEqual(
+            self.graph.resolve_target(rels_name, "media/image1.png"),
+            "word/media/image1.png",
+        )
+        self.assertEqual(
+            self.graph.resolve_target("_rels/.rels", "docProps/app.xml"),
+            "docProps/app.xml",
+        )
+        self.assertIsNone(self.graph.resolve_target(rels_name, "mailto:a@b.c"))
+        self.assertIsNone(self.graph.resolve_target(rels_name, ""))
+        self.assertNotIn(
+            self.graph.resolve_target(rels_name, "../../outside.xml"),
+            self.graph.files,
+        )
+
+    def test_same_graph_from_zip_members(self):
+        packed = self.tmp / "package.docx"
+        write_package(packed, self.MEMBERS)
+        validator = DOCXSchemaValidator(packed, self.tmp / "original.docx", workers=1)
+        self.addCleanup(validator.close)
+        graph = validator.package
+
+        self.assertEqual(set(graph.files), set(self.graph.files))
+        self.assertEqual(graph.relationships.keys(), self.graph.relationships.keys())
+        for rels_name, relationships in self.graph.relationships.items():
+            self.assertEqual(
+                [rel[:4] for rel in graph.relationships[rels_name]],
+                [rel[:4] for rel in relationships],
+            )
+        self.assertEqual(graph.orphan_parts(), self.graph.orphan_parts())
+        self.assertEqual(graph.unreachable_parts(), self.graph.unreachable_parts())
+
+
+if __name__ == "__main__":
+    unittest.main()
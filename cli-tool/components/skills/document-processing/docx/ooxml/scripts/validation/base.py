@@ -2,11 +2,29 @@
 Base validator with common validation logic for document files.
 """
 
+import atexit
+import copy
+import hashlib
+import io
+import json
+import os
 import re
+import shutil
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import lxml.etree
 
+from .package_graph import (
+    CONTENT_TYPES_PART,
+    PackageGraph,
+    read_unpack_manifest,
+    walk_package_files,
+)
+
 
 class BaseSchemaValidator:
     """Base validator with common validation logic for document files."""
@@ -84,6 +102,36 @@ class BaseSchemaValidator:
     # Folders where we should clean ignorable namespaces
     MAIN_CONTENT_FOLDERS = {"word", "ppt", "xl"}
 
+    # Template placeholders ({{ ... }}) stripped from text before XSD validation
+    TEMPLATE_TAG_PATTERN = re.compile(r"\{\{[^}]*\}\}")
+
+    # Compiled XSD schemas keyed by schema path, shared by every validator in the process.
+    # XSD pool workers keep their own copy for as long as the pool lives.
+    _schema_cache = {}
+
+    # Process pool for XSD validation, reused across validations so its workers stay warm,
+    # with the worker count and schema paths it was started with
+    _xsd_pool = None
+    _xsd_pool_workers = None
+    _xsd_pool_schemas = frozenset()
+
+    # Below this many XML files, validating in this process is faster than starting a pool
+    MIN_PARALLEL_XML_FILES = 16
+
+    # On-disk XSD errors of original package members, keyed by a fingerprint of the
+    # validator (class, schemas and validation sources), package sha256 and member name.
+    # Bump the version when the cache layout changes. Packages unused for
+    # BASELINE_CACHE_MAX_AGE seconds are evicted.
+    BASELINE_CACHE_DIR = Path(
+        os.environ.get("OOXML_BASELINE_CACHE_DIR")
+        or Path.home() / ".cache" / "ooxml-validation"
+    )
+    BASELINE_CACHE_VERSION = "2"
+    BASELINE_CACHE_MAX_AGE = 30 * 24 * 3600
+
+    # Validator fingerprints keyed by (validator class, schemas directory)
+    _validator_fingerprints = {}
+
     # All allowed OOXML namespaces (superset of all document types)
     OOXML_NAMESPACES = {
         "http://schemas.openxmlformats.org/officeDocument/2006/math",
@@ -103,27 +151,172 @@ class BaseSchemaValidator:
         "http://www.w3.org/XML/1998/namespace",
     }
 
-    def __init__(self, unpacked_dir, original_file, verbose=False):
-        self.unpacked_dir = Path(unpacked_dir).resolve()
+    # Stands in for unpacked_dir when validating a ZipFile that has no file name
+    IN_MEMORY_PACKAGE_ROOT = Path("/<in-memory package>")
+
+    def __init__(
+        self,
+        unpacked_dir,
+        original_file,
+        verbose=False,
+        workers=None,
+        baseline_cache=True,
+    ):
+        # unpacked_dir is an unpacked package directory, or the package itself (a
+        # .docx/.pptx/.xlsx path or zipfile.ZipFile) whose members are read in memory;
+        # its files are then addressed as <package path>/<member name>.
+        # Package zip, and the path XSD pool workers can reopen it from (for a
+        # selective unpack, the original package holding the members left in it)
+        self._package_zip = None
+        self._package_zip_path = None
+        self._owns_package_zip = False
+        if isinstance(unpacked_dir, zipfile.ZipFile):
+            self._package_zip = unpacked_dir
+            if unpacked_dir.filename:
+                self._package_zip_path = Path(unpacked_dir.filename).resolve()
+            self.unpacked_dir = self._package_zip_path or self.IN_MEMORY_PACKAGE_ROOT
+        else:
+            self.unpacked_dir = Path(unpacked_dir).resolve()
+            if self.unpacked_dir.is_file():
+                self._package_zip_path = self.unpacked_dir
         self.original_file = Path(original_file)
         self.verbose = verbose
+        # Processes used for XSD validation (1 validates serially in this process)
+        self.workers = workers or os.cpu_count() or 1
+        # Reuse original member errors from BASELINE_CACHE_DIR across runs
+        self.baseline_cache = baseline_cache
+
+        # Original package, opened on first comparison, and its XSD errors per member
+        self._original_zip = None
+        self._original_errors = {}
+        self._original_sha256 = None
+        self._baseline_cache_evicted = False
+
+        # Parsed trees shared by every check in a validation run, keyed by file path
+        self._trees = {}
+        self._package = None
 
         # Set schemas directory
         self.schemas_dir = Path(__file__).parent.parent.parent / "schemas"
 
         # Get all XML and .rels files
-        patterns = ["*.xml", "*.rels"]
-        self.xml_files = [
-            f for pattern in patterns for f in self.unpacked_dir.rglob(pattern)
-        ]
+        if self._package_zip_path is not None or self._package_zip is not None:
+            self._package_members = [
+                info.filename
+                for info in self._get_package_zip().infolist()
+                if not info.is_dir()
+            ]
+            # Members read from the package zip rather than from disk
+            self._zip_members = set(self._package_members)
+            self.xml_files = [
+                self.unpacked_dir / name
+                for suffix in (".xml", ".rels")
+                for name in self._package_members
+                if name.endswith(suffix)
+            ]
+        else:
+            self._package_members = None
+            self._zip_members = None
+            patterns = ["*.xml", "*.rels"]
+            self.xml_files = [
+                f for pattern in patterns for f in self.unpacked_dir.rglob(pattern)
+            ]
+
+            # Members a selective unpack left in the original package are part of the
+            # package for reference checks; they are unchanged, so not validated
+            manifest = read_unpack_manifest(self.unpacked_dir)
+            if manifest is not None and manifest[1]:
+                self._package_zip_path, left_members = manifest
+                self._zip_members = set(left_members)
+                self._package_members = (
+                    list(walk_package_files(self.unpacked_dir)) + left_members
+                )
 
         if not self.xml_files:
             print(f"Warning: No XML files found in {self.unpacked_dir}")
 
+    def __getstate__(self):
+        # Open zip handles can't be pickled for the XSD pool; workers reopen the original lazily
+        state = self.__dict__.copy()
+        state["_original_zip"] = None
+        if self._package_zip_path is not None:
+            state["_package_zip"] = None
+            state["_owns_package_zip"] = False
+        # Parsed trees can't be pickled either; workers parse the files they validate
+        state["_trees"] = {}
+        state["_package"] = None
+        return state
+
+    def close(self):
+        """Close the zip files the validator opened (they are reopened when needed)."""
+        if self._original_zip is not None:
+            self._original_zip.close()
+            self._original_zip = None
+        if self._owns_package_zip:
+            self._package_zip.close()
+            self._package_zip = None
+            self._owns_package_zip = False
+
+    def _get_package_zip(self):
+        """The package being validated as an open ZipFile (package input only)."""
+        if self._package_zip is None:
+            self._package_zip = zipfile.ZipFile(self._package_zip_path, "r")
+            self._owns_package_zip = True
+        return self._package_zip
+
     def validate(self):
         """Run all validation checks and return True if all pass."""
         raise NotImplementedError("Subclasses must implement the validate method")
 
+    @property
+    def package(self):
+        """Relationship graph of the unpacked package, built on first use."""
+        if self._package is None:
+            self._package = PackageGraph(
+                self.unpacked_dir,
+                parse_xml=self._parse_xml,
+                member_names=self._package_members,
+            )
+        return self._package
+
+    def _package_glob(self, pattern):
+        """Paths of package files matching a "dir/name-pattern" glob, like Path.glob."""
+        return [self.unpacked_dir / name for name in self.package.glob(pattern)]
+
+    def _package_file_exists(self, path):
+        """True if path is a file of the package (works for zip input too)."""
+        return path.relative_to(self.unpacked_dir).as_posix() in self.package.files
+
+    def _zip_member_name(self, path):
+        """Member name of path if it is read from the package zip, else None."""
+        if not self._zip_members:
+            return None
+        member_name = Path(path).relative_to(self.unpacked_dir).as_posix()
+        return member_name if member_name in self._zip_members else None
+
+    def _parse_xml(self, xml_file):
+        """Parse xml_file once per validator and share the tree between checks.
+
+        Checks must not modify the returned tree; copy it first if they need to.
+        A parse error is cached as well and re-raised to every caller.
+        """
+        key = str(xml_file)
+        tree = self._trees.get(key)
+        if tree is None:
+            try:
+                member_name = self._zip_member_name(xml_file)
+                if member_name is None:
+                    tree = lxml.etree.parse(key)
+                else:
+                    data = self._get_package_zip().read(member_name)
+                    tree = lxml.etree.parse(io.BytesIO(data), base_url=key)
+            except Exception as e:
+                tree = e
+            self._trees[key] = tree
+        if isinstance(tree, Exception):
+            raise tree
+        return tree
+
     def validate_xml(self):
         """Validate that all XML files are well-formed."""
         errors = []
@@ -131,7 +324,7 @@ class BaseSchemaValidator:
         for xml_file in self.xml_files:
             try:
                 # Try to parse the XML file
-                lxml.etree.parse(str(xml_file))
+                self._parse_xml(xml_file)
             except lxml.etree.XMLSyntaxError as e:
                 errors.append(
                     f"  {xml_file.relative_to(self.unpacked_dir)}: "
@@ -159,7 +352,7 @@ class BaseSchemaValidator:
 
         for xml_file in self.xml_files:
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse_xml(xml_file).getroot()
                 declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
 
                 for attr_val in [
@@ -190,13 +383,19 @@ class BaseSchemaValidator:
 
         for xml_file in self.xml_files:
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse_xml(xml_file).getroot()
                 file_ids = {}  # Track IDs that must be unique within this file
 
                 # Remove all mc:AlternateContent elements from the tree
                 mc_elements = root.xpath(
                     ".//mc:AlternateContent", namespaces={"mc": self.MC_NAMESPACE}
                 )
+                if mc_elements:
+                    # Prune a copy so the shared tree stays intact for later checks
+                    root = copy.deepcopy(root)
+                    mc_elements = root.xpath(
+                        ".//mc:AlternateContent", namespaces={"mc": self.MC_NAMESPACE}
+                    )
                 for elem in mc_elements:
                     elem.getparent().remove(elem)
 
@@ -279,94 +478,41 @@ class BaseSchemaValidator:
         Validate that all .rels files properly reference files and that all files are referenced.
         """
         errors = []
+        package = self.package
 
         # Find all .rels files
-        rels_files = list(self.unpacked_dir.rglob("*.rels"))
+        rels_files = package.rels_files
 
         if not rels_files:
             if self.verbose:
                 print("PASSED - No .rels files found")
             return True
 
-        # Get all files in the unpacked directory (excluding reference files)
-        all_files = []
-        for file_path in self.unpacked_dir.rglob("*"):
-            if (
-                file_path.is_file()
-                and file_path.name != "[Content_Types].xml"
-                and not file_path.name.endswith(".rels")
-            ):  # This file is not referenced by .rels
-                all_files.append(file_path.resolve())
-
-        # Track all files that are referenced by any .rels file
-        all_referenced_files = set()
-
         if self.verbose:
+            target_count = sum(1 for name in package.files if package.is_part(name))
             print(
-                f"Found {len(rels_files)} .rels files and {len(all_files)} target files"
+                f"Found {len(rels_files)} .rels files and {target_count} target files"
             )
 
         # Check each .rels file
-        for rels_file in rels_files:
-            try:
-                # Parse relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-
-                # Get the directory where this .rels file is located
-                rels_dir = rels_file.parent
-
-                # Find all relationships and their targets
-                referenced_files = set()
-                broken_refs = []
-
-                for rel in rels_root.findall(
-                    ".//ns:Relationship",
-                    namespaces={"ns": self.PACKAGE_RELATIONSHIPS_NAMESPACE},
-                ):
-                    target = rel.get("Target")
-                    if target and not target.startswith(
-                        ("http", "mailto:")
-                    ):  # Skip external URLs
-                        # Resolve the target path relative to the .rels file location
-                        if rels_file.name == ".rels":
-                            # Root .rels file - targets are relative to unpacked_dir
-                            target_path = self.unpacked_dir / target
-                        else:
-                            # Other .rels files - targets are relative to their parent's parent
-                            # e.g., word/_rels/document.xml.rels -> targets relative to word/
-                            base_dir = rels_dir.parent
-                            target_path = base_dir / target
-
-                        # Normalize the path and check if it exists
-                        try:
-                            target_path = target_path.resolve()
-                            if target_path.exists() and target_path.is_file():
-                                referenced_files.add(target_path)
-                                all_referenced_files.add(target_path)
-                            else:
-                                broken_refs.append((target, rel.sourceline))
-                        except (OSError, ValueError):
-                            broken_refs.append((target, rel.sourceline))
-
-                # Report broken references
-                if broken_refs:
-                    rel_path = rels_file.relative_to(self.unpacked_dir)
-                    for broken_ref, line_num in broken_refs:
-                        errors.append(
-                            f"  {rel_path}: Line {line_num}: Broken reference to {broken_ref}"
-                        )
+        for rels_name in rels_files:
+            if rels_name in package.rels_errors:
+                errors.append(
+                    f"  Error parsing {rels_name}: {package.rels_errors[rels_name]}"
+                )
+                continue
 
-            except Exception as e:
-                rel_path = rels_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Error parsing {rel_path}: {e}")
+            # Report broken references (external URLs have no target part)
+            for rel in package.relationships[rels_name]:
+                if rel.target_part is not None and rel.target_part not in package.files:
+                    errors.append(
+                        f"  {rels_name}: Line {rel.sourceline}: "
+                        f"Broken reference to {rel.target}"
+                    )
 
         # Check for unreferenced files (files that exist but are not referenced anywhere)
-        unreferenced_files = set(all_files) - all_referenced_files
-
-        if unreferenced_files:
-            for unref_file in sorted(unreferenced_files):
-                unref_rel_path = unref_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Unreferenced file: {unref_rel_path}")
+        for unref_name in package.orphan_parts():
+            errors.append(f"  Unreferenced file: {unref_name}")
 
         if errors:
             print(f"FAILED - Found {len(errors)} relationship validation errors:")
@@ -390,9 +536,8 @@ class BaseSchemaValidator:
         Validate that all r:id attributes in XML files reference existing IDs
         in their corresponding .rels files, and optionally validate relationship types.
         """
-        import lxml.etree
-
         errors = []
+        package = self.package
 
         # Process each XML file that might contain r:id references
         for xml_file in self.xml_files:
@@ -402,74 +547,50 @@ class BaseSchemaValidator:
 
             # Determine the corresponding .rels file
             # For dir/file.xml, it's dir/_rels/file.xml.rels
-            rels_dir = xml_file.parent / "_rels"
-            rels_file = rels_dir / f"{xml_file.name}.rels"
+            xml_rel_path = xml_file.relative_to(self.unpacked_dir).as_posix()
+            rels_name = package.rels_name_for(xml_rel_path)
 
             # Skip if there's no corresponding .rels file (that's okay)
-            if not rels_file.exists():
+            if rels_name not in package.files:
                 continue
 
             try:
-                # Parse the .rels file to get valid relationship IDs and their types
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-                rid_to_type = {}
+                if rels_name in package.rels_errors:
+                    raise package.rels_errors[rels_name]
+
+                # Valid relationship IDs and their types
+                rid_to_type = package.relationship_types[rels_name]
+                for rid, line_num in package.duplicate_ids[rels_name]:
+                    errors.append(
+                        f"  {rels_name}: Line {line_num}: "
+                        f"Duplicate relationship ID '{rid}' (IDs must be unique)"
+                    )
 
-                for rel in rels_root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rid = rel.get("Id")
-                    rel_type = rel.get("Type", "")
-                    if rid:
-                        # Check for duplicate rIds
-                        if rid in rid_to_type:
-                            rels_rel_path = rels_file.relative_to(self.unpacked_dir)
-                            errors.append(
-                                f"  {rels_rel_path}: Line {rel.sourceline}: "
-                                f"Duplicate relationship ID '{rid}' (IDs must be unique)"
-                            )
-                        # Extract just the type name from the full URL
-                        type_name = (
-                            rel_type.split("/")[-1] if "/" in rel_type else rel_type
-                        )
-                        rid_to_type[rid] = type_name
-
-                # Parse the XML file to find all r:id references
-                xml_root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all elements with r:id attributes
-                for elem in xml_root.iter():
-                    # Check for r:id attribute (relationship ID)
-                    rid_attr = elem.get(f"{{{self.OFFICE_RELATIONSHIPS_NAMESPACE}}}id")
-                    if rid_attr:
-                        xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                        elem_name = (
-                            elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
-                        )
+                # Check every r:id reference in the XML file
+                for usage in package.rid_usages(xml_rel_path):
+                    elem_name = usage.element
 
-                        # Check if the ID exists
-                        if rid_attr not in rid_to_type:
-                            errors.append(
-                                f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                f"<{elem_name}> references non-existent relationship '{rid_attr}' "
-                                f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
-                            )
-                        # Check if we have type expectations for this element
-                        elif self.ELEMENT_RELATIONSHIP_TYPES:
-                            expected_type = self._get_expected_relationship_type(
-                                elem_name
-                            )
-                            if expected_type:
-                                actual_type = rid_to_type[rid_attr]
-                                # Check if the actual type matches or contains the expected type
-                                if expected_type not in actual_type.lower():
-                                    errors.append(
-                                        f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                        f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
-                                        f"but should point to a '{expected_type}' relationship"
-                                    )
+                    # Check if the ID exists
+                    if usage.id not in rid_to_type:
+                        errors.append(
+                            f"  {xml_rel_path}: Line {usage.sourceline}: "
+                            f"<{elem_name}> references non-existent relationship '{usage.id}' "
+                            f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
+                        )
+                    # Check if we have type expectations for this element
+                    elif self.ELEMENT_RELATIONSHIP_TYPES:
+                        expected_type = self._get_expected_relationship_type(elem_name)
+                        if expected_type:
+                            actual_type = rid_to_type[usage.id]
+                            # Check if the actual type matches or contains the expected type
+                            if expected_type not in actual_type.lower():
+                                errors.append(
+                                    f"  {xml_rel_path}: Line {usage.sourceline}: "
+                                    f"<{elem_name}> references '{usage.id}' which points to '{actual_type}' "
+                                    f"but should point to a '{expected_type}' relationship"
+                                )
 
             except Exception as e:
-                xml_rel_path = xml_file.relative_to(self.unpacked_dir)
                 errors.append(f"  Error processing {xml_rel_path}: {e}")
 
         if errors:
@@ -522,34 +643,19 @@ class BaseSchemaValidator:
     def validate_content_types(self):
         """Validate that all content files are properly declared in [Content_Types].xml."""
         errors = []
+        package = self.package
 
         # Find [Content_Types].xml file
-        content_types_file = self.unpacked_dir / "[Content_Types].xml"
-        if not content_types_file.exists():
+        if CONTENT_TYPES_PART not in package.files:
             print("FAILED - [Content_Types].xml file not found")
             return False
 
         try:
-            # Parse and get all declared parts and extensions
-            root = lxml.etree.parse(str(content_types_file)).getroot()
-            declared_parts = set()
-            declared_extensions = set()
-
-            # Get Override declarations (specific files)
-            for override in root.findall(
-                f".//{{{self.CONTENT_TYPES_NAMESPACE}}}Override"
-            ):
-                part_name = override.get("PartName")
-                if part_name is not None:
-                    declared_parts.add(part_name.lstrip("/"))
-
-            # Get Default declarations (by extension)
-            for default in root.findall(
-                f".//{{{self.CONTENT_TYPES_NAMESPACE}}}Default"
-            ):
-                extension = default.get("Extension")
-                if extension is not None:
-                    declared_extensions.add(extension.lower())
+            # Declared parts and extensions
+            if package.content_types_error is not None:
+                raise package.content_types_error
+            declared_parts = package.override_parts
+            declared_extensions = package.default_extensions
 
             # Root elements that require content type declaration
             declarable_roots = {
@@ -575,10 +681,6 @@ class BaseSchemaValidator:
                 "emf": "image/x-emf",
             }
 
-            # Get all files in the unpacked directory
-            all_files = list(self.unpacked_dir.rglob("*"))
-            all_files = [f for f in all_files if f.is_file()]
-
             # Check all XML files for Override declarations
             for xml_file in self.xml_files:
                 path_str = str(xml_file.relative_to(self.unpacked_dir)).replace(
@@ -593,7 +695,7 @@ class BaseSchemaValidator:
                     continue
 
                 try:
-                    root_tag = lxml.etree.parse(str(xml_file)).getroot().tag
+                    root_tag = self._parse_xml(xml_file).getroot().tag
                     root_name = root_tag.split("}")[-1] if "}" in root_tag else root_tag
 
                     if root_name in declarable_roots and path_str not in declared_parts:
@@ -605,20 +707,20 @@ class BaseSchemaValidator:
                     continue  # Skip unparseable files
 
             # Check all non-XML files for Default extension declarations
-            for file_path in all_files:
+            for relative_path, file_path in package.files.items():
                 # Skip XML files and metadata files (already checked above)
                 if file_path.suffix.lower() in {".xml", ".rels"}:
                     continue
                 if file_path.name == "[Content_Types].xml":
                     continue
-                if "_rels" in file_path.parts or "docProps" in file_path.parts:
+                path_parts = relative_path.split("/")
+                if "_rels" in path_parts or "docProps" in path_parts:
                     continue
 
                 extension = file_path.suffix.lstrip(".").lower()
                 if extension and extension not in declared_extensions:
                     # Check if it's a known media extension that should be declared
                     if extension in media_extensions:
-                        relative_path = file_path.relative_to(self.unpacked_dir)
                         errors.append(
                             f'  {relative_path}: File with extension \'{extension}\' not declared in [Content_Types].xml - should add: <Default Extension="{extension}" ContentType="{media_extensions[extension]}"/>'
                         )
@@ -692,11 +794,11 @@ class BaseSchemaValidator:
         valid_count = 0
         skipped_count = 0
 
-        for xml_file in self.xml_files:
+        results = self._validate_files_against_xsd(self.xml_files)
+        self.close()
+
+        for xml_file, (is_valid, new_file_errors) in zip(self.xml_files, results):
             relative_path = str(xml_file.relative_to(self.unpacked_dir))
-            is_valid, new_file_errors = self.validate_file_against_xsd(
-                xml_file, verbose=False
-            )
 
             if is_valid is None:
                 skipped_count += 1
@@ -738,6 +840,100 @@ class BaseSchemaValidator:
                 print("\nPASSED - No new XSD validation errors introduced")
             return True
 
+    def _validate_files_against_xsd(self, xml_files):
+        """Run validate_file_against_xsd over xml_files, in parallel when there are enough of them.
+
+        Returns:
+            list: (is_valid, new_errors_set) per file, in the order of xml_files
+        """
+        self._evict_baseline_cache()
+        schema_paths = {self._get_schema_path(xml_file) for xml_file in xml_files}
+        schema_paths.discard(None)
+        workers = min(self.workers, len(xml_files))
+        if self._package_zip is not None and self._package_zip_path is None:
+            # A zip without a file name can't be reopened by pool workers
+            workers = 1
+        if len(xml_files) < self.MIN_PARALLEL_XML_FILES:
+            workers = 1
+
+        if workers <= 1:
+            return [self.validate_file_against_xsd(f, verbose=False) for f in xml_files]
+
+        pool = self._get_xsd_pool(workers, schema_paths)
+        # Large chunks keep the per-task cost of pickling this validator low
+        chunksize = max(1, len(xml_files) // (workers * 4))
+        return list(
+            pool.map(self.validate_file_against_xsd, xml_files, chunksize=chunksize)
+        )
+
+    @classmethod
+    def _get_xsd_pool(cls, workers, schema_paths):
+        """Return the shared XSD process pool, starting it with warmed schemas if needed.
+
+        The running pool is reused when it has the same number of workers and was warmed
+        with every schema in schema_paths; otherwise it is replaced by one that is.
+        """
+        schema_paths = frozenset(schema_paths)
+        pool = BaseSchemaValidator._xsd_pool
+        if pool is not None and (
+            BaseSchemaValidator._xsd_pool_workers != workers
+            or not schema_paths <= BaseSchemaValidator._xsd_pool_schemas
+        ):
+            pool.shutdown()
+            pool = None
+
+        if pool is None:
+            if BaseSchemaValidator._xsd_pool_workers is None:
+                atexit.register(BaseSchemaValidator._shutdown_xsd_pool)
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=BaseSchemaValidator._warm_schema_cache,
+                initargs=(sorted(schema_paths),),
+            )
+            BaseSchemaValidator._xsd_pool = pool
+            BaseSchemaValidator._xsd_pool_workers = workers
+            BaseSchemaValidator._xsd_pool_schemas = schema_paths
+        return pool
+
+    @staticmethod
+    def _shutdown_xsd_pool():
+        """Stop the shared XSD process pool, if one is running."""
+        if BaseSchemaValidator._xsd_pool is not None:
+            BaseSchemaValidator._xsd_pool.shutdown()
+            BaseSchemaValidator._xsd_pool = None
+
+    @staticmethod
+    def _warm_schema_cache(schema_paths):
+        """Compile schemas ahead of the first validation (runs in each pool worker)."""
+        for schema_path in schema_paths:
+            try:
+                BaseSchemaValidator._load_schema(schema_path)
+            except Exception:
+                pass  # Reported per file when the schema is used
+
+    @staticmethod
+    def _load_schema(schema_path):
+        """Return the compiled XMLSchema for schema_path, compiling it on first use.
+
+        A schema that fails to compile is cached too, and its error re-raised on every use.
+        """
+        key = str(schema_path)
+        schema = BaseSchemaValidator._schema_cache.get(key)
+        if schema is None:
+            try:
+                with open(schema_path, "rb") as xsd_file:
+                    parser = lxml.etree.XMLParser()
+                    xsd_doc = lxml.etree.parse(
+                        xsd_file, parser=parser, base_url=str(schema_path)
+                    )
+                    schema = lxml.etree.XMLSchema(xsd_doc)
+            except Exception as e:
+                schema = e
+            BaseSchemaValidator._schema_cache[key] = schema
+        if isinstance(schema, Exception):
+            raise schema
+        return schema
+
     def _get_schema_path(self, xml_file):
         """Determine the appropriate schema path for an XML file."""
         # Check exact filename match
@@ -762,96 +958,82 @@ class BaseSchemaValidator:
 
         return None
 
-    def _clean_ignorable_namespaces(self, xml_doc):
-        """Remove attributes and elements not in allowed namespaces."""
-        # Create a clean copy
-        xml_string = lxml.etree.tostring(xml_doc, encoding="unicode")
-        xml_copy = lxml.etree.fromstring(xml_string)
-
-        # Remove attributes not in allowed namespaces
-        for elem in xml_copy.iter():
-            attrs_to_remove = []
-
-            for attr in elem.attrib:
-                # Check if attribute is from a namespace other than allowed ones
-                if "{" in attr:
-                    ns = attr.split("}")[0][1:]
-                    if ns not in self.OOXML_NAMESPACES:
-                        attrs_to_remove.append(attr)
+    def _preprocess_for_xsd(self, xml_doc, clean_ignorable):
+        """Prepare a tree for XSD validation in a single in-place pass.
 
-            # Remove collected attributes
-            for attr in attrs_to_remove:
-                del elem.attrib[attr]
-
-        # Remove elements not in allowed namespaces
-        self._remove_ignorable_elements(xml_copy)
+        Drops the root mc:Ignorable attribute and strips template tags ({{ ... }}) from
+        text outside <t> elements. With clean_ignorable, also removes attributes and
+        elements whose namespace is not in OOXML_NAMESPACES (the root element is kept).
+        """
+        root = xml_doc.getroot()
 
-        return lxml.etree.ElementTree(xml_copy)
+        # Remove mc:Ignorable attribute from root
+        mc_ignorable = f"{{{self.MC_NAMESPACE}}}Ignorable"
+        if mc_ignorable in root.attrib:
+            del root.attrib[mc_ignorable]
 
-    def _remove_ignorable_elements(self, root):
-        """Recursively remove all elements not in allowed namespaces."""
         elements_to_remove = []
-
-        # Find elements to remove
-        for elem in list(root):
-            # Skip non-element nodes (comments, processing instructions, etc.)
-            if not hasattr(elem, "tag") or callable(elem.tag):
+        # Elements only: comments and processing instructions are left as they are
+        for elem in root.iter(lxml.etree.Element):
+            tag = elem.tag
+
+            # Template tags are placeholders for content replacement; keep them inside <t>
+            if not (tag.endswith("}t") or tag == "t"):
+                if elem.text and "{{" in elem.text:
+                    elem.text = self.TEMPLATE_TAG_PATTERN.sub("", elem.text) or None
+                if elem.tail and "{{" in elem.tail:
+                    elem.tail = self.TEMPLATE_TAG_PATTERN.sub("", elem.tail) or None
+
+            if not clean_ignorable:
                 continue
 
-            tag_str = str(elem.tag)
-            if tag_str.startswith("{"):
-                ns = tag_str.split("}")[0][1:]
+            # Remove attributes not in allowed namespaces
+            for attr in elem.attrib.keys():
+                if attr.startswith("{"):
+                    ns = attr.split("}")[0][1:]
+                    if ns not in self.OOXML_NAMESPACES:
+                        del elem.attrib[attr]
+
+            # Remove elements not in allowed namespaces
+            if elem is not root and tag.startswith("{"):
+                ns = tag.split("}")[0][1:]
                 if ns not in self.OOXML_NAMESPACES:
                     elements_to_remove.append(elem)
-                    continue
 
-            # Recursively clean child elements
-            self._remove_ignorable_elements(elem)
-
-        # Remove collected elements
+        # Removing an element drops its subtree and tail with it
         for elem in elements_to_remove:
-            root.remove(elem)
-
-    def _preprocess_for_mc_ignorable(self, xml_doc):
-        """Preprocess XML to handle mc:Ignorable attribute properly."""
-        # Remove mc:Ignorable attributes before validation
-        root = xml_doc.getroot()
-
-        # Remove mc:Ignorable attribute from root
-        if f"{{{self.MC_NAMESPACE}}}Ignorable" in root.attrib:
-            del root.attrib[f"{{{self.MC_NAMESPACE}}}Ignorable"]
+            elem.getparent().remove(elem)
 
         return xml_doc
 
-    def _validate_single_file_xsd(self, xml_file, base_path):
-        """Validate a single XML file against XSD schema. Returns (is_valid, errors_set)."""
+    def _validate_single_file_xsd(self, xml_file, base_path, source=None):
+        """Validate a single XML file against XSD schema. Returns (is_valid, errors_set).
+
+        source, when given, is a file-like object holding the XML for xml_file; otherwise
+        the file is read from disk.
+        """
         schema_path = self._get_schema_path(xml_file)
         if not schema_path:
             return None, None  # Skip file
 
         try:
-            # Load schema
-            with open(schema_path, "rb") as xsd_file:
-                parser = lxml.etree.XMLParser()
-                xsd_doc = lxml.etree.parse(
-                    xsd_file, parser=parser, base_url=str(schema_path)
-                )
-                schema = lxml.etree.XMLSchema(xsd_doc)
+            # Load schema (compiled once per process)
+            schema = self._load_schema(schema_path)
 
             # Load and preprocess XML
-            with open(xml_file, "r") as f:
-                xml_doc = lxml.etree.parse(f)
-
-            xml_doc, _ = self._remove_template_tags_from_text_nodes(xml_doc)
-            xml_doc = self._preprocess_for_mc_ignorable(xml_doc)
+            if source is not None:
+                xml_doc = lxml.etree.parse(source)
+            else:
+                # Preprocessing works in place, so copy the tree shared with other checks
+                xml_doc = copy.deepcopy(self._parse_xml(xml_file))
 
-            # Clean ignorable namespaces if needed
+            # Clean ignorable namespaces only in main content folders
             relative_path = xml_file.relative_to(base_path)
-            if (
-                relative_path.parts
-                and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
-            ):
-                xml_doc = self._clean_ignorable_namespaces(xml_doc)
+            xml_doc = self._preprocess_for_xsd(
+                xml_doc,
+                clean_ignorable=bool(relative_path.parts)
+                and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS,
+            )
 
             # Validate
             if schema.validate(xml_doc):
@@ -875,76 +1057,153 @@ class BaseSchemaValidator:
         Returns:
             set: Set of error messages from the original file
         """
-        import tempfile
-        import zipfile
-
         # Resolve both paths to handle symlinks (e.g., /var vs /private/var on macOS)
         xml_file = Path(xml_file).resolve()
         unpacked_dir = self.unpacked_dir.resolve()
         relative_path = xml_file.relative_to(unpacked_dir)
+        member_name = relative_path.as_posix()
+
+        if member_name not in self._original_errors:
+            errors = self._load_baseline_errors(member_name)
+            if errors is None:
+                errors = self._validate_original_member(member_name)
+                self._store_baseline_errors(member_name, errors)
+            self._original_errors[member_name] = errors
+        return self._original_errors[member_name]
+
+    def _baseline_cache_path(self, member_name):
+        """Cache file for one member of the original package, or None if caching is off."""
+        if not self.baseline_cache:
+            return None
+
+        if self._original_sha256 is None:
+            digest = hashlib.sha256()
+            with open(self.original_file, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+            self._original_sha256 = digest.hexdigest()
+
+        member_key = hashlib.sha256(member_name.encode("utf-8")).hexdigest()
+        return (
+            self.BASELINE_CACHE_DIR
+            / f"v{self.BASELINE_CACHE_VERSION}"
+            / self._validator_fingerprint()
+            / self._original_sha256
+            / f"{member_key}.json"
+        )
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Extract original file
-            with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                zip_ref.extractall(temp_path)
-
-            # Find corresponding file in original
-            original_xml_file = temp_path / relative_path
-
-            if not original_xml_file.exists():
-                # File didn't exist in original, so no original errors
-                return set()
-
-            # Validate the specific file in original
-            is_valid, errors = self._validate_single_file_xsd(
-                original_xml_file, temp_path
-            )
-            return errors if errors else set()
-
-    def _remove_template_tags_from_text_nodes(self, xml_doc):
-        """Remove template tags from XML text nodes and collect warnings.
-
-        Template tags follow the pattern {{ ... }} and are used as placeholders
-        for content replacement. They should be removed from text content before
-        XSD validation while preserving XML structure.
+    def _validator_fingerprint(self):
+        """Hash of everything that decides the XSD errors a member reports.
 
-        Returns:
-            tuple: (cleaned_xml_doc, warnings_list)
+        Covers the validator class, the path, size and mtime of every file under
+        schemas_dir (schemas import each other), and the source of the validation
+        modules, which hold the XSD preprocessing. Computed once per process.
         """
-        warnings = []
-        template_pattern = re.compile(r"\{\{[^}]*\}\}")
-
-        # Create a copy of the document to avoid modifying the original
-        xml_string = lxml.etree.tostring(xml_doc, encoding="unicode")
-        xml_copy = lxml.etree.fromstring(xml_string)
-
-        def process_text_content(text, content_type):
-            if not text:
-                return text
-            matches = list(template_pattern.finditer(text))
-            if matches:
-                for match in matches:
-                    warnings.append(
-                        f"Found template tag in {content_type}: {match.group()}"
+        key = (type(self), self.schemas_dir)
+        fingerprint = self._validator_fingerprints.get(key)
+        if fingerprint is None:
+            digest = hashlib.sha256()
+            digest.update(f"{type(self).__module__}.{type(self).__qualname__}".encode())
+            digest.update(str(self.schemas_dir.resolve()).encode())
+            for path in sorted(self.schemas_dir.rglob("*")):
+                if path.is_file():
+                    stat = path.stat()
+                    digest.update(
+                        f"\0{path.relative_to(self.schemas_dir).as_posix()}"
+                        f"\0{stat.st_size}\0{stat.st_mtime_ns}".encode()
                     )
-                return template_pattern.sub("", text)
-            return text
-
-        # Process all text nodes in the document
-        for elem in xml_copy.iter():
-            # Skip processing if this is a w:t element
-            if not hasattr(elem, "tag") or callable(elem.tag):
-                continue
-            tag_str = str(elem.tag)
-            if tag_str.endswith("}t") or tag_str == "t":
-                continue
+            for cls in type(self).__mro__:
+                module = sys.modules.get(cls.__module__)
+                source = getattr(module, "__file__", None)
+                if cls is not object and source:
+                    digest.update(Path(source).read_bytes())
+            fingerprint = digest.hexdigest()[:32]
+            self._validator_fingerprints[key] = fingerprint
+        return fingerprint
+
+    def _evict_baseline_cache(self):
+        """Drop other cache versions and packages unused for BASELINE_CACHE_MAX_AGE.
+
+        Runs once per validator; the current package's directory is touched so it
+        counts as used.
+        """
+        if not self.baseline_cache or self._baseline_cache_evicted:
+            return
+        self._baseline_cache_evicted = True
 
-            elem.text = process_text_content(elem.text, "text content")
-            elem.tail = process_text_content(elem.tail, "tail content")
+        try:
+            package_dir = self._baseline_cache_path("").parent
+            if package_dir.is_dir():
+                os.utime(package_dir)
+            cutoff = time.time() - self.BASELINE_CACHE_MAX_AGE
+            for version_dir in self.BASELINE_CACHE_DIR.iterdir():
+                if version_dir.name != f"v{self.BASELINE_CACHE_VERSION}":
+                    shutil.rmtree(version_dir, ignore_errors=True)
+                    continue
+                for fingerprint_dir in version_dir.iterdir():
+                    for cached_package in fingerprint_dir.iterdir():
+                        if cached_package.stat().st_mtime < cutoff:
+                            shutil.rmtree(cached_package, ignore_errors=True)
+                    if not any(fingerprint_dir.iterdir()):
+                        fingerprint_dir.rmdir()
+        except OSError:
+            pass  # Another validation may be evicting at the same time
+
+    def _load_baseline_errors(self, member_name):
+        """Cached XSD errors of an original member, or None on a cache miss."""
+        cache_path = self._baseline_cache_path(member_name)
+        if cache_path is None:
+            return None
 
-        return lxml.etree.ElementTree(xml_copy), warnings
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        # Anything but the shape _store_baseline_errors writes is a miss
+        if not isinstance(entry, dict) or entry.get("member") != member_name:
+            return None
+        errors = entry.get("errors")
+        if not isinstance(errors, list) or not all(isinstance(e, str) for e in errors):
+            return None
+        return set(errors)
+
+    def _store_baseline_errors(self, member_name, errors):
+        """Record the XSD errors of an original member; failures only cost a cache miss."""
+        cache_path = self._baseline_cache_path(member_name)
+        if cache_path is None:
+            return
+
+        # Write to a temp file and rename, so concurrent pool workers never see partial JSON
+        temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"member": member_name, "errors": sorted(errors)}, f)
+            os.replace(temp_path, cache_path)
+        except OSError:
+            temp_path.unlink(missing_ok=True)
+
+    def _read_original_member(self, member_name):
+        """Bytes of one member of the original package (KeyError if it has none)."""
+        if self._original_zip is None:
+            self._original_zip = zipfile.ZipFile(self.original_file, "r")
+        return self._original_zip.read(member_name)
+
+    def _validate_original_member(self, member_name):
+        """Validate one member of the original package, read straight from the zip."""
+        try:
+            data = self._read_original_member(member_name)
+        except KeyError:
+            # File didn't exist in original, so no original errors
+            return set()
+
+        # Validate the specific file in original, using its package path for schema lookup
+        is_valid, errors = self._validate_single_file_xsd(
+            Path(member_name), Path(), source=io.BytesIO(data)
+        )
+        return errors if errors else set()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,282 @@
+"""
+Relationship graph of an unpacked Office package, shared by the package-level checks.
+"""
+
+import fnmatch
+import json
+import os
+import posixpath
+from collections import namedtuple
+from pathlib import Path
+
+import lxml.etree
+
+PACKAGE_RELATIONSHIPS_NAMESPACE = (
+    "http://schemas.openxmlformats.org/package/2006/relationships"
+)
+OFFICE_RELATIONSHIPS_NAMESPACE = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+)
+CONTENT_TYPES_NAMESPACE = (
+    "http://schemas.openxmlformats.org/package/2006/content-types"
+)
+
+CONTENT_TYPES_PART = "[Content_Types].xml"
+
+# Left by unpack.py in the directories it unpacks; not part of the package (see pack.py)
+UNPACK_MANIFEST_NAME = ".unpack-manifest.json"
+
+# One <Relationship> of a .rels file. target_part is the package part name the target
+# resolves to (None for external or empty targets), whether or not that part exists.
+Relationship = namedtuple(
+    "Relationship", ["id", "type", "target", "target_part", "sourceline"]
+)
+
+# One r:id attribute in a part
+RelationshipUsage = namedtuple("RelationshipUsage", ["id", "element", "sourceline"])
+
+
+class PackageGraph:
+    """Parts, relationships, content types and r:id usages of an unpacked package.
+
+    Part names are package-relative POSIX paths (e.g. "ppt/slides/slide1.xml"). The
+    directory is walked once and every .rels file parsed once; r:id usages of a part are
+    collected the first time they are asked for. Relationship targets are resolved
+    lexically, so checking them costs no filesystem calls.
+
+    For a package read straight from a zip, pass its member_names instead of walking;
+    paths are then unpacked_dir / name and parse_xml must know how to read them.
+    """
+
+    def __init__(self, unpacked_dir, parse_xml=lxml.etree.parse, member_names=None):
+        self.unpacked_dir = Path(unpacked_dir)
+        # Returns the parsed tree for a path (validators pass theirs to share trees)
+        self._parse_xml = parse_xml
+
+        # Every file in the package (part name -> path), in directory walk order
+        self.files = {}
+        # .rels file name -> relationships in document order (or the error parsing it)
+        self.relationships = {}
+        self.rels_errors = {}
+        # .rels file name -> {relationship id: type name}, last declaration winning
+        self.relationship_types = {}
+        # .rels file name -> [(id, sourceline)] of ids declared more than once
+        self.duplicate_ids = {}
+        # Declared content types; content_types_error is set if the part failed to parse
+        self.override_parts = set()
+        self.default_extensions = set()
+        self.content_types_error = None
+        self._rid_usages = {}
+
+        if member_names is None:
+            self._walk()
+        else:
+            for name in member_names:
+                self.files[name] = self.unpacked_dir / name
+        for rels_name in self.rels_files:
+            self._load_relationships(rels_name)
+        if CONTENT_TYPES_PART in self.files:
+            self._load_content_types()
+
+    def _walk(self):
+        self.files.update(walk_package_files(self.unpacked_dir))
+
+    @property
+    def rels_files(self):
+        """Names of all .rels files, in walk order."""
+        return [name for name in self.files if name.endswith(".rels")]
+
+    def glob(self, pattern):
+        """Names of files matching pattern ("dir/name-pattern"), like Path.glob."""
+        directory, name_pattern = posixpath.split(pattern)
+        return [
+            name
+            for name in self.files
+            if posixpath.dirname(name) == directory
+            and fnmatch.fnmatchcase(posixpath.basename(name), name_pattern)
+        ]
+
+    @staticmethod
+    def rels_name_for(part_name):
+        """The .rels file holding part_name's relationships (dir/_rels/name.rels)."""
+        directory, name = posixpath.split(part_name)
+        return posixpath.join(directory, "_rels", f"{name}.rels")
+
+    @staticmethod
+    def target_base(rels_name):
+        """Directory that targets in rels_name are relative to."""
+        if posixpath.basename(rels_name) == ".rels":
+            # Root .rels file - targets are relative to the package root
+            return ""
+        # e.g., word/_rels/document.xml.rels -> targets relative to word/
+        return posixpath.dirname(posixpath.dirname(rels_name))
+
+    @staticmethod
+    def is_external(target):
+        return target.startswith(("http", "mailto:"))
+
+    def resolve_target(self, rels_name, target):
+        """Part name target points to, or None if it is external or empty.
+
+        Targets that leave the package (absolute or "../" past the root) resolve to
+        names that are never in files, so they count as broken.
+        """
+        if not target or self.is_external(target):
+            return None
+        return posixpath.normpath(posixpath.join(self.target_base(rels_name), target))
+
+    def _load_relationships(self, rels_name):
+        try:
+            rels_root = self._parse_xml(self.files[rels_name]).getroot()
+        except Exception as e:
+            self.rels_errors[rels_name] = e
+            return
+
+        relationships = []
+        types = {}
+        duplicates = []
+        for rel in rels_root.findall(
+            f".//{{{PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
+        ):
+            rid = rel.get("Id")
+            rel_type = rel.get("Type", "")
+            target = rel.get("Target")
+            relationships.append(
+                Relationship(
+                    rid,
+                    rel_type,
+                    target,
+                    self.resolve_target(rels_name, target),
+                    rel.sourceline,
+                )
+            )
+            if rid:
+                if rid in types:
+                    duplicates.append((rid, rel.sourceline))
+                # Keep just the type name from the full URL
+                types[rid] = rel_type.split("/")[-1]
+
+        self.relationships[rels_name] = relationships
+        self.relationship_types[rels_name] = types
+        self.duplicate_ids[rels_name] = duplicates
+
+    def _load_content_types(self):
+        try:
+            root = self._parse_xml(self.files[CONTENT_TYPES_PART]).getroot()
+        except Exception as e:
+            self.content_types_error = e
+            return
+
+        # Override declarations (specific parts)
+        for override in root.findall(f".//{{{CONTENT_TYPES_NAMESPACE}}}Override"):
+            part_name = override.get("PartName")
+            if part_name is not None:
+                self.override_parts.add(part_name.lstrip("/"))
+
+        # Default declarations (by extension)
+        for default in root.findall(f".//{{{CONTENT_TYPES_NAMESPACE}}}Default"):
+            extension = default.get("Extension")
+            if extension is not None:
+                self.default_extensions.add(extension.lower())
+
+    def rid_usages(self, part_name):
+        """r:id attributes in part_name, in document order (parse errors propagate)."""
+        if part_name not in self._rid_usages:
+            rid_attr = f"{{{OFFICE_RELATIONSHIPS_NAMESPACE}}}id"
+            usages = []
+            root = self._parse_xml(self.files[part_name]).getroot()
+            for elem in root.iter(lxml.etree.Element):
+                rid = elem.get(rid_attr)
+                if rid:
+                    element = elem.tag.split("}")[-1]
+                    usages.append(RelationshipUsage(rid, element, elem.sourceline))
+            self._rid_usages[part_name] = usages
+        return self._rid_usages[part_name]
+
+    def is_part(self, name):
+        """True for files relationships can target (not .rels or content types)."""
+        return (
+            posixpath.basename(name) != CONTENT_TYPES_PART
+            and not name.endswith(".rels")
+        )
+
+    def referenced_parts(self):
+        """Existing parts that are the target of at least one relationship."""
+        return {
+            rel.target_part
+            for relationships in self.relationships.values()
+            for rel in relationships
+            if rel.target_part in self.files
+        }
+
+    def orphan_parts(self):
+        """Parts no relationship points to, sorted like paths."""
+        referenced = self.referenced_parts()
+        return sorted(
+            (
+                name
+                for name in self.files
+                if self.is_part(name) and name not in referenced
+            ),
+            key=lambda name: name.split("/"),
+        )
+
+    def reachable_parts(self):
+        """Parts reachable from the package root (_rels/.rels) through relationships."""
+        reachable = set()
+        pending = ["_rels/.rels"]
+        while pending:
+            for rel in self.relationships.get(pending.pop(), ()):
+                part_name = rel.target_part
+                if part_name in self.files and part_name not in reachable:
+                    reachable.add(part_name)
+                    pending.append(self.rels_name_for(part_name))
+        return reachable
+
+    def unreachable_parts(self):
+        """Existing parts not reachable from the package root, sorted like paths."""
+        reachable = self.reachable_parts()
+        return sorted(
+            (
+                name
+                for name in self.files
+                if self.is_part(name) and name not in reachable
+            ),
+            key=lambda name: name.split("/"),
+        )
+
+
+def walk_package_files(unpacked_dir):
+    """{part name: path} of the files under unpacked_dir, in directory walk order."""
+    files = {}
+    for dir_path, dir_names, file_names in os.walk(unpacked_dir):
+        relative_dir = os.path.relpath(dir_path, unpacked_dir)
+        prefix = ""
+        if relative_dir != ".":
+            prefix = relative_dir.replace(os.sep, "/") + "/"
+        for file_name in file_names:
+            files[prefix + file_name] = Path(dir_path) / file_name
+    files.pop(UNPACK_MANIFEST_NAME, None)
+    return files
+
+
+def read_unpack_manifest(unpacked_dir):
+    """(original package, names of members only in it) of an unpack.py directory.
+
+    Returns None if unpacked_dir has no manifest.
+    Members a selective unpack left in the original, and not added since, belong to
+    the package without being files under unpacked_dir.
+    """
+    unpacked_dir = Path(unpacked_dir)
+    try:
+        with open(unpacked_dir / UNPACK_MANIFEST_NAME, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+
+    member_names = [
+        entry["name"]
+        for entry in manifest["members"]
+        if entry["sha256"] is None and not (unpacked_dir / entry["name"]).exists()
+    ]
+    return Path(manifest["source"]), member_names
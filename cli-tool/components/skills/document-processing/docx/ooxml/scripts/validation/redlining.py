@@ -7,12 +7,20 @@ import tempfile
 import zipfile
 from pathlib import Path
 
+from .package_graph import read_unpack_manifest
+
 
 class RedliningValidator:
     """Validator for tracked changes in Word documents."""
 
     def __init__(self, unpacked_dir, original_docx, verbose=False):
-        self.unpacked_dir = Path(unpacked_dir)
+        # unpacked_dir may also be the .docx itself, as a path or zipfile.ZipFile
+        if isinstance(unpacked_dir, zipfile.ZipFile):
+            self.package_zip = unpacked_dir
+            self.unpacked_dir = Path(unpacked_dir.filename or "")
+        else:
+            self.package_zip = None
+            self.unpacked_dir = Path(unpacked_dir)
         self.original_docx = Path(original_docx)
         self.verbose = verbose
         self.namespaces = {
@@ -23,7 +31,8 @@ class RedliningValidator:
         """Main validation method that returns True if valid, False otherwise."""
         # Verify unpacked directory exists and has correct structure
         modified_file = self.unpacked_dir / "word" / "document.xml"
-        if not modified_file.exists():
+        modified_xml = self._read_modified_document()
+        if modified_xml is None:
             print(f"FAILED - Modified document.xml not found at {modified_file}")
             return False
 
@@ -31,8 +40,7 @@ class RedliningValidator:
         try:
             import xml.etree.ElementTree as ET
 
-            tree = ET.parse(modified_file)
-            root = tree.getroot()
+            root = ET.fromstring(modified_xml)
 
             # Check for w:del or w:ins tags authored by Claude
             del_elements = root.findall(".//w:del", self.namespaces)
@@ -60,56 +68,72 @@ class RedliningValidator:
             # If we can't parse the XML, continue with full validation
             pass
 
-        # Create temporary directory for unpacking original docx
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Unpack original docx
-            try:
-                with zipfile.ZipFile(self.original_docx, "r") as zip_ref:
-                    zip_ref.extractall(temp_path)
-            except Exception as e:
-                print(f"FAILED - Error unpacking original docx: {e}")
-                return False
-
-            original_file = temp_path / "word" / "document.xml"
-            if not original_file.exists():
-                print(
-                    f"FAILED - Original document.xml not found in {self.original_docx}"
-                )
-                return False
-
-            # Parse both XML files using xml.etree.ElementTree for redlining validation
-            try:
-                import xml.etree.ElementTree as ET
-
-                modified_tree = ET.parse(modified_file)
-                modified_root = modified_tree.getroot()
-                original_tree = ET.parse(original_file)
-                original_root = original_tree.getroot()
-            except ET.ParseError as e:
-                print(f"FAILED - Error parsing XML files: {e}")
-                return False
-
-            # Remove Claude's tracked changes from both documents
-            self._remove_claude_tracked_changes(original_root)
-            self._remove_claude_tracked_changes(modified_root)
-
-            # Extract and compare text content
-            modified_text = self._extract_text_content(modified_root)
-            original_text = self._extract_text_content(original_root)
-
-            if modified_text != original_text:
-                # Show detailed character-level differences for each paragraph
-                error_message = self._generate_detailed_diff(
-                    original_text, modified_text
-                )
-                print(error_message)
-                return False
+        # Read the original document.xml straight from the original docx
+        try:
+            with zipfile.ZipFile(self.original_docx, "r") as zip_ref:
+                original_xml = self._read_zip_member(zip_ref, "word/document.xml")
+        except Exception as e:
+            print(f"FAILED - Error reading original docx: {e}")
+            return False
+
+        if original_xml is None:
+            print(f"FAILED - Original document.xml not found in {self.original_docx}")
+            return False
+
+        # Parse both XML files using xml.etree.ElementTree for redlining validation
+        try:
+            import xml.etree.ElementTree as ET
 
-            if self.verbose:
-                print("PASSED - All changes by Claude are properly tracked")
-            return True
+            modified_root = ET.fromstring(modified_xml)
+            original_root = ET.fromstring(original_xml)
+        except ET.ParseError as e:
+            print(f"FAILED - Error parsing XML files: {e}")
+            return False
+
+        # Remove Claude's tracked changes from both documents
+        self._remove_claude_tracked_changes(original_root)
+        self._remove_claude_tracked_changes(modified_root)
+
+        # Extract and compare text content
+        modified_text = self._extract_text_content(modified_root)
+        original_text = self._extract_text_content(original_root)
+
+        if modified_text != original_text:
+            # Show detailed character-level differences for each paragraph
+            error_message = self._generate_detailed_diff(original_text, modified_text)
+            print(error_message)
+            return False
+
+        if self.verbose:
+            print("PASSED - All changes by Claude are properly tracked")
+        return True
+
+    def _read_modified_document(self):
+        """Bytes of the modified word/document.xml, or None if it doesn't exist."""
+        if self.package_zip is not None:
+            return self._read_zip_member(self.package_zip, "word/document.xml")
+        if self.unpacked_dir.is_file():
+            with zipfile.ZipFile(self.unpacked_dir, "r") as zip_ref:
+                return self._read_zip_member(zip_ref, "word/document.xml")
+
+        modified_file = self.unpacked_dir / "word" / "document.xml"
+        if modified_file.exists():
+            return modified_file.read_bytes()
+
+        # A selective unpack may have left document.xml, unchanged, in the original
+        manifest = read_unpack_manifest(self.unpacked_dir)
+        if manifest is None or "word/document.xml" not in manifest[1]:
+            return None
+        with zipfile.ZipFile(manifest[0], "r") as zip_ref:
+            return self._read_zip_member(zip_ref, "word/document.xml")
+
+    @staticmethod
+    def _read_zip_member(zip_ref, member_name):
+        """Bytes of a zip member, or None if the archive doesn't have it."""
+        try:
+            return zip_ref.read(member_name)
+        except KeyError:
+            return None
 
     def _generate_detailed_diff(self, original_text, modified_text):
         """Generate detailed word-level differences using git word diff."""
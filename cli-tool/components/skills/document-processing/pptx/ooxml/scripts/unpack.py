@@ -1,29 +1,107 @@
 #!/usr/bin/env python3
-"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)"""
+"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)
 
+Example usage:
+    python unpack.py <office_file> <output_dir> [--include <pattern> ...]
+"""
+
+import argparse
+import fnmatch
 import random
-import sys
-import defusedxml.minidom
 import zipfile
 from pathlib import Path
 
-# Get command line arguments
-assert len(sys.argv) == 3, "Usage: python unpack.py <office_file> <output_dir>"
-input_file, output_dir = sys.argv[1], sys.argv[2]
-
-# Extract and format
-output_path = Path(output_dir)
-output_path.mkdir(parents=True, exist_ok=True)
-zipfile.ZipFile(input_file).extractall(output_path)
-
-# Pretty print all XML files
-xml_files = list(output_path.rglob("*.xml")) + list(output_path.rglob("*.rels"))
-for xml_file in xml_files:
-    content = xml_file.read_text(encoding="utf-8")
-    dom = defusedxml.minidom.parseString(content)
-    xml_file.write_bytes(dom.toprettyxml(indent="  ", encoding="ascii"))
-
-# For .docx files, suggest an RSID for tracked changes
-if input_file.endswith(".docx"):
-    suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
-    print(f"Suggested RSID for edit session: {suggested_rsid}")
+import defusedxml.minidom
+
+from pack import XML_SUFFIXES, file_sha256, read_manifest, write_manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Unpack an Office file for editing")
+    parser.add_argument("office_file", help="Office file to unpack (.docx/.pptx/.xlsx)")
+    parser.add_argument("output_dir", help="Directory to unpack into")
+    parser.add_argument(
+        "--include",
+        action="append",
+        metavar="PATTERN",
+        help="Unpack only members matching this glob (e.g. 'ppt/slides/slide3.xml'; "
+        "'*' also matches '/'). Repeatable. pack.py copies every other member from "
+        "office_file unchanged; run again with more patterns to unpack more.",
+    )
+    args = parser.parse_args()
+
+    unpacked = unpack_document(args.office_file, args.output_dir, args.include)
+    if args.include:
+        print(f"Unpacked {len(unpacked)} matching members to {args.output_dir}")
+
+    # For .docx files, suggest an RSID for tracked changes
+    if args.office_file.endswith(".docx"):
+        suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
+        print(f"Suggested RSID for edit session: {suggested_rsid}")
+
+
+def unpack_document(input_file, output_dir, include=None):
+    """Extract an Office file into output_dir, pretty-printing its XML parts.
+
+    include is a list of glob patterns over member names; only matching members are
+    unpacked (default: all). A manifest records the rest, so pack.py copies them
+    back from input_file, along with members left unchanged. Unpacking into a
+    directory already unpacked from input_file adds newly matched members and keeps
+    the files already there.
+
+    Returns:
+        list: Names of the members unpacked by this call
+    """
+    input_file = Path(input_file)
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    # Members already unpacked from the same file are kept as they are
+    previous = {}
+    manifest = read_manifest(output_path) if include is not None else None
+    if manifest is not None and manifest["source"] == str(input_file.resolve()):
+        previous = {entry["name"]: entry for entry in manifest["members"]}
+
+    members = []
+    unpacked = []
+    with zipfile.ZipFile(input_file) as zf:
+        for info in zf.infolist():
+            if info.is_dir():
+                continue
+
+            name = info.filename
+            matched = include is None or any(
+                fnmatch.fnmatchcase(name, pattern) for pattern in include
+            )
+            entry = previous.get(name)
+            if entry is not None and entry["crc"] == info.CRC and entry["sha256"]:
+                # Keep edits, and deletions unless the member is asked for again
+                if not matched or (output_path / name).exists():
+                    members.append(entry)
+                    continue
+
+            if matched:
+                path = unpack_member(zf, info, output_path)
+                unpacked.append(name)
+                sha256, size = file_sha256(path), path.stat().st_size
+            else:
+                sha256, size = None, None
+            members.append(
+                {"name": name, "crc": info.CRC, "sha256": sha256, "size": size}
+            )
+
+    write_manifest(output_path, input_file, members)
+    return unpacked
+
+
+def unpack_member(zf, info, output_path):
+    """Extract one member under output_path, pretty-printing XML; returns its path."""
+    path = Path(zf.extract(info, output_path))
+    if path.name.endswith(XML_SUFFIXES):
+        dom = defusedxml.minidom.parseString(path.read_text(encoding="utf-8"))
+        path.write_bytes(dom.toprettyxml(indent="  ", encoding="ascii"))
+    return path
+
+
+if __name__ == "__main__":
+    main()
@@ -86,7 +86,7 @@ class PPTXSchemaValidator(BaseSchemaValidator):
 
         for xml_file in self.xml_files:
             try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
+                root = self._parse_xml(xml_file).getroot()
 
                 # Check all elements for ID attributes
                 for elem in root.iter():
@@ -132,7 +132,7 @@ class PPTXSchemaValidator(BaseSchemaValidator):
         errors = []
 
         # Find all slide master files
-        slide_masters = list(self.unpacked_dir.glob("ppt/slideMasters/*.xml"))
+        slide_masters = list(self._package_glob("ppt/slideMasters/*.xml"))
 
         if not slide_masters:
             if self.verbose:
@@ -142,12 +142,12 @@ class PPTXSchemaValidator(BaseSchemaValidator):
         for slide_master in slide_masters:
             try:
                 # Parse the slide master file
-                root = lxml.etree.parse(str(slide_master)).getroot()
+                root = self._parse_xml(slide_master).getroot()
 
                 # Find the corresponding _rels file for this slide master
                 rels_file = slide_master.parent / "_rels" / f"{slide_master.name}.rels"
 
-                if not rels_file.exists():
+                if not self._package_file_exists(rels_file):
                     errors.append(
                         f"  {slide_master.relative_to(self.unpacked_dir)}: "
                         f"Missing relationships file: {rels_file.relative_to(self.unpacked_dir)}"
@@ -155,7 +155,7 @@ class PPTXSchemaValidator(BaseSchemaValidator):
                     continue
 
                 # Parse the relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
+                rels_root = self._parse_xml(rels_file).getroot()
 
                 # Build a set of valid relationship IDs that point to slide layouts
                 valid_layout_rids = set()
@@ -205,11 +205,11 @@ class PPTXSchemaValidator(BaseSchemaValidator):
         import lxml.etree
 
         errors = []
-        slide_rels_files = list(self.unpacked_dir.glob("ppt/slides/_rels/*.xml.rels"))
+        slide_rels_files = list(self._package_glob("ppt/slides/_rels/*.xml.rels"))
 
         for rels_file in slide_rels_files:
             try:
-                root = lxml.etree.parse(str(rels_file)).getroot()
+                root = self._parse_xml(rels_file).getroot()
 
                 # Find all slideLayout relationships
                 layout_rels = [
@@ -248,7 +248,7 @@ class PPTXSchemaValidator(BaseSchemaValidator):
         notes_slide_references = {}  # Track which slides reference each notesSlide
 
         # Find all slide relationship files
-        slide_rels_files = list(self.unpacked_dir.glob("ppt/slides/_rels/*.xml.rels"))
+        slide_rels_files = list(self._package_glob("ppt/slides/_rels/*.xml.rels"))
 
         if not slide_rels_files:
             if self.verbose:
@@ -258,7 +258,7 @@ class PPTXSchemaValidator(BaseSchemaValidator):
         for rels_file in slide_rels_files:
             try:
                 # Parse the relationships file
-                root = lxml.etree.parse(str(rels_file)).getroot()
+                root = self._parse_xml(rels_file).getroot()
 
                 # Find all notesSlide relationships
                 for rel in root.findall(
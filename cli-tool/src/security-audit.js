@@ -6,6 +6,9 @@
  * Usage:
  *   node src/security-audit.js [options]
  *   npm run security-audit
+ *
+ * Options:
+ *   --files=<list>  Only audit the component paths listed (one per line) in <list>
  */
 
 const ValidationOrchestrator = require('./validation/ValidationOrchestrator');
@@ -15,8 +18,10 @@ const chalk = require('chalk');
 
 /**
  * Scan directory for component files
+ * @param {string} directory - Components directory
+ * @param {Set<string>|null} onlyFiles - Absolute paths to restrict the scan to, or null for all
  */
-async function scanComponents(directory) {
+async function scanComponents(directory, onlyFiles = null) {
   const components = [];
   const componentTypes = ['agents', 'commands', 'mcps', 'settings', 'hooks'];
 
@@ -31,6 +36,10 @@ async function scanComponents(directory) {
     const files = await findMarkdownFiles(typeDir);
 
     for (const file of files) {
+      if (onlyFiles && !onlyFiles.has(path.resolve(file))) {
+        continue;
+      }
+
       const content = await fs.readFile(file, 'utf8');
       const relativePath = path.relative(process.cwd(), file);
 
@@ -75,6 +84,7 @@ async function main() {
   const verbose = args.includes('--verbose') || args.includes('-v');
   const jsonOutput = args.includes('--json');
   const outputFile = args.find(arg => arg.startsWith('--output='))?.split('=')[1];
+  const filesList = args.find(arg => arg.startsWith('--files='))?.split('=')[1];
 
   console.log(chalk.blue('\n🔒 Claude Code Templates - Security Audit\n'));
   console.log(chalk.gray('━'.repeat(60)));
@@ -93,8 +103,16 @@ async function main() {
     process.exit(1);
   }
 
+  // Optionally restrict the audit to a list of changed components
+  let onlyFiles = null;
+  if (filesList) {
+    const listed = (await fs.readFile(filesList, 'utf8')).split('\n').filter(line => line.trim());
+    onlyFiles = new Set(listed.map(file => path.resolve(file.trim())));
+    console.log(chalk.gray(`   Restricting audit to ${onlyFiles.size} listed components`));
+  }
+
   console.log(chalk.blue('📁 Scanning components directory...'));
-  const components = await scanComponents(componentsDir);
+  const components = await scanComponents(componentsDir, onlyFiles);
   console.log(chalk.gray(`   Found ${components.length} components\n`));
 
   // Validate all components
@@ -1,65 +1,210 @@
 #!/usr/bin/env python3
 """
-Generate a lightweight agents API endpoint from components.json
-This creates docs/api/agents.json for the CLI tool to use
+Generate lightweight API endpoints from the component catalog
+This creates docs/api/agents.json (plus one endpoint per component type and a search index) for the CLI tool to use
 """
 
+import argparse
 import json
 import os
+import re
+
+from build_timing import BuildTimer, add_timing_arguments, profiled
+from catalog_model import Catalog
+
+# Component types that always get a docs/api/<type>.json endpoint (every other catalog type is added after these)
+API_COMPONENT_TYPES = ['agents', 'commands', 'skills', 'mcps']
+API_VERSION = '1.0.0'
+
+# Inverted token index (term -> component ids) for instant client-side search
+SEARCH_INDEX_NAME = 'search-index.json'
+SEARCH_TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+SEARCH_MIN_TOKEN_LENGTH = 2
+SEARCH_STOPWORDS = frozenset([
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'into', 'is', 'it',
+    'its', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'use', 'with', 'you', 'your'
+])
+
+def build_api_entries(catalog, component_type):
+    """Project the catalog entries of one type into slim API records"""
+    entries = []
+    for component in catalog.components(component_type):
+        if 'path' in component:
+            # Extract category from path
+            path = component['path']
+            path_parts = path.split('/')
+            category = path_parts[0] if len(path_parts) > 1 else 'root'
+            name = path_parts[-1]
+        else:
+            # Templates and plugins are addressed by id rather than by file path
+            path = component.get('id') or component['name']
+            category = component.get('category') or 'root'
+            name = component['name']
+
+        # Remove .md/.json extension from name and path if present
+        for extension in ('.md', '.json'):
+            if name.endswith(extension):
+                name = name[:-len(extension)]
+                path = path[:-len(extension)]
+                break
+
+        entries.append({
+            'name': name,
+            'path': path,
+            'category': category,
+            'description': (component.get('description') or '')[:100]  # Truncate description for size
+        })
+    return entries
+
+def tokenize_search_text(text):
+    """Lowercase alphanumeric tokens of text, minus stopwords and single characters"""
+    return [
+        token for token in SEARCH_TOKEN_PATTERN.findall(text.lower())
+        if len(token) >= SEARCH_MIN_TOKEN_LENGTH and token not in SEARCH_STOPWORDS
+    ]
+
+def build_search_index(catalog, component_types):
+    """
+    Build the inverted token index over the slim API records.
+    Component ids are positions in the returned `components` list; `terms` maps each token of a
+    component's name, path, category, full description and keywords to the sorted ids containing it.
+    """
+    components = []
+    postings = {}
+
+    for component_type in component_types:
+        api_entries = build_api_entries(catalog, component_type)
+        for entry, component in zip(api_entries, catalog.components(component_type)):
+            component_id = len(components)
+            components.append({
+                'type': component_type,
+                'name': entry['name'],
+                'path': entry['path'],
+                'category': entry['category']
+            })
+
+            text = ' '.join([
+                entry['path'],
+                entry['category'],
+                component.get('description') or '',
+                ' '.join(component.get('keywords') or [])
+            ])
+            for token in set(tokenize_search_text(text)):
+                postings.setdefault(token, []).append(component_id)
+
+    # Ids are appended in increasing order, so every postings list is already sorted
+    return {
+        'version': API_VERSION,
+        'total': len(components),
+        'components': components,
+        'terms': {term: postings[term] for term in sorted(postings)}
+    }
+
+def write_search_index(catalog, output_dir, component_types, timer):
+    """Serialize the search index compactly to docs/api/search-index.json"""
+    with timer.phase('api:search-index') as phase:
+        search_index = build_search_index(catalog, component_types)
+        output_path = os.path.join(output_dir, SEARCH_INDEX_NAME)
 
-def generate_agents_api():
-    """Generate the agents API file from components.json"""
-    
-    # Read the components.json file
-    components_path = 'docs/components.json'
-    output_path = 'docs/api/agents.json'
-    
-    if not os.path.exists(components_path):
-        print(f"Error: {components_path} not found")
-        return False
-    
-    try:
-        with open(components_path, 'r', encoding='utf-8') as f:
-            components_data = json.load(f)
-        
-        # Extract agents and format them for the API
-        agents = []
-        if 'agents' in components_data:
-            for agent in components_data['agents']:
-                # Extract category from path
-                path_parts = agent['path'].split('/')
-                category = path_parts[0] if len(path_parts) > 1 else 'root'
-                name = path_parts[-1]
-                
-                # Remove .md extension from name if present
-                if name.endswith('.md'):
-                    name = name[:-3]
-                
-                agents.append({
-                    'name': name,
-                    'path': agent['path'].replace('.md', ''),  # Remove .md from path too
-                    'category': category,
-                    'description': agent.get('description', '')[:100]  # Truncate description for size
-                })
-        
-        # Create output directory if it doesn't exist
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        
-        # Write the API file
         with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump({
-                'agents': agents,
-                'version': '1.0.0',
-                'total': len(agents)
-            }, f, indent=2)
-        
-        print(f"✅ Generated agents API with {len(agents)} agents")
+            json.dump(search_index, f, separators=(',', ':'))
+
+        phase['count'] = len(search_index['terms'])
+        phase['bytes'] = os.path.getsize(output_path)
+
+    print(f"✅ Generated search index with {len(search_index['terms'])} terms over {search_index['total']} components")
+    print(f"📄 Output: {output_path}")
+    return search_index
+
+def resolve_api_component_types(catalog):
+    """API_COMPONENT_TYPES first, then any other component type present in the catalog"""
+    return API_COMPONENT_TYPES + [
+        component_type for component_type in catalog.types()
+        if component_type not in API_COMPONENT_TYPES
+    ]
+
+def write_api_endpoints(catalog, output_dir='docs/api', component_types=None, timer=None):
+    """
+    Write docs/api/<type>.json for each component type (default: every type in the catalog)
+    plus docs/api/search-index.json from an in-memory catalog.
+    Returns {component_type: number of entries written}.
+    """
+    timer = timer or BuildTimer('generate_agents_api.py')
+    component_types = component_types or resolve_api_component_types(catalog)
+    totals = {}
+
+    # Create output directory if it doesn't exist
+    os.makedirs(output_dir, exist_ok=True)
+
+    for component_type in component_types:
+        with timer.phase(f'api:{component_type}') as phase:
+            entries = build_api_entries(catalog, component_type)
+            output_path = os.path.join(output_dir, f'{component_type}.json')
+
+            # Write the API file
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    component_type: entries,
+                    'version': API_VERSION,
+                    'total': len(entries)
+                }, f, indent=2)
+
+            phase['count'] = len(entries)
+            phase['bytes'] = os.path.getsize(output_path)
+
+        totals[component_type] = len(entries)
+        print(f"✅ Generated {component_type} API with {len(entries)} {component_type}")
         print(f"📄 Output: {output_path}")
+
+    write_search_index(catalog, output_dir, component_types, timer)
+
+    return totals
+
+def load_catalog():
+    """
+    Load the catalog for a standalone run, preferring the lightweight index over the full components.json.
+    Returns None if neither exists.
+    """
+    for catalog_path in ['docs/components-index.json', 'docs/components.json']:
+        if os.path.exists(catalog_path):
+            print(f"📦 Loading catalog from {catalog_path}")
+            return Catalog.from_json_file(catalog_path)
+
+    print("Error: docs/components-index.json and docs/components.json not found")
+    return None
+
+def generate_agents_api(timer=None, catalog=None):
+    """
+    Generate the API files from the catalog.
+    Pass the Catalog built by generate_components_json to skip reading it back from disk.
+    """
+    timer = timer or BuildTimer('generate_agents_api.py')
+
+    try:
+        if catalog is None:
+            with timer.phase('read_catalog'):
+                catalog = load_catalog()
+            if catalog is None:
+                return False
+
+        write_api_endpoints(catalog, timer=timer)
         return True
-        
+
     except Exception as e:
         print(f"Error generating agents API: {e}")
         return False
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate docs/api/*.json from the component catalog")
+    add_timing_arguments(parser)
+    args = parser.parse_args(argv)
+
+    timer = BuildTimer('generate_agents_api.py')
+    with profiled(args.profile):
+        generate_agents_api(timer=timer)
+
+    if args.timing_report:
+        timer.write_report(args.timing_report)
+
 if __name__ == '__main__':
-    generate_agents_api()
\ No newline at end of file
+    main()
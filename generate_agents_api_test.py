@@ -0,0 +1,58 @@
+import json
+import os
+import tempfile
+import unittest
+
+import generate_agents_api as api
+from catalog_model import Catalog
+
+
+def sample_catalog():
+    return Catalog({
+        'agents': [
+            {'name': 'react-expert', 'path': 'frontend/react-expert.md', 'category': 'frontend',
+             'description': 'Builds React components and tests them'},
+            {'name': 'security-auditor', 'path': 'security/security-auditor.md', 'category': 'security',
+             'description': 'Audits code for security issues'},
+        ],
+        'hooks': [
+            {'name': 'format-on-save', 'path': 'automation/format-on-save.json', 'category': 'automation',
+             'description': 'Run the formatter after every edit'},
+        ],
+        'plugins': [
+            {'name': 'ai-ml-toolkit', 'id': 'ai-ml-toolkit', 'description': 'Machine learning suite',
+             'keywords': ['nlp', 'react']},
+        ],
+        'marketplace': {'name': 'metadata'},
+    })
+
+
+class WriteApiEndpointsTest(unittest.TestCase):
+
+    def test_writes_every_catalog_type_and_search_index(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            totals = api.write_api_endpoints(sample_catalog(), output_dir=output_dir)
+
+            self.assertEqual(totals, {'agents': 2, 'commands': 0, 'skills': 0, 'mcps': 0, 'hooks': 1, 'plugins': 1})
+            with open(os.path.join(output_dir, 'plugins.json'), encoding='utf-8') as f:
+                plugins = json.load(f)
+            self.assertEqual(plugins['plugins'][0]['path'], 'ai-ml-toolkit')
+            self.assertEqual(plugins['plugins'][0]['category'], 'root')
+            self.assertTrue(os.path.exists(os.path.join(output_dir, api.SEARCH_INDEX_NAME)))
+
+    def test_search_index_maps_terms_to_component_ids(self):
+        index = api.build_search_index(sample_catalog(), ['agents', 'hooks', 'plugins'])
+
+        self.assertEqual(index['total'], 4)
+        self.assertEqual(index['components'][0], {
+            'type': 'agents', 'name': 'react-expert', 'path': 'frontend/react-expert', 'category': 'frontend'
+        })
+        self.assertEqual(index['terms']['react'], [0, 3])
+        self.assertEqual(index['terms']['security'], [1])
+        self.assertEqual(index['terms']['formatter'], [2])
+        self.assertNotIn('the', index['terms'])
+        self.assertEqual(list(index['terms']), sorted(index['terms']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,14 +1,249 @@
 import os
 import json
+import argparse
+import hashlib
+import struct
 import requests
+from requests.structures import CaseInsensitiveDict
 from datetime import datetime
 from dotenv import load_dotenv
 import time
 import re
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from build_timing import BuildTimer, add_timing_arguments, profiled
 
 # Load environment variables
 load_dotenv()
 
+# Source endpoints (module-level so tests can point them at a local server)
+RAPIDAPI_JOBS_URL = "https://jobs-search-realtime-data-api.p.rapidapi.com/jobs/search"
+SERPER_SEARCH_URL = "https://google.serper.dev/search"
+GITHUB_SEARCH_URL = "https://api.github.com/search/issues"
+HN_SEARCH_URL = "https://hn.algolia.com/api/v1/search"
+REMOTE_OK_URL = "https://remoteok.io/api"
+WWR_RSS_URL = "https://weworkremotely.com/categories/remote-programming-jobs.rss"
+
+# Minimum seconds between request starts to the same host; replaces the fixed sleeps between calls
+DEFAULT_HOST_MIN_INTERVAL = 1.0
+HOST_MIN_INTERVALS = {
+    'hn.algolia.com': 0.5,
+}
+REQUEST_TIMEOUT = 30
+SCRAPER_WORKERS = 8  # sources running at once
+QUERY_WORKERS = 4    # in-flight queries per source
+
+# On-disk HTTP response cache shared by all scrapers
+HTTP_CACHE_DIR = os.path.join('.catalog-cache', 'jobs-http')
+HTTP_CACHE_TTL = 6 * 3600  # seconds a cached response is served without asking the source
+HTTP_CACHE_VERSION = 1
+HTTP_CACHE_MODES = ['cache', 'refresh', 'replay', 'off']
+CACHED_RESPONSE_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+# Near-duplicate job detection (MinHash over character shingles, LSH banding)
+JOB_SHINGLE_SIZE = 5
+JOB_MINHASH_PERMUTATIONS = 64
+JOB_MINHASH_BANDS = 16        # 16 bands of 4 rows: pairs above ~0.5 similarity become candidates
+JOB_DEDUP_THRESHOLD = 0.7     # estimated Jaccard similarity at which two postings are merged
+GENERIC_COMPANY_NAMES = frozenset(['', 'unknown', 'unknown company', 'startup', 'remote company'])
+
+# Persistent job store: every job seen by earlier runs, published until it goes unseen for too long
+JOB_STORE_PATH = os.path.join('.catalog-cache', 'jobs.sqlite')
+JOB_STORE_MAX_AGE_DAYS = 30
+
+class HostRateLimiter:
+    """
+    Thread-safe per-host request spacing.
+    Each call reserves the next free start slot for its host and sleeps until then outside the lock,
+    so different hosts never wait on each other and requests to one host still overlap in flight.
+    """
+
+    def __init__(self, intervals=None, default_interval=DEFAULT_HOST_MIN_INTERVAL):
+        self.intervals = dict(intervals or {})
+        self.default_interval = default_interval
+        self.lock = threading.Lock()
+        self.next_slot = {}
+
+    def wait(self, url):
+        host = urlsplit(url).netloc
+        interval = self.intervals.get(host, self.default_interval)
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot.get(host, now))
+            self.next_slot[host] = slot + interval
+        if slot > now:
+            time.sleep(slot - now)
+
+class CacheMissError(Exception):
+    """Raised in replay mode when a request has no cached response"""
+
+class ResponseCache:
+    """
+    On-disk cache of successful HTTP responses, keyed by method, URL, query params and body
+    (not headers, so API keys never end up in the key).
+    Modes:
+      - cache:   serve responses younger than `ttl`; revalidate older ones with If-None-Match /
+                 If-Modified-Since and reuse the cached body on 304 Not Modified
+      - refresh: always ask the source (still conditionally) and update the cache
+      - replay:  serve only from the cache, whatever its age, and never touch the network;
+                 a miss raises CacheMissError (offline runs and tests)
+      - off:     plain requests, nothing read or written
+    Each entry is <key>.json (status, validators, fetch time) plus <key>.body (raw bytes).
+    """
+
+    def __init__(self, cache_dir=HTTP_CACHE_DIR, ttl=HTTP_CACHE_TTL, mode='cache'):
+        if mode not in HTTP_CACHE_MODES:
+            raise ValueError(f"Unknown HTTP cache mode: {mode}")
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.mode = mode
+        self.lock = threading.Lock()
+        self.stats = {'fresh': 0, 'revalidated': 0, 'fetched': 0}
+
+    def request_key(self, method, url, params=None, data=None):
+        prepared = requests.Request(method, url, params=params, data=data).prepare()
+        body = prepared.body or b''
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        digest = hashlib.sha256(f"{prepared.method} {prepared.url}\n".encode('utf-8'))
+        digest.update(body)
+        return digest.hexdigest()
+
+    def entry_paths(self, key):
+        base = os.path.join(self.cache_dir, key)
+        return base + '.json', base + '.body'
+
+    def load(self, key):
+        """Return (metadata, body) for a cached response, or None"""
+        meta_path, body_path = self.entry_paths(key)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+        except (IOError, ValueError):
+            return None
+        if meta.get('version') != HTTP_CACHE_VERSION:
+            return None
+        return meta, body
+
+    def store(self, key, url, status, headers, body=None):
+        """
+        Write (or re-stamp after a 304) a cache entry and return its metadata.
+        Only the validators and Content-Type are kept from `headers`; the body file is only rewritten when given.
+        """
+        meta_path, body_path = self.entry_paths(key)
+        meta = {
+            'version': HTTP_CACHE_VERSION,
+            'url': url,
+            'status': status,
+            'fetched_at': time.time(),
+            'headers': {name: headers[name] for name in CACHED_RESPONSE_HEADERS if name in headers}
+        }
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            if body is not None:
+                self.write_atomic(body_path, body)
+            self.write_atomic(meta_path, json.dumps(meta, indent=2).encode('utf-8'))
+        except IOError as e:
+            print(f"⚠️ Could not write HTTP cache entry for {url}: {e}")
+        return meta
+
+    def write_atomic(self, path, data):
+        # Unique temp name per thread so concurrent writers of one key never interleave
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def count(self, outcome):
+        with self.lock:
+            self.stats[outcome] += 1
+
+    def build_response(self, url, meta, body):
+        response = requests.Response()
+        response.status_code = meta['status']
+        response.headers = CaseInsensitiveDict(meta['headers'])
+        response.url = url
+        response._content = body
+        return response
+
+    def request(self, method, url, send, **kwargs):
+        """
+        Perform a request through the cache. `send(headers)` does the actual network call with the
+        given (possibly conditional) headers and returns a requests.Response.
+        """
+        if self.mode == 'off':
+            self.count('fetched')
+            return send(kwargs.get('headers') or {})
+
+        key = self.request_key(method, url, kwargs.get('params'), kwargs.get('data'))
+        cached = self.load(key)
+
+        if self.mode == 'replay':
+            if cached is None:
+                raise CacheMissError(f"No cached response for {method} {url} (replay mode)")
+            self.count('fresh')
+            return self.build_response(url, *cached)
+
+        headers = dict(kwargs.get('headers') or {})
+        if cached is not None:
+            meta, body = cached
+            if self.mode == 'cache' and time.time() - meta['fetched_at'] < self.ttl:
+                self.count('fresh')
+                return self.build_response(url, meta, body)
+            if 'ETag' in meta['headers']:
+                headers['If-None-Match'] = meta['headers']['ETag']
+            if 'Last-Modified' in meta['headers']:
+                headers['If-Modified-Since'] = meta['headers']['Last-Modified']
+
+        response = send(headers)
+
+        if response.status_code == 304 and cached is not None:
+            meta, body = cached
+            # Not modified: keep the cached body, restart its TTL and pick up any new validators
+            headers = CaseInsensitiveDict(meta['headers'])
+            headers.update(response.headers)
+            meta = self.store(key, url, meta['status'], headers)
+            self.count('revalidated')
+            return self.build_response(url, meta, body)
+
+        self.count('fetched')
+        if response.status_code == 200:
+            self.store(key, url, response.status_code, response.headers, response.content)
+        return response
+
+    def summary(self):
+        return (f"🗄️ HTTP cache ({self.mode}): {self.stats['fresh']} served from cache, "
+                f"{self.stats['revalidated']} revalidated, {self.stats['fetched']} fetched")
+
+rate_limiter = HostRateLimiter(HOST_MIN_INTERVALS)
+response_cache = ResponseCache()
+
+def http_request(method, url, **kwargs):
+    """
+    requests.request() through the response cache; requests that reach the network go
+    through the per-host rate limiter with a default timeout.
+    """
+    def send(headers):
+        rate_limiter.wait(url)
+        return requests.request(method, url, **{**kwargs, 'headers': headers, 'timeout': kwargs.get('timeout', REQUEST_TIMEOUT)})
+
+    return response_cache.request(method, url, send, **kwargs)
+
+def map_concurrently(fn, items, workers=QUERY_WORKERS):
+    """
+    Apply fn to items on a thread pool, returning results in input order.
+    The first exception raised by fn propagates, like it would from a serial loop.
+    """
+    items = list(items)
+    if not items:
+        return []
+    with ThreadPoolExecutor(max_workers=min(workers, len(items))) as executor:
+        return list(executor.map(fn, items))
+
 def scrape_with_rapidapi_jobs():
     """
     Use RapidAPI Jobs Search to find Claude-related positions
@@ -22,8 +257,6 @@ def scrape_with_rapidapi_jobs():
             print("⚠️ Warning: No RapidAPI key found, skipping")
             return jobs
         
-        url = "https://jobs-search-realtime-data-api.p.rapidapi.com/jobs/search"
-        
         # Search for Claude-specific terms
         search_queries = [
             "Claude Code",
@@ -37,14 +270,15 @@ def scrape_with_rapidapi_jobs():
             "x-rapidapi-host": "jobs-search-realtime-data-api.p.rapidapi.com"
         }
         
-        for query in search_queries:
+        def search(query):
+            query_jobs = []
             querystring = {
                 "query": query,
                 "location": "Remote",
                 "num_results": "20"
             }
             
-            response = requests.get(url, headers=headers, params=querystring)
+            response = http_request('GET', RAPIDAPI_JOBS_URL, headers=headers, params=querystring)
             
             if response.status_code == 200:
                 data = response.json()
@@ -55,6 +289,7 @@ def scrape_with_rapidapi_jobs():
                     job = {
                         'company': job_data.get('company_name', 'Unknown'),
                         'company_icon': job_data.get('company_logo', get_company_icon(job_data.get('company_name', ''))),
+                        'job_title': job_data.get('title', ''),
                         'location': job_data.get('location', 'Remote'),
                         'description': truncate_description(job_data.get('description', job_data.get('title', ''))),
                         'job_link': job_data.get('url', ''),
@@ -66,9 +301,12 @@ def scrape_with_rapidapi_jobs():
                     # Validate it actually mentions Claude
                     full_text = f"{job_data.get('title', '')} {job_data.get('description', '')}"
                     if is_claude_code_related(full_text):
-                        jobs.append(job)
+                        query_jobs.append(job)
             
-            time.sleep(1)  # Rate limiting
+            return query_jobs
+        
+        for query_jobs in map_concurrently(search, search_queries):
+            jobs.extend(query_jobs)
         
         print(f"✅ Found {len(jobs)} jobs from RapidAPI")
         
@@ -92,8 +330,6 @@ def scrape_with_serper_jobs():
         
         print(f"  🔑 Using Serper key: {serper_key[:8]}...{serper_key[-4:]}")
         
-        import http.client
-        
         search_queries = [
             "Claude Code developer jobs",
             "Anthropic Claude engineer hiring", 
@@ -103,9 +339,8 @@ def scrape_with_serper_jobs():
             "Claude developer careers"
         ]
         
-        conn = http.client.HTTPSConnection("google.serper.dev")
-        
-        for query in search_queries:
+        def search(query):
+            query_jobs = []
             print(f"  🔍 Searching: '{query}'")
             
             payload = json.dumps({
@@ -119,11 +354,10 @@ def scrape_with_serper_jobs():
                 'Content-Type': 'application/json'
             }
             
-            conn.request("POST", "/search", payload, headers)
-            res = conn.getresponse()
-            data_raw = res.read()
+            res = http_request('POST', SERPER_SEARCH_URL, data=payload, headers=headers)
+            data_raw = res.content
             
-            if res.status == 200:
+            if res.status_code == 200:
                 try:
                     data = json.loads(data_raw.decode("utf-8"))
                     search_results = data.get('organic', [])
@@ -134,24 +368,27 @@ def scrape_with_serper_jobs():
                         snippet = result.get('snippet', '')
                         link = result.get('link', '')
                         
-                        # Check if this looks like a job posting
-                        full_text = f"{title} {snippet}"
-                        if is_claude_code_related(full_text) and is_job_posting(full_text):
+                        # Check if this looks like a job posting before extracting any fields
+                        text = f"{title} {snippet}"
+                        text_lower = text.lower()
+                        if is_claude_code_related(text, text_lower=text_lower) and is_job_posting(text, text_lower=text_lower):
                             
                             # Extract better job information
                             job_info = extract_job_info_from_serper(title, snippet, link)
                             
                             if job_info:  # Only add if we could extract meaningful info
-                                jobs.append(job_info)
+                                query_jobs.append(job_info)
                             
                 except json.JSONDecodeError as e:
                     print(f"    ❌ JSON decode error: {e}")
             else:
-                print(f"    ❌ Error {res.status}: {data_raw.decode('utf-8')[:200]}...")
+                print(f"    ❌ Error {res.status_code}: {data_raw.decode('utf-8')[:200]}...")
             
-            time.sleep(1)  # Rate limiting
+            return query_jobs
+        
+        for query_jobs in map_concurrently(search, search_queries):
+            jobs.extend(query_jobs)
         
-        conn.close()
         print(f"✅ Found {len(jobs)} jobs from Google Serper")
         
     except Exception as e:
@@ -159,53 +396,133 @@ def scrape_with_serper_jobs():
     
     return jobs
 
-def is_job_posting(text):
-    """Check if text looks like a job posting"""
-    job_indicators = [
-        'hiring', 'job', 'position', 'career', 'apply', 'join',
-        'engineer', 'developer', 'programmer', 'architect',
-        'we are looking', 'seeking', 'opportunity', 'role'
-    ]
+# Job text extraction. Every pattern and keyword list is built once at import, and
+# extract_job_fields() lowercases a posting's text once and shares it across all fields.
+# Patterns are paired with a literal that any match must contain: most of them start with a
+# character class, so a plain substring check is far cheaper than letting the regex engine
+# try every start position of text that cannot match.
+JOB_INDICATORS = (
+    'hiring', 'job', 'position', 'career', 'apply', 'join',
+    'engineer', 'developer', 'programmer', 'architect',
+    'we are looking', 'seeking', 'opportunity', 'role'
+)
+CLAUDE_KEYWORDS = (
+    'claude code', 'claude-code', 'anthropic claude', 'claude ai',
+    'claude coder', 'claude assistant', 'claude developer', 'claude engineer',
+    'work with claude', 'using claude', 'claude experience', 'claude integration'
+)
+CLAUDE_JOB_WORDS = ('hiring', 'position', 'engineer', 'developer', 'role', 'job', 'career', 'experience', 'skills')
+GENERIC_RESULT_MARKERS = ('jobs, employment', 'jobs available', 'browse', 'discover')
+REMOTE_KEYWORDS = ('remote', 'anywhere', 'distributed', 'work from home')
+
+LINKEDIN_AT_COMPANY_PATTERN = re.compile(r'\s+at\s+([^-\d]+)')
+TRAILING_NUMBER_PATTERN = re.compile(r'\s*\d+$')
+COMPANY_TITLE_PATTERNS = [(literal, re.compile(pattern)) for literal, pattern in (
+    ('hiring', r'([A-Z][a-zA-Z\s&.]+)\s+hiring\s+'),
+    (':', r'^([A-Z][a-zA-Z\s&.]+):\s+'),
+    ('Join', r'Join\s+([A-Z][a-zA-Z\s&.]+)'),
+    ('looking', r'([A-Z][a-zA-Z\s&.]+)\s+is\s+looking'),
+    ('seek', r'([A-Z][a-zA-Z\s&.]+)\s+seeks?'),
+)]
+COMPANY_TITLE_STOPWORDS = frozenset(['View', 'Join', 'Apply', 'Software', 'Senior'])
+COMPANY_SNIPPET_PATTERNS = [(literal, re.compile(pattern)) for literal, pattern in (
+    ('Jobs at ', r'Jobs at ([A-Z][a-zA-Z\s&.]+)'),
+    (' is hiring', r'([A-Z][a-zA-Z\s&.]+) is hiring'),
+    ('Work at ', r'Work at ([A-Z][a-zA-Z\s&.]+)'),
+    ('Join ', r'Join ([A-Z][a-zA-Z\s&.]+)'),
+)]
+# Checked in order, so earlier entries win when several appear
+KNOWN_COMPANIES = {
+    'google': 'Google',
+    'microsoft': 'Microsoft',
+    'meta': 'Meta',
+    'apple': 'Apple',
+    'amazon': 'Amazon',
+    'openai': 'OpenAI',
+    'github': 'GitHub',
+    'stripe': 'Stripe',
+    'shopify': 'Shopify'
+}
+
+JOB_TITLE_PATTERNS = [(literal, re.compile(pattern)) for literal, pattern in (
+    ('at', r'^(.+?)\s+at\s+'),            # LinkedIn format: "Job Title at Company"
+    ('hiring', r'hiring\s+(.+?)\s+in\s+'),  # Anthropic hiring format: "Anthropic hiring Job Title in Location"
+    (':', r':\s+(.+?)\s+-'),              # Company: Job Title format
+)]
+JOB_TITLE_DASH_PATTERN = re.compile(r'^(.+?)\s+-\s+')
+JOB_TITLE_PREFIX_PATTERN = re.compile(r'^(View|Apply to|Join)\s+')
+JOB_TITLE_KEYWORDS = ('engineer', 'developer', 'manager', 'analyst', 'scientist', 'architect')
+
+# Every City, State pattern needs a comma
+CITY_STATE_PATTERNS = [re.compile(pattern) for pattern in (
+    r'in\s+([A-Z][a-z]+,\s*[A-Z]{2})',  # "in Seattle, WA"
+    r'([A-Z][a-z]+,\s*[A-Z]{2})\s+',    # "Seattle, WA "
+    r'([San Francisco|New York|Los Angeles|Chicago|Boston|Austin|Denver],\s*[A-Z]{2})',
+)]
+MAJOR_CITIES = ('Seattle', 'Francisco', 'Chicago', 'Boston', 'Austin', 'Denver', 'Portland', 'Miami')
+
+SALARY_PATTERNS = [(literal, re.compile(pattern)) for literal, pattern in (
+    ('$', r'\$(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s*(?:k|thousand)'),
+    ('$', r'\$(\d{1,3}(?:,\d{3})*)'),
+    ('k', r'(\d{1,3})k'),
+)]
+
+def extract_job_fields(title, snippet='', link=''):
+    """
+    Single extraction stage for a search-result posting: lowercases the text once and runs the
+    precompiled patterns for every field. Returns a dict with company, job_title, location,
+    salary (from the snippet), is_claude_code_related and is_job_posting.
+    """
+    text = f"{title} {snippet}"
     text_lower = text.lower()
-    return any(indicator in text_lower for indicator in job_indicators)
+
+    return {
+        'company': extract_company_name_improved(title, snippet, link, combined_lower=(title + snippet + link).lower()),
+        'job_title': extract_job_title(title, snippet, title_lower=title.lower()),
+        'location': extract_location_improved(title, snippet, text=text, text_lower=text_lower),
+        'salary': extract_salary_from_text(snippet),
+        'is_claude_code_related': is_claude_code_related(text, text_lower=text_lower),
+        'is_job_posting': is_job_posting(text, text_lower=text_lower)
+    }
+
+def is_job_posting(text, text_lower=None):
+    """Check if text looks like a job posting"""
+    text_lower = text_lower or text.lower()
+    return any(indicator in text_lower for indicator in JOB_INDICATORS)
 
 def extract_job_info_from_serper(title, snippet, link):
     """Extract clean job information from Serper search result"""
     
     # Skip generic search results
-    if any(skip in title.lower() for skip in ['jobs, employment', 'jobs available', 'browse', 'discover']):
+    title_lower = title.lower()
+    if any(skip in title_lower for skip in GENERIC_RESULT_MARKERS):
         return None
     
-    # Extract company name
-    company = extract_company_name_improved(title, snippet, link)
-    
-    # Extract job title
-    job_title = extract_job_title(title, snippet)
-    
-    # Extract location
-    location = extract_location_improved(title, snippet)
+    fields = extract_job_fields(title, snippet, link)
     
     # Only return if we have meaningful data
+    job_title = fields['job_title']
     if not job_title or len(job_title) < 5:
         return None
     
     return {
-        'company': company,
-        'company_icon': get_company_icon(company),
+        'company': fields['company'],
+        'company_icon': get_company_icon(fields['company']),
         'job_title': job_title,
-        'location': location,
+        'location': fields['location'],
         'description': truncate_description(snippet),
         'job_link': link,
         'source': 'Google Serper',
         'date_posted': '',
-        'salary': extract_salary_from_text(snippet)
+        'salary': fields['salary']
     }
 
-def extract_company_name_improved(title, snippet, link):
+def extract_company_name_improved(title, snippet, link, combined_lower=None):
     """Improved company name extraction"""
+    combined_lower = combined_lower or (title + snippet + link).lower()
     
     # Priority: Check for Anthropic first (most common)
-    if 'anthropic' in (title + snippet + link).lower():
+    if 'anthropic' in combined_lower:
         return 'Anthropic'
     
     # LinkedIn specific extraction
@@ -219,148 +536,98 @@ def extract_company_name_improved(title, snippet, link):
                 return company_part.replace('-', ' ').title()
         
         # Extract from title patterns like "Job Title at Company Name"
-        at_match = re.search(r'\s+at\s+([^-\d]+)', title)
+        at_match = 'at' in title and LINKEDIN_AT_COMPANY_PATTERN.search(title)
         if at_match:
-            company = at_match.group(1).strip()
-            # Clean up common LinkedIn patterns
-            company = re.sub(r'\s*\d+$', '', company)  # Remove trailing numbers
-            company = re.sub(r'\s+\d+$', '', company)  # Remove numbers at end
+            # Clean up common LinkedIn patterns (trailing numbers)
+            company = TRAILING_NUMBER_PATTERN.sub('', at_match.group(1).strip())
             if len(company) > 2 and company.lower() not in ['view', 'join', 'apply']:
                 return company
     
     # Extract from title patterns
-    hiring_patterns = [
-        r'([A-Z][a-zA-Z\s&.]+)\s+hiring\s+',
-        r'^([A-Z][a-zA-Z\s&.]+):\s+',
-        r'Join\s+([A-Z][a-zA-Z\s&.]+)',
-        r'([A-Z][a-zA-Z\s&.]+)\s+is\s+looking',
-        r'([A-Z][a-zA-Z\s&.]+)\s+seeks?',
-    ]
-    
-    for pattern in hiring_patterns:
-        match = re.search(pattern, title)
+    for literal, pattern in COMPANY_TITLE_PATTERNS:
+        match = literal in title and pattern.search(title)
         if match:
             company = match.group(1).strip()
-            if len(company) > 2 and company not in ['View', 'Join', 'Apply', 'Software', 'Senior']:
+            if len(company) > 2 and company not in COMPANY_TITLE_STOPWORDS:
                 return company
     
     # Extract from snippet
-    snippet_patterns = [
-        r'Jobs at ([A-Z][a-zA-Z\s&.]+)',
-        r'([A-Z][a-zA-Z\s&.]+) is hiring',
-        r'Work at ([A-Z][a-zA-Z\s&.]+)',
-        r'Join ([A-Z][a-zA-Z\s&.]+)',
-    ]
-    
-    for pattern in snippet_patterns:
-        match = re.search(pattern, snippet)
+    for literal, pattern in COMPANY_SNIPPET_PATTERNS:
+        match = literal in snippet and pattern.search(snippet)
         if match:
             company = match.group(1).strip()
             if len(company) > 2:
                 return company
     
     # Check if it's a well-known company based on domain or context
-    known_companies = {
-        'google': 'Google',
-        'microsoft': 'Microsoft', 
-        'meta': 'Meta',
-        'apple': 'Apple',
-        'amazon': 'Amazon',
-        'openai': 'OpenAI',
-        'github': 'GitHub',
-        'stripe': 'Stripe',
-        'shopify': 'Shopify'
-    }
-    
-    text_lower = (title + snippet + link).lower()
-    for keyword, company_name in known_companies.items():
-        if keyword in text_lower:
+    for keyword, company_name in KNOWN_COMPANIES.items():
+        if keyword in combined_lower:
             return company_name
     
     return 'Unknown Company'
 
-def extract_job_title(title, snippet):
+def extract_job_title(title, snippet, title_lower=None):
     """Extract job title from search result"""
     
-    # LinkedIn format: "Job Title at Company"
-    at_match = re.search(r'^(.+?)\s+at\s+', title)
-    if at_match:
-        return at_match.group(1).strip()
-    
-    # Anthropic hiring format: "Anthropic hiring Job Title in Location"
-    hiring_match = re.search(r'hiring\s+(.+?)\s+in\s+', title)
-    if hiring_match:
-        return hiring_match.group(1).strip()
-    
-    # Company: Job Title format
-    colon_match = re.search(r':\s+(.+?)\s+-', title)
-    if colon_match:
-        return colon_match.group(1).strip()
+    for literal, pattern in JOB_TITLE_PATTERNS:
+        match = literal in title and pattern.search(title)
+        if match:
+            return match.group(1).strip()
     
     # Extract from title before dash
-    dash_match = re.search(r'^(.+?)\s+-\s+', title)
+    dash_match = '-' in title and JOB_TITLE_DASH_PATTERN.search(title)
     if dash_match:
-        job_title = dash_match.group(1).strip()
         # Clean up common patterns
-        job_title = re.sub(r'^(View|Apply to|Join)\s+', '', job_title)
+        job_title = JOB_TITLE_PREFIX_PATTERN.sub('', dash_match.group(1).strip())
         if len(job_title) > 5:
             return job_title
     
     # Fallback: use full title if it looks like a job title
-    if any(keyword in title.lower() for keyword in ['engineer', 'developer', 'manager', 'analyst', 'scientist', 'architect']):
+    title_lower = title_lower or title.lower()
+    if any(keyword in title_lower for keyword in JOB_TITLE_KEYWORDS):
         return title.strip()
     
     return None
 
-def extract_location_improved(title, snippet):
+def extract_location_improved(title, snippet, text=None, text_lower=None):
     """Improved location extraction"""
-    text = f"{title} {snippet}"
+    text = text or f"{title} {snippet}"
+    text_lower = text_lower or text.lower()
     
     # Remote indicators
-    if any(keyword in text.lower() for keyword in ['remote', 'anywhere', 'distributed', 'work from home']):
+    if any(keyword in text_lower for keyword in REMOTE_KEYWORDS):
         return 'Remote'
     
     # City, State patterns
-    city_state_patterns = [
-        r'in\s+([A-Z][a-z]+,\s*[A-Z]{2})',  # "in Seattle, WA"
-        r'([A-Z][a-z]+,\s*[A-Z]{2})\s+',    # "Seattle, WA "
-        r'([San Francisco|New York|Los Angeles|Chicago|Boston|Austin|Denver],\s*[A-Z]{2})',
-    ]
-    
-    for pattern in city_state_patterns:
-        match = re.search(pattern, text)
-        if match:
-            return match.group(1)
+    if ',' in text:
+        for pattern in CITY_STATE_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                return match.group(1)
     
     # Major cities without state
-    major_cities = ['Seattle', 'Francisco', 'Chicago', 'Boston', 'Austin', 'Denver', 'Portland', 'Miami']
-    for city in major_cities:
+    for city in MAJOR_CITIES:
         if city in text:
             return f"{city}"
     
     return 'On-site'
 
-def extract_salary_from_text(text):
+def extract_salary_from_text(text, text_lower=None):
     """Extract salary information from job description text"""
     if not text:
         return 0
     
     # Look for common salary patterns
-    salary_patterns = [
-        r'\$(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s*(?:k|thousand)',
-        r'\$(\d{1,3}(?:,\d{3})*)',
-        r'(\d{1,3})k',
-    ]
-    
-    for pattern in salary_patterns:
-        matches = re.findall(pattern, text.lower())
+    text_lower = text_lower or text.lower()
+    for literal, pattern in SALARY_PATTERNS:
+        matches = literal in text_lower and pattern.findall(text_lower)
         if matches:
             try:
                 salary = int(matches[0].replace(',', '').replace('.', ''))
-                if 'k' in text.lower() or 'thousand' in text.lower():
+                if 'k' in text_lower or 'thousand' in text_lower:
                     salary *= 1000
                 return salary
-            except:
+            except ValueError:
                 continue
     
     return 0
@@ -403,7 +670,6 @@ def scrape_github_jobs():
             headers['Authorization'] = f'token {github_token}'
         
         # Search ONLY for Claude-specific job postings
-        search_url = "https://api.github.com/search/issues"
         search_params = {
             'q': '("claude code" OR "anthropic claude" OR "claude ai" OR "claude") AND (hiring OR job OR position OR engineer OR developer) NOT pull NOT merge NOT bug NOT feature',
             'sort': 'updated',
@@ -411,7 +677,7 @@ def scrape_github_jobs():
             'per_page': 50
         }
         
-        response = requests.get(search_url, headers=headers, params=search_params)
+        response = http_request('GET', GITHUB_SEARCH_URL, headers=headers, params=search_params)
         if response.status_code == 200:
             results = response.json()
             for item in results.get('items', []):
@@ -435,39 +701,39 @@ def scrape_ycombinator_jobs():
         print("🔍 Searching YC Who's Hiring for Claude Code positions...")
         
         # Search HackerNews API for recent "Who is hiring" threads
-        hn_search_url = "https://hn.algolia.com/api/v1/search"
         search_params = {
             'query': 'who is hiring',
             'tags': 'story',
             'hitsPerPage': 5,
-            'numericFilters': f'created_at_i>{int(time.time()) - 86400*60}'  # Last 60 days
+            # Last 60 days, counted from midnight UTC so the query (and its cache key) is stable for a day
+            'numericFilters': f'created_at_i>{(int(time.time()) // 86400 - 60) * 86400}'
         }
         
-        response = requests.get(hn_search_url, params=search_params)
+        response = http_request('GET', HN_SEARCH_URL, params=search_params)
         if response.status_code == 200:
-            threads = response.json().get('hits', [])
+            threads = [thread for thread in response.json().get('hits', []) if thread.get('objectID')]
             
-            for thread in threads:
-                story_id = thread.get('objectID')
-                if story_id:
-                    # Get comments from this hiring thread
-                    comments_url = f"https://hn.algolia.com/api/v1/search"
-                    comment_params = {
-                        'query': 'claude code OR anthropic claude OR claude ai OR claude',
-                        'tags': f'comment,story_{story_id}',
-                        'hitsPerPage': 50
-                    }
-                    
-                    comment_response = requests.get(comments_url, params=comment_params)
-                    if comment_response.status_code == 200:
-                        comments = comment_response.json().get('hits', [])
-                        
-                        for comment in comments:
-                            job = extract_job_from_hn_comment(comment, thread.get('title', ''))
-                            if job:
-                                jobs.append(job)
+            def search_thread(thread):
+                # Get comments from this hiring thread
+                thread_jobs = []
+                comment_params = {
+                    'query': 'claude code OR anthropic claude OR claude ai OR claude',
+                    'tags': f"comment,story_{thread.get('objectID')}",
+                    'hitsPerPage': 50
+                }
+                
+                comment_response = http_request('GET', HN_SEARCH_URL, params=comment_params)
+                if comment_response.status_code == 200:
+                    comments = comment_response.json().get('hits', [])
                     
-                    time.sleep(0.5)  # Rate limiting
+                    for comment in comments:
+                        job = extract_job_from_hn_comment(comment, thread.get('title', ''))
+                        if job:
+                            thread_jobs.append(job)
+                return thread_jobs
+            
+            for thread_jobs in map_concurrently(search_thread, threads):
+                jobs.extend(thread_jobs)
         
         print(f"✅ Found {len(jobs)} jobs from YC Who's Hiring")
         
@@ -545,12 +811,11 @@ def scrape_remote_ok():
         print("🔍 Searching Remote OK for Claude Code positions...")
         
         # Remote OK has an API but might be rate limited
-        url = "https://remoteok.io/api"
         headers = {
             'User-Agent': 'claude-code-templates-job-scraper'
         }
         
-        response = requests.get(url, headers=headers)
+        response = http_request('GET', REMOTE_OK_URL, headers=headers)
         if response.status_code == 200:
             data = response.json()
             for job_data in data[1:]:  # First item is metadata
@@ -562,6 +827,7 @@ def scrape_remote_ok():
                     job = {
                         'company': job_data.get('company', 'Unknown'),
                         'company_icon': job_data.get('company_logo', ''),
+                        'job_title': job_data.get('position', ''),
                         'location': 'Remote' if job_data.get('location') == 'Worldwide' else job_data.get('location', 'Remote'),
                         'description': truncate_description(job_data.get('description', '')),
                         'job_link': f"https://remoteok.io/remote-jobs/{job_data.get('id', '')}",
@@ -589,12 +855,11 @@ def scrape_weworkremotely():
         # We Work Remotely RSS feed approach
         import xml.etree.ElementTree as ET
         
-        rss_url = "https://weworkremotely.com/categories/remote-programming-jobs.rss"
         headers = {
             'User-Agent': 'claude-code-templates-job-scraper'
         }
         
-        response = requests.get(rss_url, headers=headers)
+        response = http_request('GET', WWR_RSS_URL, headers=headers)
         if response.status_code == 200:
             root = ET.fromstring(response.content)
             
@@ -610,10 +875,12 @@ def scrape_weworkremotely():
                     # Extract company from title (usually format: "Company: Job Title")
                     company_match = re.match(r'^([^:]+):', title)
                     company = company_match.group(1).strip() if company_match else 'Remote Company'
+                    job_title = title[company_match.end():].strip() if company_match else title.strip()
                     
                     job = {
                         'company': company,
                         'company_icon': get_company_icon(company),
+                        'job_title': job_title,
                         'location': 'Remote',  # WWR is all remote
                         'description': truncate_description(title),
                         'job_link': link,
@@ -672,6 +939,7 @@ def extract_job_from_github_issue(item):
     return {
         'company': extract_company_name(title, body, repo_name),
         'company_icon': get_company_icon(extract_company_name(title, body, repo_name)),
+        'job_title': extract_job_title(title, body) or '',
         'location': extract_location(title, body),
         'description': truncate_description(title),
         'job_link': item.get('html_url', ''),
@@ -680,32 +948,21 @@ def extract_job_from_github_issue(item):
         'salary': 0
     }
 
-def is_claude_code_related(text):
+def is_claude_code_related(text, text_lower=None):
     """
     Check if text specifically mentions Claude (very strict filtering)
     """
     if not text:
         return False
         
-    text_lower = str(text).lower()
+    text_lower = text_lower or str(text).lower()
     
     # ONLY Claude-specific keywords - must contain "claude"
-    claude_keywords = [
-        'claude code', 'claude-code', 'anthropic claude', 'claude ai', 
-        'claude coder', 'claude assistant', 'claude developer', 'claude engineer',
-        'work with claude', 'using claude', 'claude experience', 'claude integration'
-    ]
-    
-    # Must explicitly mention Claude in some form
-    has_claude_mention = any(keyword in text_lower for keyword in claude_keywords)
+    if any(keyword in text_lower for keyword in CLAUDE_KEYWORDS):
+        return True
     
     # Additional check: just "claude" + job context
-    has_claude_word = 'claude' in text_lower
-    job_words = ['hiring', 'position', 'engineer', 'developer', 'role', 'job', 'career', 'experience', 'skills']
-    has_job_context = any(word in text_lower for word in job_words)
-    
-    # Return True only if Claude is mentioned AND it's in a job context
-    return has_claude_mention or (has_claude_word and has_job_context)
+    return 'claude' in text_lower and any(word in text_lower for word in CLAUDE_JOB_WORDS)
 
 def extract_company_name(title, body, fallback):
     """
@@ -886,10 +1143,250 @@ def generate_sample_jobs():
     
     return sample_jobs
 
-def generate_claude_jobs_json():
+JOB_TEXT_TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+def normalize_job_text(text):
+    """Lowercase alphanumeric words of text joined by single spaces"""
+    return ' '.join(JOB_TEXT_TOKEN_PATTERN.findall((text or '').lower()))
+
+class JobDedupIndex:
+    """
+    Streaming near-duplicate filter for scraped jobs, so a posting syndicated through several
+    sources is published once. A job is a duplicate of an earlier kept one when it has
+    - the same job_link, or
+    - the same normalized (company, job_title, location) key, for jobs with a real company and title, or
+    - a different source and a MinHash signature of its company/title/location shingles estimated
+      at JOB_DEDUP_THRESHOLD Jaccard similarity or more.
+    Every scraper whose source has a posting title sets job_title, so postings from different sources
+    compare like for like; only HN comments, which have none, fall back to their description.
+    Postings from the same source with different links are never merged: similar titles there are
+    different roles (e.g. Senior vs Staff) at the same company and location.
+    Signatures are split into LSH bands, and only jobs sharing a band bucket are compared, so adding
+    n jobs is near-linear instead of pairwise. The first job seen is kept; later duplicates only
+    fill in its missing salary, date_posted and job_title.
+    """
+
+    def __init__(self, threshold=JOB_DEDUP_THRESHOLD, num_perm=JOB_MINHASH_PERMUTATIONS,
+                 bands=JOB_MINHASH_BANDS, shingle_size=JOB_SHINGLE_SIZE):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.jobs = []
+        self.signatures = []
+        self.links = {}
+        self.keys = {}
+        self.buckets = [{} for _ in range(bands)]
+        self.duplicates = 0
+
+    def job_key(self, job):
+        company = normalize_job_text(job.get('company'))
+        job_title = normalize_job_text(job.get('job_title'))
+        if not job_title or company in GENERIC_COMPANY_NAMES:
+            return None
+        return company, job_title, normalize_job_text(job.get('location'))
+
+    def signature(self, job):
+        """MinHash signature of the character shingles of company, title (or description) and location"""
+        text = normalize_job_text(' '.join([
+            job.get('company') or '',
+            job.get('job_title') or job.get('description') or '',
+            job.get('location') or ''
+        ]))
+        size = self.shingle_size
+        shingles = {text[i:i + size] for i in range(max(1, len(text) - size + 1))}
+        # One SHAKE-128 digest per shingle yields num_perm independent 32-bit hash values,
+        # and the signature is the per-position minimum over all shingles
+        unpack = struct.Struct(f'<{self.num_perm}I').unpack
+        hashes = [unpack(hashlib.shake_128(shingle.encode('utf-8')).digest(4 * self.num_perm)) for shingle in shingles]
+        return [min(column) for column in zip(*hashes)]
+
+    def band_keys(self, signature):
+        rows = self.rows
+        return [tuple(signature[i * rows:(i + 1) * rows]) for i in range(len(self.buckets))]
+
+    def similarity(self, first, second):
+        return sum(1 for a, b in zip(first, second) if a == b) / len(first)
+
+    def find_duplicate(self, job, key, signature, band_keys):
+        """Index of the earliest kept job this one duplicates, or None"""
+        link = job.get('job_link')
+        if link and link in self.links:
+            return self.links[link]
+        if key is not None and key in self.keys and self.mergeable(job, self.jobs[self.keys[key]]):
+            return self.keys[key]
+
+        candidates = set()
+        for bucket, band_key in zip(self.buckets, band_keys):
+            candidates.update(bucket.get(band_key, ()))
+        for index in sorted(candidates):
+            # Fuzzy matches only merge a posting syndicated through another source
+            if job.get('source') == self.jobs[index].get('source'):
+                continue
+            if self.similarity(signature, self.signatures[index]) >= self.threshold:
+                return index
+        return None
+
+    @staticmethod
+    def mergeable(job, kept):
+        """False for two postings with different links from the same source"""
+        link, kept_link = job.get('job_link'), kept.get('job_link')
+        return job.get('source') != kept.get('source') or not (link and kept_link and link != kept_link)
+
+    def add(self, job):
+        """Add a job; returns True if it was kept, False if it was merged into an earlier duplicate"""
+        key = self.job_key(job)
+        signature = self.signature(job)
+        band_keys = self.band_keys(signature)
+
+        index = self.find_duplicate(job, key, signature, band_keys)
+        if index is not None:
+            kept = self.jobs[index]
+            for field in ('salary', 'date_posted', 'job_title'):
+                if not kept.get(field) and job.get(field):
+                    kept[field] = job[field]
+            if job.get('job_link'):
+                self.links.setdefault(job['job_link'], index)
+            self.duplicates += 1
+            return False
+
+        index = len(self.jobs)
+        self.jobs.append(job)
+        self.signatures.append(signature)
+        if job.get('job_link'):
+            self.links[job['job_link']] = index
+        if key is not None:
+            self.keys[key] = index
+        for bucket, band_key in zip(self.buckets, band_keys):
+            bucket.setdefault(band_key, []).append(index)
+        return True
+
+class JobStore:
+    """
+    SQLite store of every job seen across runs, keyed by fingerprint (see `fingerprint`).
+    Each run upserts its deduplicated jobs: new fingerprints are inserted, changed postings are
+    rewritten, and every job seen again gets its last_seen refreshed. Jobs not seen for
+    `max_age_days` are expired, and docs/claude-jobs.json is emitted from what remains.
+    Scrapers do not stop at postings already in the store: each source query is a single page, so
+    there is nothing left to skip, and a live posting has to be seen again to keep it from expiring.
+    """
+
+    def __init__(self, path=JOB_STORE_PATH):
+        self.path = path
+        store_dir = os.path.dirname(path)
+        if store_dir:
+            os.makedirs(store_dir, exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            self.connection.execute(
+                """CREATE TABLE IF NOT EXISTS jobs (
+                    fingerprint TEXT PRIMARY KEY,
+                    content_hash TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    first_seen REAL NOT NULL,
+                    last_seen REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )"""
+            )
+
+    @staticmethod
+    def fingerprint(job):
+        """Stable identity of a posting: its link, or company/title/location for jobs without one"""
+        link = (job.get('job_link') or '').strip()
+        identity = link or '|'.join(
+            normalize_job_text(job.get(field)) for field in ('company', 'job_title', 'description', 'location')
+        )
+        return hashlib.sha256(identity.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def content_hash(job):
+        return hashlib.sha256(json.dumps(job, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+    def upsert(self, jobs, now=None):
+        """
+        Insert new jobs, rewrite changed ones and mark all of them as seen at `now`.
+        Returns {'new': n, 'changed': n, 'unchanged': n}.
+        """
+        now = time.time() if now is None else now
+        counts = {'new': 0, 'changed': 0, 'unchanged': 0}
+
+        with self.connection:
+            for job in jobs:
+                fingerprint = self.fingerprint(job)
+                content_hash = self.content_hash(job)
+                row = self.connection.execute(
+                    "SELECT content_hash FROM jobs WHERE fingerprint = ?", (fingerprint,)
+                ).fetchone()
+
+                if row is None:
+                    self.connection.execute(
+                        "INSERT INTO jobs (fingerprint, content_hash, data, first_seen, last_seen, updated_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (fingerprint, content_hash, json.dumps(job, ensure_ascii=False), now, now, now)
+                    )
+                    counts['new'] += 1
+                elif row[0] != content_hash:
+                    self.connection.execute(
+                        "UPDATE jobs SET content_hash = ?, data = ?, last_seen = ?, updated_at = ? WHERE fingerprint = ?",
+                        (content_hash, json.dumps(job, ensure_ascii=False), now, now, fingerprint)
+                    )
+                    counts['changed'] += 1
+                else:
+                    self.connection.execute(
+                        "UPDATE jobs SET last_seen = ? WHERE fingerprint = ?", (now, fingerprint)
+                    )
+                    counts['unchanged'] += 1
+
+        return counts
+
+    def expire(self, max_age_days=JOB_STORE_MAX_AGE_DAYS, now=None):
+        """Delete jobs not seen in the last `max_age_days`; returns how many were removed"""
+        now = time.time() if now is None else now
+        with self.connection:
+            cursor = self.connection.execute(
+                "DELETE FROM jobs WHERE last_seen < ?", (now - max_age_days * 86400,)
+            )
+        return cursor.rowcount
+
+    def jobs(self):
+        """All stored jobs, oldest first"""
+        rows = self.connection.execute("SELECT data FROM jobs ORDER BY first_seen, rowid")
+        return [json.loads(data) for (data,) in rows]
+
+    def close(self):
+        self.connection.close()
+
+def run_scrapers_concurrently(scrapers, timer, label='scraper'):
+    """
+    Run scrapers on a thread pool and return their jobs concatenated in list order, so the
+    result does not depend on which source answers first. A failing scraper contributes no jobs.
+    Per-scraper wall time and job counts are recorded on `timer`.
+    """
+    def run(scraper):
+        start = time.perf_counter()
+        try:
+            jobs = scraper()
+        except Exception as e:
+            print(f"⚠️ Error with {label} {scraper.__name__}: {e}")
+            jobs = []
+        return jobs, time.perf_counter() - start
+    
+    all_jobs = []
+    for scraper, (jobs, seconds) in zip(scrapers, map_concurrently(run, scrapers, SCRAPER_WORKERS)):
+        timer.record(scraper.__name__, seconds, len(jobs))
+        all_jobs.extend(jobs)
+    return all_jobs
+
+def generate_claude_jobs_json(timer=None, store=None, max_age_days=JOB_STORE_MAX_AGE_DAYS):
     """
     Main function to scrape and generate Claude Code jobs JSON
+    With a JobStore, this run's jobs are upserted into it, jobs unseen for `max_age_days` are expired,
+    and the JSON is emitted from the whole store instead of only what was scraped this time.
+    Per-scraper wall time and job counts are recorded on `timer` (a BuildTimer).
     """
+    timer = timer or BuildTimer('generate_claude_jobs.py')
     print("🚀 Starting Claude Code jobs scraping...")
     
     all_jobs = []
@@ -909,42 +1406,45 @@ def generate_claude_jobs_json():
         scrape_weworkremotely,
     ]
     
-    # Try API sources first
-    for scraper in api_scrapers:
-        try:
-            jobs = scraper()
-            all_jobs.extend(jobs)
-            time.sleep(1)
-        except Exception as e:
-            print(f"⚠️ Error with API scraper {scraper.__name__}: {e}")
+    # Try API sources first (all at once)
+    all_jobs.extend(run_scrapers_concurrently(api_scrapers, timer, 'API scraper'))
     
     # If no jobs from APIs, try traditional scraping
     if len(all_jobs) == 0:
         print("📡 No results from APIs, trying traditional scraping...")
         print("💡 Tip: Add valid API keys to .env for better results")
-        scrapers = scraping_sources
+        all_jobs.extend(run_scrapers_concurrently(scraping_sources, timer, 'scraper'))
     else:
         print(f"🎯 Got {len(all_jobs)} jobs from APIs, skipping traditional scraping")
-        scrapers = []
-    
-    for scraper in scrapers:
-        try:
-            jobs = scraper()
-            all_jobs.extend(jobs)
-            time.sleep(1)  # Rate limiting
-        except Exception as e:
-            print(f"⚠️ Error with scraper {scraper.__name__}: {e}")
-    
-    # Remove duplicates based on job_link
-    seen_links = set()
-    unique_jobs = []
-    for job in all_jobs:
-        if job['job_link'] not in seen_links:
-            seen_links.add(job['job_link'])
-            unique_jobs.append(job)
     
-    # Sort by date_posted (most recent first)
-    unique_jobs.sort(key=lambda x: x.get('date_posted', ''), reverse=True)
+    # Remove duplicates: same job_link, or the same posting syndicated through several sources
+    with timer.phase('dedupe') as phase:
+        dedup_index = JobDedupIndex()
+        for job in all_jobs:
+            dedup_index.add(job)
+        unique_jobs = dedup_index.jobs
+        if dedup_index.duplicates:
+            print(f"🧹 Merged {dedup_index.duplicates} duplicate job postings")
+        phase['count'] = len(unique_jobs)
+
+    if store is not None:
+        with timer.phase('job_store') as phase:
+            counts = store.upsert(unique_jobs)
+            expired = store.expire(max_age_days)
+            print(f"🗃️ Job store: {counts['new']} new, {counts['changed']} changed, "
+                  f"{counts['unchanged']} unchanged, {expired} expired")
+
+            # Previously stored jobs may duplicate postings found through another source this run
+            dedup_index = JobDedupIndex()
+            for job in store.jobs():
+                dedup_index.add(job)
+            unique_jobs = dedup_index.jobs
+            phase['count'] = len(unique_jobs)
+
+    with timer.phase('sort') as phase:
+        # Sort by date_posted (most recent first)
+        unique_jobs.sort(key=lambda x: x.get('date_posted', ''), reverse=True)
+        phase['count'] = len(unique_jobs)
     
     # Structure the final data
     jobs_data = {
@@ -957,8 +1457,11 @@ def generate_claude_jobs_json():
     # Save to docs directory
     output_path = 'docs/claude-jobs.json'
     try:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(jobs_data, f, indent=2, ensure_ascii=False)
+        with timer.phase('serialization') as phase:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(jobs_data, f, indent=2, ensure_ascii=False)
+            phase['count'] = len(unique_jobs)
+            phase['bytes'] = os.path.getsize(output_path)
         print(f"✅ Successfully generated {output_path}")
         
         # Log summary
@@ -981,5 +1484,61 @@ def generate_claude_jobs_json():
     except IOError as e:
         print(f"❌ Error writing to {output_path}: {e}")
 
+def main(argv=None):
+    global response_cache
+
+    parser = argparse.ArgumentParser(description="Scrape Claude Code jobs into docs/claude-jobs.json")
+    parser.add_argument(
+        "--cache-mode",
+        choices=HTTP_CACHE_MODES,
+        default="cache",
+        help="HTTP response cache: serve fresh entries and revalidate stale ones (cache), always revalidate "
+             "(refresh), serve only cached responses without network access (replay), or disable it (off)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=HTTP_CACHE_DIR,
+        help=f"Directory for cached HTTP responses (default: {HTTP_CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=int,
+        default=HTTP_CACHE_TTL,
+        help=f"Seconds a cached response is used without revalidation (default: {HTTP_CACHE_TTL})",
+    )
+    parser.add_argument(
+        "--job-store",
+        default=JOB_STORE_PATH,
+        help=f"SQLite store of jobs seen by earlier runs (default: {JOB_STORE_PATH})",
+    )
+    parser.add_argument(
+        "--no-job-store",
+        action="store_true",
+        help="Publish only the jobs scraped in this run, without reading or updating the job store",
+    )
+    parser.add_argument(
+        "--max-age-days",
+        type=int,
+        default=JOB_STORE_MAX_AGE_DAYS,
+        help=f"Expire stored jobs not seen for this many days (default: {JOB_STORE_MAX_AGE_DAYS})",
+    )
+    add_timing_arguments(parser)
+    args = parser.parse_args(argv)
+
+    response_cache = ResponseCache(args.cache_dir, args.cache_ttl, args.cache_mode)
+    store = None if args.no_job_store else JobStore(args.job_store)
+
+    timer = BuildTimer('generate_claude_jobs.py')
+    try:
+        with profiled(args.profile):
+            generate_claude_jobs_json(timer=timer, store=store, max_age_days=args.max_age_days)
+    finally:
+        if store is not None:
+            store.close()
+    print(response_cache.summary())
+
+    if args.timing_report:
+        timer.write_report(args.timing_report)
+
 if __name__ == '__main__':
-    generate_claude_jobs_json()
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -0,0 +1,467 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
+
+import generate_claude_jobs as jobs
+from build_timing import BuildTimer
+
+
+WWR_FEED = """<?xml version="1.0"?>
+<rss><channel>
+  <item>
+    <title>Acme: Claude Code Engineer</title>
+    <description>Build tools with Claude Code</description>
+    <link>https://weworkremotely.com/jobs/acme-claude</link>
+    <pubDate>2025-09-01</pubDate>
+  </item>
+</channel></rss>"""
+
+
+class FakeJobSourcesHandler(BaseHTTPRequestHandler):
+    """
+    Serves canned RapidAPI, GitHub, HN Algolia and We Work Remotely responses after server.delay seconds,
+    plus /feed, which honours If-None-Match against server.etag. Setting server.rapidapi_jobs,
+    server.serper_results or server.remoteok_jobs replaces the canned RapidAPI jobs, Serper organic
+    results (POST /serper) or RemoteOK listing. server.peak_in_flight records the most requests
+    held in that delay at once.
+    """
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        self.record_request(url.path)
+
+        if url.path == '/rapidapi' and self.server.rapidapi_jobs is not None:
+            self.send_body('application/json', {'jobs': self.server.rapidapi_jobs})
+        elif url.path == '/rapidapi':
+            self.send_body('application/json', {'jobs': [{
+                'company_name': 'Acme',
+                'title': f"Claude Code developer ({query['query']})",
+                'description': f"Claude Code developer for {query['query']}",
+                'url': f"https://example.com/{query['query'].replace(' ', '-')}",
+            }]})
+        elif url.path == '/github':
+            self.send_body('application/json', {'items': [{
+                'title': 'Acme is hiring a Claude Code engineer',
+                'body': 'Remote role',
+                'html_url': 'https://github.com/acme/jobs/issues/1',
+                'updated_at': '2025-09-03',
+            }]})
+        elif url.path == '/hn' and query.get('tags') == 'story':
+            self.send_body('application/json', {'hits': [{'objectID': '42', 'title': 'Who is hiring?'}]})
+        elif url.path == '/hn':
+            self.send_body('application/json', {'hits': [{
+                'objectID': '4242',
+                'comment_text': 'Initech is hiring a Claude Code developer. Remote.',
+                'created_at': '2025-09-02',
+            }]})
+        elif url.path == '/wwr':
+            self.send_body('application/rss+xml', WWR_FEED)
+        elif url.path == '/remoteok':
+            self.send_body('application/json', [{'legal': 'metadata'}] + (self.server.remoteok_jobs or []))
+        elif url.path == '/feed' and self.headers.get('If-None-Match') == self.server.etag:
+            self.send_response(304)
+            self.send_header('ETag', self.server.etag)
+            self.end_headers()
+        elif url.path == '/feed':
+            self.send_body('application/json', {'etag': self.server.etag}, {'ETag': self.server.etag})
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.record_request(url.path)
+
+        if url.path == '/serper':
+            self.send_body('application/json', {'organic': self.server.serper_results or []})
+        else:
+            self.send_error(404)
+
+    def record_request(self, path):
+        """Log the request and hold it for server.delay seconds, counting how many are held at once"""
+        with self.server.lock:
+            self.server.requests.append(path)
+            self.server.in_flight += 1
+            self.server.peak_in_flight = max(self.server.peak_in_flight, self.server.in_flight)
+        time.sleep(self.server.delay)
+        with self.server.lock:
+            self.server.in_flight -= 1
+
+    def send_body(self, content_type, body, headers=None):
+        payload = body.encode('utf-8') if isinstance(body, str) else json.dumps(body).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class FakeSourcesTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeJobSourcesHandler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.in_flight = 0
+        self.server.peak_in_flight = 0
+        self.server.delay = 0.3
+        self.server.etag = '"v1"'
+        self.server.rapidapi_jobs = None
+        self.server.serper_results = None
+        self.server.remoteok_jobs = None
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        self.base_url = base_url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        for name, path in [('RAPIDAPI_JOBS_URL', '/rapidapi'), ('GITHUB_SEARCH_URL', '/github'),
+                           ('HN_SEARCH_URL', '/hn'), ('WWR_RSS_URL', '/wwr'),
+                           ('SERPER_SEARCH_URL', '/serper'), ('REMOTE_OK_URL', '/remoteok')]:
+            patcher = mock.patch.object(jobs, name, base_url + path)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        patcher = mock.patch.object(jobs, 'rate_limiter', jobs.HostRateLimiter(default_interval=0))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        patcher = mock.patch.object(jobs, 'response_cache', jobs.ResponseCache(mode='off'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        patcher = mock.patch.dict(os.environ)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for key in ['RAPIDAPI_KEY', 'SERPER_API_KEY', 'GITHUB_TOKEN']:
+            os.environ.pop(key, None)
+
+
+class HostRateLimiterTest(unittest.TestCase):
+
+    def test_spaces_requests_to_the_same_host_only(self):
+        limiter = jobs.HostRateLimiter(default_interval=0.2)
+
+        start = time.monotonic()
+        for _ in range(3):
+            limiter.wait('https://a.example/search')
+        same_host = time.monotonic() - start
+
+        start = time.monotonic()
+        limiter.wait('https://b.example/search')
+        other_host = time.monotonic() - start
+
+        self.assertGreaterEqual(same_host, 0.35)
+        self.assertLess(other_host, 0.1)
+
+
+class ResponseCacheTest(FakeSourcesTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.server.delay = 0
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+
+    def fetch(self, cache, path='/feed'):
+        with mock.patch.object(jobs, 'response_cache', cache):
+            return jobs.http_request('GET', self.base_url + path, params={'q': 'claude'})
+
+    def test_serves_fresh_entries_without_a_request(self):
+        cache = jobs.ResponseCache(self.cache_dir, ttl=3600)
+
+        first = self.fetch(cache)
+        second = self.fetch(cache)
+
+        self.assertEqual(self.server.requests, ['/feed'])
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second.headers['ETag'], '"v1"')
+        self.assertEqual(cache.stats, {'fresh': 1, 'revalidated': 0, 'fetched': 1})
+
+    def test_revalidates_stale_entries_with_etag(self):
+        cache = jobs.ResponseCache(self.cache_dir, ttl=0)
+
+        self.fetch(cache)
+        not_modified = self.fetch(cache)
+        self.server.etag = '"v2"'
+        changed = self.fetch(cache)
+
+        self.assertEqual(not_modified.status_code, 200)
+        self.assertEqual(not_modified.json(), {'etag': '"v1"'})
+        self.assertEqual(changed.json(), {'etag': '"v2"'})
+        self.assertEqual(cache.stats, {'fresh': 0, 'revalidated': 1, 'fetched': 2})
+
+    def test_replay_serves_cache_only(self):
+        self.fetch(jobs.ResponseCache(self.cache_dir))
+        replay = jobs.ResponseCache(self.cache_dir, ttl=0, mode='replay')
+
+        self.assertEqual(self.fetch(replay).json(), {'etag': '"v1"'})
+        with self.assertRaises(jobs.CacheMissError):
+            self.fetch(replay, '/other')
+        self.assertEqual(self.server.requests, ['/feed'])
+
+
+class ExtractJobFieldsTest(unittest.TestCase):
+
+    def test_extracts_all_fields_in_one_call(self):
+        fields = jobs.extract_job_fields(
+            'Senior Claude Code Engineer at Initech',
+            'Initech is hiring. Salary $180k. Seattle, WA office.',
+            'https://www.indeed.com/viewjob?jk=1'
+        )
+
+        self.assertEqual(fields, {
+            'company': 'Initech',
+            'job_title': 'Senior Claude Code Engineer',
+            'location': 'Seattle, WA',
+            'salary': 180000,
+            'is_claude_code_related': True,
+            'is_job_posting': True
+        })
+
+    def test_literal_prefilters_do_not_change_results(self):
+        self.assertEqual(jobs.extract_location_improved('Engineer', 'Office in Denver'), 'Denver')
+        self.assertEqual(jobs.extract_salary_from_text('No numbers here'), 0)
+        self.assertEqual(jobs.extract_job_title('Apply to Platform Engineer - Acme', ''), 'Platform Engineer')
+        self.assertEqual(jobs.extract_company_name_improved('Data role', 'Work at Globex today', ''), 'Globex today')
+        self.assertFalse(jobs.is_claude_code_related('Claude Monet exhibition'))
+
+
+class JobDedupIndexTest(unittest.TestCase):
+
+    def job(self, company, job_title, link, source='Google Serper', **fields):
+        return {'company': company, 'job_title': job_title, 'location': 'Remote', 'description': job_title,
+                'job_link': link, 'source': source, 'salary': 0, 'date_posted': '', **fields}
+
+    def test_merges_syndicated_postings_and_keeps_the_first(self):
+        index = jobs.JobDedupIndex()
+        kept = [index.add(job) for job in [
+            self.job('Initech', 'Senior Claude Code Engineer', 'https://serper.example/1'),
+            self.job('Initech', 'Senior Claude Code Engineer!', 'https://remoteok.example/2', 'RemoteOK',
+                     salary=150000),
+            self.job('Initech', 'Senior Claude Code Engineers', 'https://rapidapi.example/3', 'RapidAPI Jobs',
+                     date_posted='2025-09-01'),
+            self.job('Initech', 'Senior Claude Code Engineer', 'https://serper.example/1'),
+        ]]
+
+        self.assertEqual(kept, [True, False, False, False])
+        self.assertEqual(index.duplicates, 3)
+        self.assertEqual(len(index.jobs), 1)
+        self.assertEqual(index.jobs[0]['job_link'], 'https://serper.example/1')
+        self.assertEqual(index.jobs[0]['salary'], 150000)
+        self.assertEqual(index.jobs[0]['date_posted'], '2025-09-01')
+
+    def test_keeps_distinct_postings(self):
+        index = jobs.JobDedupIndex()
+        for job in [
+            self.job('Initech', 'Senior Claude Code Engineer', 'https://example.com/1'),
+            self.job('Initech', 'Product Designer', 'https://example.com/2'),
+            self.job('Globex', 'Data Scientist, Claude Code', 'https://example.com/3'),
+            self.job('Unknown Company', 'Platform Engineer', 'https://example.com/4'),
+            self.job('Unknown Company', 'Technical Writer', 'https://example.com/5'),
+        ]:
+            index.add(job)
+
+        self.assertEqual(len(index.jobs), 5)
+        self.assertEqual(index.duplicates, 0)
+
+    def test_keeps_distinct_seniority_titles_from_one_source(self):
+        index = jobs.JobDedupIndex()
+        for job in [
+            self.job('Anthropic', 'Senior Software Engineer, Claude Code', 'https://example.com/senior'),
+            self.job('Anthropic', 'Staff Software Engineer, Claude Code', 'https://example.com/staff'),
+            self.job('Anthropic', 'Software Engineer, Claude Code', 'https://example.com/swe'),
+            self.job('Anthropic', 'Software Engineer, Claude Code', 'https://example.com/swe-2'),
+        ]:
+            index.add(job)
+
+        self.assertEqual([job['job_link'] for job in index.jobs], [
+            'https://example.com/senior', 'https://example.com/staff',
+            'https://example.com/swe', 'https://example.com/swe-2'
+        ])
+        self.assertEqual(index.duplicates, 0)
+
+
+class ScrapedJobDedupTest(FakeSourcesTestCase):
+    """Deduplication of jobs as the scrapers actually return them"""
+
+    def setUp(self):
+        super().setUp()
+        self.server.delay = 0
+        os.environ['RAPIDAPI_KEY'] = 'test-key'
+        os.environ['SERPER_API_KEY'] = 'test-serper-key'
+
+        self.server.serper_results = [
+            {
+                'title': f'Anthropic hiring {level} Software Engineer, Claude Code in San Francisco, CA | LinkedIn',
+                'snippet': "Posted 3:51:12 AM. About Anthropic: Anthropic's mission is to create reliable, "
+                           'interpretable AI systems. We are hiring engineers to build Claude Code.',
+                'link': f'https://www.linkedin.com/jobs/view/{level.lower()}-software-engineer-claude-code-at-anthropic',
+            }
+            for level in ('Senior', 'Staff')
+        ]
+        self.server.rapidapi_jobs = [{
+            'company_name': 'Anthropic',
+            'title': 'Senior Software Engineer, Claude Code',
+            'location': 'San Francisco, CA',
+            'description': "About Anthropic: Anthropic's mission is to create reliable, interpretable AI systems. "
+                           'As a Senior Software Engineer on Claude Code you will build the agentic coding tool.',
+            'url': 'https://boards.greenhouse.io/anthropic/jobs/4274352',
+            'date_posted': '2025-09-01',
+        }]
+        self.server.remoteok_jobs = [{
+            'id': 7,
+            'company': 'Initech',
+            'position': 'Claude Code Engineer',
+            'description': 'Initech builds developer tools with Claude Code.',
+            'location': 'Worldwide',
+            'date': '2025-09-02',
+        }]
+
+    def test_scrapers_set_job_title(self):
+        self.assertEqual(
+            [job['job_title'] for job in jobs.scrape_with_rapidapi_jobs()][:1],
+            ['Senior Software Engineer, Claude Code']
+        )
+        self.assertEqual([job['job_title'] for job in jobs.scrape_remote_ok()], ['Claude Code Engineer'])
+        self.assertEqual([job['job_title'] for job in jobs.scrape_weworkremotely()], ['Claude Code Engineer'])
+        self.assertTrue(all(job['job_title'] for job in jobs.scrape_github_jobs()))
+
+    def test_merges_a_posting_syndicated_through_serper_and_rapidapi(self):
+        index = jobs.JobDedupIndex()
+        for job in jobs.scrape_with_serper_jobs() + jobs.scrape_with_rapidapi_jobs() + jobs.scrape_remote_ok():
+            index.add(job)
+
+        self.assertEqual(
+            [(job['source'], job['job_title']) for job in index.jobs],
+            [('Google Serper', 'Senior Software Engineer, Claude Code'),
+             ('Google Serper', 'Staff Software Engineer, Claude Code'),
+             ('RemoteOK', 'Claude Code Engineer')]
+        )
+        # The RapidAPI copy filled in the posting date the Serper result lacks
+        self.assertEqual(index.jobs[0]['date_posted'], '2025-09-01')
+
+    def test_serper_extracts_fields_only_for_matching_results(self):
+        self.server.serper_results.append({
+            'title': 'Claude Monet - Water Lilies | Museum of Modern Art',
+            'snippet': 'The Water Lilies series by Claude Monet.',
+            'link': 'https://www.moma.org/collection/works/80220',
+        })
+
+        with mock.patch.object(jobs, 'extract_job_fields', wraps=jobs.extract_job_fields) as extract:
+            scraped = jobs.scrape_with_serper_jobs()
+
+        # Every query returns the same three results; only the two postings reach the field extractors
+        self.assertEqual(len(scraped), 2 * len(self.server.requests))
+        self.assertEqual(extract.call_count, len(scraped))
+        self.assertNotIn('moma.org', ' '.join(call.args[2] for call in extract.call_args_list))
+
+
+class JobStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        self.store = jobs.JobStore(os.path.join(tmp, 'jobs.sqlite'))
+        self.addCleanup(self.store.close)
+
+    def job(self, link, **fields):
+        return {'company': 'Initech', 'job_title': 'Claude Code Engineer', 'location': 'Remote',
+                'job_link': link, 'source': 'GitHub', 'date_posted': '', 'salary': 0, **fields}
+
+    def test_upserts_new_changed_and_unchanged_jobs(self):
+        self.assertEqual(self.store.upsert([self.job('a'), self.job('b')], now=1000),
+                         {'new': 2, 'changed': 0, 'unchanged': 0})
+        self.assertEqual(self.store.upsert([self.job('a'), self.job('b', salary=150000), self.job('c')], now=2000),
+                         {'new': 1, 'changed': 1, 'unchanged': 1})
+
+        stored = self.store.jobs()
+        self.assertEqual([job['job_link'] for job in stored], ['a', 'b', 'c'])
+        self.assertEqual(stored[1]['salary'], 150000)
+
+    def test_expires_jobs_not_seen_recently(self):
+        self.store.upsert([self.job('old'), self.job('kept')], now=0)
+        self.store.upsert([self.job('kept')], now=20 * 86400)
+
+        self.assertEqual(self.store.expire(max_age_days=10, now=25 * 86400), 1)
+        self.assertEqual([job['job_link'] for job in self.store.jobs()], ['kept'])
+
+
+class ScrapeRapidApiTest(FakeSourcesTestCase):
+
+    def test_queries_run_concurrently_and_keep_query_order(self):
+        os.environ['RAPIDAPI_KEY'] = 'test-key'
+
+        found = jobs.scrape_with_rapidapi_jobs()
+
+        self.assertEqual(len(self.server.requests), 4)
+        self.assertEqual(self.server.peak_in_flight, 4)
+        self.assertEqual(
+            [job['job_link'] for job in found],
+            ['https://example.com/Claude-Code', 'https://example.com/Anthropic-Claude',
+             'https://example.com/Claude-AI-developer', 'https://example.com/Claude-assistant-engineer']
+        )
+
+
+class GenerateClaudeJobsJsonTest(FakeSourcesTestCase):
+
+    def test_fallback_sources_run_concurrently(self):
+        timer = BuildTimer('generate_claude_jobs.py')
+        with tempfile.TemporaryDirectory() as tmp:
+            os.makedirs(os.path.join(tmp, 'docs'))
+            cwd = os.getcwd()
+            os.chdir(tmp)
+            try:
+                jobs.generate_claude_jobs_json(timer=timer)
+            finally:
+                os.chdir(cwd)
+
+            with open(os.path.join(tmp, 'docs', 'claude-jobs.json'), encoding='utf-8') as f:
+                data = json.load(f)
+
+        # GitHub, We Work Remotely and the first of two sequential HN requests are served together
+        self.assertEqual(len(self.server.requests), 4)
+        self.assertEqual(self.server.peak_in_flight, 3)
+        self.assertEqual(sorted(data['sources']), ['GitHub', 'WeWorkRemotely', 'YCombinator'])
+        self.assertEqual(data['total_count'], 3)
+        self.assertEqual(timer.phases['scrape_github_jobs']['count'], 1)
+
+    def test_job_store_keeps_jobs_from_earlier_runs(self):
+        self.server.delay = 0
+        with tempfile.TemporaryDirectory() as tmp:
+            os.makedirs(os.path.join(tmp, 'docs'))
+            store = jobs.JobStore(os.path.join(tmp, 'jobs.sqlite'))
+            cwd = os.getcwd()
+            os.chdir(tmp)
+            try:
+                jobs.generate_claude_jobs_json(store=store)
+                # Every source is down on the second run
+                with mock.patch.object(jobs, 'GITHUB_SEARCH_URL', self.base_url + '/missing'), \
+                        mock.patch.object(jobs, 'HN_SEARCH_URL', self.base_url + '/missing'), \
+                        mock.patch.object(jobs, 'WWR_RSS_URL', self.base_url + '/missing'):
+                    jobs.generate_claude_jobs_json(store=store)
+            finally:
+                os.chdir(cwd)
+                store.close()
+
+            with open(os.path.join(tmp, 'docs', 'claude-jobs.json'), encoding='utf-8') as f:
+                data = json.load(f)
+
+        self.assertEqual(data['total_count'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
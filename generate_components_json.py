@@ -1,28 +1,201 @@
 import os
 import json
+import gzip
+import time
+import hashlib
+import argparse
 import requests
 import subprocess
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import brotli  # Optional: only needed for .br sidecars
+except ImportError:
+    brotli = None
 from pathlib import Path
+from build_timing import BuildTimer, add_timing_arguments, profiled
+from catalog_model import Catalog
+from generate_agents_api import generate_agents_api
 
 # Load environment variables
 load_dotenv()
 
-def run_security_validation():
+# Persistent build cache (gitignored) used for incremental rebuilds
+BUILD_CACHE_DIR = '.catalog-cache'
+BUILD_MANIFEST_NAME = 'build-manifest.json'
+BUILD_MANIFEST_VERSION = 2
+
+# Component files are small, so scanning is I/O bound and threads are enough
+DEFAULT_SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Supabase component_downloads pagination
+SUPABASE_PAGE_SIZE = 1000
+SUPABASE_MAX_PAGES = 200  # Safety limit (200 pages * 1000 records = 200,000 max)
+SUPABASE_FETCH_WORKERS = 8
+DOWNLOAD_CACHE_NAME = 'download-stats.json'
+DOWNLOAD_CACHE_VERSION = 1
+
+# Per-component security audit results, keyed by content hash
+SECURITY_CACHE_NAME = 'security-audit.json'
+SECURITY_CACHE_VERSION = 1
+SECURITY_AUDIT_TYPES = ['agents', 'commands', 'mcps', 'settings', 'hooks']  # What security-audit.js scans
+
+def extract_security_lookup(security_data):
     """
-    Run security validation on all components and return the results.
-    Returns a dictionary with component paths as keys and security data as values.
+    Transform a security-audit JSON report into a lookup dictionary.
+    Key format: "agents/category/name" -> security metadata
     """
-    print("🔒 Running security validation on components...")
+    security_lookup = {}
+
+    for component_result in security_data.get('components', []):
+        component_info = component_result.get('component', {})
+        component_path = component_info.get('path', '')
+        component_type = component_info.get('type', '')
+
+        if component_path:
+            # Extract category and name from path
+            # Path format: components/agents/development-team/frontend-developer.md
+            path_parts = component_path.replace('\\', '/').split('/')
+
+            # Handle both formats: "components/agents/..." and "cli-tool/components/agents/..."
+            if 'components' in path_parts:
+                components_idx = path_parts.index('components')
+                if len(path_parts) > components_idx + 3:
+                    component_type = path_parts[components_idx + 1]  # agents, commands, etc.
+                    category = path_parts[components_idx + 2]
+                    file_name = path_parts[components_idx + 3]
+                    name = os.path.splitext(file_name)[0]
+
+                    # Create lookup key
+                    key = f"{component_type}/{category}/{name}"
+
+                    # Extract security metadata
+                    overall = component_result.get('overall', {})
+                    validators = component_result.get('validators', {})
+
+                    # Build validators object with detailed errors and warnings
+                    validators_data = {}
+                    for validator_name, validator_result in validators.items():
+                        # Process errors to extract line/column information
+                        processed_errors = []
+                        for error in validator_result.get('errors', []):
+                            error_data = {
+                                'level': error.get('level', 'error'),
+                                'code': error.get('code', ''),
+                                'message': error.get('message', ''),
+                                'timestamp': error.get('timestamp', '')
+                            }
 
-    try:
-        # Change to cli-tool directory to run npm command
-        cli_tool_dir = Path(__file__).parent / 'cli-tool'
+                            # Extract metadata with line/column info
+                            metadata = error.get('metadata', {})
+                            if metadata:
+                                error_data['metadata'] = metadata
+
+                                # Extract location info if available
+                                if 'line' in metadata:
+                                    error_data['line'] = metadata['line']
+                                if 'column' in metadata:
+                                    error_data['column'] = metadata['column']
+                                if 'position' in metadata:
+                                    error_data['position'] = metadata['position']
+                                if 'lineText' in metadata:
+                                    error_data['lineText'] = metadata['lineText']
+
+                                # Extract examples array if present (for patterns with multiple matches)
+                                if 'examples' in metadata:
+                                    error_data['examples'] = metadata['examples']
+
+                            processed_errors.append(error_data)
+
+                        # Process warnings similarly
+                        processed_warnings = []
+                        for warning in validator_result.get('warnings', []):
+                            warning_data = {
+                                'level': warning.get('level', 'warning'),
+                                'code': warning.get('code', ''),
+                                'message': warning.get('message', ''),
+                                'timestamp': warning.get('timestamp', '')
+                            }
+
+                            # Extract metadata with line/column info
+                            metadata = warning.get('metadata', {})
+                            if metadata:
+                                warning_data['metadata'] = metadata
+
+                                # Extract location info if available
+                                if 'line' in metadata:
+                                    warning_data['line'] = metadata['line']
+                                if 'column' in metadata:
+                                    warning_data['column'] = metadata['column']
+                                if 'position' in metadata:
+                                    warning_data['position'] = metadata['position']
+                                if 'lineText' in metadata:
+                                    warning_data['lineText'] = metadata['lineText']
+
+                                # Extract examples array if present
+                                if 'examples' in metadata:
+                                    warning_data['examples'] = metadata['examples']
+
+                            processed_warnings.append(warning_data)
+
+                        validators_data[validator_name] = {
+                            'valid': validator_result.get('valid', False),
+                            'score': validator_result.get('score', 0),
+                            'errorCount': validator_result.get('errorCount', 0),
+                            'warningCount': validator_result.get('warningCount', 0),
+                            'errors': processed_errors,
+                            'warnings': processed_warnings,
+                            'info': validator_result.get('info', [])
+                        }
 
+                    security_lookup[key] = {
+                        'validated': True,
+                        'valid': overall.get('valid', False),
+                        'score': overall.get('score', 0),
+                        'errorCount': overall.get('errorCount', 0),
+                        'warningCount': overall.get('warningCount', 0),
+                        'lastValidated': security_data.get('timestamp', ''),
+                        'validators': validators_data
+                    }
+
+                    # Add hash if available from integrity validator
+                    integrity_data = validators.get('integrity', {})
+                    if 'info' in integrity_data:
+                        for info_item in integrity_data['info']:
+                            # info_item is a dictionary with code, message, metadata
+                            if isinstance(info_item, dict):
+                                metadata = info_item.get('metadata', {})
+                                if 'fullHash' in metadata:
+                                    security_lookup[key]['hash'] = metadata['fullHash']
+                                    break
+                                elif 'hash' in metadata:
+                                    security_lookup[key]['hash'] = metadata['hash']
+                                    break
+
+    return security_lookup
+
+def run_security_audit(cli_tool_dir, files_list_path=None):
+    """
+    Run the npm security audit and return its results as a lookup dictionary.
+    With files_list_path, only the components listed in that file are audited.
+    """
+    try:
         # Run security audit and generate JSON report
+        command = ['npm', 'run', 'security-audit:json']
+        if files_list_path:
+            command += ['--', f'--files={os.path.abspath(files_list_path)}']
+
+        # Don't pick up a report left behind by an earlier run if this one fails
+        security_report_path = cli_tool_dir / 'security-report.json'
+        if security_report_path.exists():
+            security_report_path.unlink()
+
         result = subprocess.run(
-            ['npm', 'run', 'security-audit:json'],
+            command,
             cwd=cli_tool_dir,
             capture_output=True,
             text=True,
@@ -37,8 +210,6 @@ def run_security_validation():
             print("✅ Security validation completed successfully")
 
         # Read the generated security report
-        security_report_path = cli_tool_dir / 'security-report.json'
-
         if not security_report_path.exists():
             print("⚠️ Security report not found, skipping security metadata")
             return {}
@@ -46,137 +217,7 @@ def run_security_validation():
         with open(security_report_path, 'r', encoding='utf-8') as f:
             security_data = json.load(f)
 
-        # Transform security data into a lookup dictionary
-        # Key format: "agents/category/name" -> security metadata
-        security_lookup = {}
-
-        for component_result in security_data.get('components', []):
-            component_info = component_result.get('component', {})
-            component_path = component_info.get('path', '')
-            component_type = component_info.get('type', '')
-
-            if component_path:
-                # Extract category and name from path
-                # Path format: components/agents/development-team/frontend-developer.md
-                path_parts = component_path.replace('\\', '/').split('/')
-
-                # Handle both formats: "components/agents/..." and "cli-tool/components/agents/..."
-                if 'components' in path_parts:
-                    components_idx = path_parts.index('components')
-                    if len(path_parts) > components_idx + 3:
-                        component_type = path_parts[components_idx + 1]  # agents, commands, etc.
-                        category = path_parts[components_idx + 2]
-                        file_name = path_parts[components_idx + 3]
-                        name = os.path.splitext(file_name)[0]
-
-                        # Create lookup key
-                        key = f"{component_type}/{category}/{name}"
-
-                        # Extract security metadata
-                        overall = component_result.get('overall', {})
-                        validators = component_result.get('validators', {})
-
-                        # Build validators object with detailed errors and warnings
-                        validators_data = {}
-                        for validator_name, validator_result in validators.items():
-                            # Process errors to extract line/column information
-                            processed_errors = []
-                            for error in validator_result.get('errors', []):
-                                error_data = {
-                                    'level': error.get('level', 'error'),
-                                    'code': error.get('code', ''),
-                                    'message': error.get('message', ''),
-                                    'timestamp': error.get('timestamp', '')
-                                }
-
-                                # Extract metadata with line/column info
-                                metadata = error.get('metadata', {})
-                                if metadata:
-                                    error_data['metadata'] = metadata
-
-                                    # Extract location info if available
-                                    if 'line' in metadata:
-                                        error_data['line'] = metadata['line']
-                                    if 'column' in metadata:
-                                        error_data['column'] = metadata['column']
-                                    if 'position' in metadata:
-                                        error_data['position'] = metadata['position']
-                                    if 'lineText' in metadata:
-                                        error_data['lineText'] = metadata['lineText']
-
-                                    # Extract examples array if present (for patterns with multiple matches)
-                                    if 'examples' in metadata:
-                                        error_data['examples'] = metadata['examples']
-
-                                processed_errors.append(error_data)
-
-                            # Process warnings similarly
-                            processed_warnings = []
-                            for warning in validator_result.get('warnings', []):
-                                warning_data = {
-                                    'level': warning.get('level', 'warning'),
-                                    'code': warning.get('code', ''),
-                                    'message': warning.get('message', ''),
-                                    'timestamp': warning.get('timestamp', '')
-                                }
-
-                                # Extract metadata with line/column info
-                                metadata = warning.get('metadata', {})
-                                if metadata:
-                                    warning_data['metadata'] = metadata
-
-                                    # Extract location info if available
-                                    if 'line' in metadata:
-                                        warning_data['line'] = metadata['line']
-                                    if 'column' in metadata:
-                                        warning_data['column'] = metadata['column']
-                                    if 'position' in metadata:
-                                        warning_data['position'] = metadata['position']
-                                    if 'lineText' in metadata:
-                                        warning_data['lineText'] = metadata['lineText']
-
-                                    # Extract examples array if present
-                                    if 'examples' in metadata:
-                                        warning_data['examples'] = metadata['examples']
-
-                                processed_warnings.append(warning_data)
-
-                            validators_data[validator_name] = {
-                                'valid': validator_result.get('valid', False),
-                                'score': validator_result.get('score', 0),
-                                'errorCount': validator_result.get('errorCount', 0),
-                                'warningCount': validator_result.get('warningCount', 0),
-                                'errors': processed_errors,
-                                'warnings': processed_warnings,
-                                'info': validator_result.get('info', [])
-                            }
-
-                        security_lookup[key] = {
-                            'validated': True,
-                            'valid': overall.get('valid', False),
-                            'score': overall.get('score', 0),
-                            'errorCount': overall.get('errorCount', 0),
-                            'warningCount': overall.get('warningCount', 0),
-                            'lastValidated': security_data.get('timestamp', ''),
-                            'validators': validators_data
-                        }
-
-                        # Add hash if available from integrity validator
-                        integrity_data = validators.get('integrity', {})
-                        if 'info' in integrity_data:
-                            for info_item in integrity_data['info']:
-                                # info_item is a dictionary with code, message, metadata
-                                if isinstance(info_item, dict):
-                                    metadata = info_item.get('metadata', {})
-                                    if 'fullHash' in metadata:
-                                        security_lookup[key]['hash'] = metadata['fullHash']
-                                        break
-                                    elif 'hash' in metadata:
-                                        security_lookup[key]['hash'] = metadata['hash']
-                                        break
-
-        print(f"✅ Security metadata extracted for {len(security_lookup)} components")
-        return security_lookup
+        return extract_security_lookup(security_data)
 
     except subprocess.TimeoutExpired:
         print("⚠️ Security validation timed out after 5 minutes")
@@ -188,11 +229,369 @@ def run_security_validation():
         print(f"⚠️ Error running security validation: {e}")
         return {}
 
-def fetch_download_stats():
+def hash_directory_files(paths):
+    """
+    Return a sha256 over the relative paths and contents of all files under the given paths.
+    """
+    digest = hashlib.sha256()
+    for base_path in paths:
+        if os.path.isfile(base_path):
+            file_paths = [str(base_path)]
+        else:
+            file_paths = sorted(
+                os.path.join(root, file)
+                for root, dirs, files in os.walk(base_path)
+                for file in files
+            )
+        for file_path in file_paths:
+            digest.update(file_path.replace("\\", "/").encode('utf-8'))
+            with open(file_path, 'rb') as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+def collect_security_audit_files(components_dir):
+    """
+    Return {security_key: (file_path, sha256)} for the component files security-audit.js scans:
+    every .md file under the audited component types. Files without a category are skipped
+    because they never get a lookup key.
+    """
+    audit_files = {}
+
+    for component_type in SECURITY_AUDIT_TYPES:
+        type_path = os.path.join(components_dir, component_type)
+        for root, dirs, files in os.walk(type_path):
+            for file in files:
+                if not file.endswith('.md'):
+                    continue
+
+                file_path = os.path.join(root, file)
+                path_parts = os.path.relpath(file_path, components_dir).replace('\\', '/').split('/')
+                if len(path_parts) < 3:
+                    continue
+
+                # Same key as extract_security_lookup: type/category/name
+                key = f"{path_parts[0]}/{path_parts[1]}/{os.path.splitext(path_parts[2])[0]}"
+                with open(file_path, 'rb') as f:
+                    audit_files[key] = (file_path, hashlib.sha256(f.read()).hexdigest())
+
+    return audit_files
+
+def load_security_cache(cache_path, validators_hash):
+    """
+    Load cached per-component security results: {security_key: {'sha256': ..., 'security': ...}}.
+    The cache is discarded when the validators changed since it was written.
+    """
+    if not os.path.isfile(cache_path):
+        return {}
+
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (IOError, ValueError) as e:
+        print(f"⚠️ Could not read security cache {cache_path}, auditing all components: {e}")
+        return {}
+
+    if cache.get('version') != SECURITY_CACHE_VERSION or cache.get('validatorsHash') != validators_hash:
+        print("⚠️ Security validators changed, auditing all components")
+        return {}
+
+    return cache.get('components', {})
+
+def save_security_cache(cache_path, validators_hash, cached_components):
+    """
+    Persist per-component security results with the validators fingerprint they were produced with.
+    """
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': SECURITY_CACHE_VERSION,
+                'validatorsHash': validators_hash,
+                'components': cached_components
+            }, f, ensure_ascii=False)
+    except IOError as e:
+        print(f"⚠️ Could not write security cache {cache_path}: {e}")
+
+def run_security_validation(cache_path=None, refresh_cache=False):
+    """
+    Run security validation on all components and return the results.
+    Returns a dictionary with component paths as keys and security data as values.
+    With cache_path, results are cached per component together with the sha256 of its content,
+    and only new or changed components are re-audited; refresh_cache re-audits everything.
+    """
+    print("🔒 Running security validation on components...")
+
+    # Change to cli-tool directory to run npm command
+    cli_tool_dir = Path(__file__).parent / 'cli-tool'
+
+    if not cache_path:
+        security_lookup = run_security_audit(cli_tool_dir)
+        print(f"✅ Security metadata extracted for {len(security_lookup)} components")
+        return security_lookup
+
+    try:
+        audit_files = collect_security_audit_files(cli_tool_dir / 'components')
+        validators_hash = hash_directory_files([
+            cli_tool_dir / 'src' / 'security-audit.js',
+            cli_tool_dir / 'src' / 'validation'
+        ])
+    except Exception as e:
+        print(f"⚠️ Could not fingerprint components for the security cache: {e}")
+        security_lookup = run_security_audit(cli_tool_dir)
+        print(f"✅ Security metadata extracted for {len(security_lookup)} components")
+        return security_lookup
+
+    cached_components = {} if refresh_cache else load_security_cache(cache_path, validators_hash)
+
+    security_lookup = {}
+    changed_files = []
+    for key, (file_path, sha256) in audit_files.items():
+        cached = cached_components.get(key)
+        if cached and cached['sha256'] == sha256:
+            security_lookup[key] = cached['security']
+        else:
+            changed_files.append(file_path)
+
+    print(f"📦 Reusing cached security results for {len(security_lookup)} components, auditing {len(changed_files)}")
+
+    if changed_files:
+        files_list_path = os.path.join(os.path.dirname(cache_path), 'security-audit-files.txt')
+        os.makedirs(os.path.dirname(files_list_path), exist_ok=True)
+        with open(files_list_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(os.path.abspath(file_path) for file_path in changed_files))
+
+        audited = run_security_audit(cli_tool_dir, files_list_path)
+        security_lookup.update({key: value for key, value in audited.items() if key in audit_files})
+
+    # Only components that were audited successfully are cached; the rest are retried next run
+    save_security_cache(cache_path, validators_hash, {
+        key: {'sha256': audit_files[key][1], 'security': security_lookup[key]}
+        for key in audit_files
+        if key in security_lookup
+    })
+
+    print(f"✅ Security metadata extracted for {len(security_lookup)} components")
+    return security_lookup
+
+def create_supabase_session(supabase_api_key, pool_size):
+    """
+    Create a pooled requests.Session for the Supabase REST API.
+    Idempotent GETs are retried with backoff, so a flaky page is re-requested instead of ending the fetch.
+    """
+    session = requests.Session()
+    retries = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=['GET']
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retries)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({
+        'apikey': supabase_api_key,
+        'Authorization': f'Bearer {supabase_api_key}'
+    })
+    return session
+
+def parse_content_range_total(content_range):
+    """
+    Return the total row count from a PostgREST content-range header like "0-999/45977",
+    or None when the total is unknown ("0-999/*") or the header is missing.
+    """
+    if not content_range or '/' not in content_range:
+        return None
+
+    total = content_range.split('/')[1]
+    if total == '*':
+        return None
+
+    try:
+        return int(total)
+    except ValueError:
+        return None
+
+def aggregate_download_rows(rows, component_totals):
+    """
+    Count download rows into component_totals, keyed by "component_type|category|name".
+    Returns the highest row id in rows, or None if the rows carry no id.
+    """
+    max_id = None
+    for download in rows:
+        row_id = download.get('id')
+        if isinstance(row_id, int) and (max_id is None or row_id > max_id):
+            max_id = row_id
+
+        component_type = download.get('component_type', '')
+        component_name = download.get('component_name', '')
+
+        if component_type and component_name:
+            # Handle case where component_name already includes category
+            if '/' in component_name:
+                category = component_name.split('/')[0]
+                actual_name = component_name.split('/')[-1]
+            else:
+                actual_name = component_name
+                category = 'general'
+
+            # Create a key for aggregation matching trending data structure
+            key = f"{component_type}|{category}|{actual_name}"
+            component_totals[key] += 1
+
+    return max_id
+
+def load_download_cache(cache_path):
+    """
+    Load cached download totals and the highest component_downloads id they include.
+    Returns (component_totals, max_id); an empty cache is (empty totals, None).
+    """
+    component_totals = defaultdict(int)
+
+    if not os.path.isfile(cache_path):
+        return component_totals, None
+
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (IOError, ValueError) as e:
+        print(f"⚠️ Could not read download cache {cache_path}, fetching all downloads: {e}")
+        return component_totals, None
+
+    if cache.get('version') != DOWNLOAD_CACHE_VERSION or not isinstance(cache.get('max_id'), int):
+        return component_totals, None
+
+    component_totals.update(cache.get('totals', {}))
+    return component_totals, cache['max_id']
+
+def save_download_cache(cache_path, component_totals, max_id):
+    """
+    Persist aggregated download totals with the id watermark they were counted up to.
+    """
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': DOWNLOAD_CACHE_VERSION,
+                'max_id': max_id,
+                'totals': component_totals
+            }, f, indent=2, sort_keys=True)
+    except IOError as e:
+        print(f"⚠️ Could not write download cache {cache_path}: {e}")
+
+def fetch_download_page(session, api_url, offset, limit, extra_headers=None):
+    """
+    Fetch one page of rows using a PostgREST Range header.
+    Returns the response, or None if the page could not be fetched.
+    """
+    headers = {'Range': f'{offset}-{offset + limit - 1}'}
+    if extra_headers:
+        headers.update(extra_headers)
+
+    try:
+        response = session.get(api_url, headers=headers, timeout=30)
+    except requests.RequestException as e:
+        # Raised once the session's retries are used up
+        print(f"  Rows {offset}-{offset + limit - 1}: {e}")
+        return None
+    if response.status_code not in [200, 206]:
+        print(f"  Rows {offset}-{offset + limit - 1}: Got status {response.status_code}")
+        return None
+    return response
+
+def fetch_component_download_totals(session, api_url, limit=SUPABASE_PAGE_SIZE, max_pages=SUPABASE_MAX_PAGES,
+                                    workers=SUPABASE_FETCH_WORKERS, component_totals=None, after_id=None):
+    """
+    Fetch rows of component_downloads and aggregate them into per-component totals.
+    The first page asks for an exact count; the remaining pages are then requested in parallel
+    and each page is aggregated as soon as it arrives, so raw rows are never accumulated.
+    Falls back to sequential paging when the server does not report a total.
+    With after_id, only rows with a higher id are fetched and added to component_totals.
+    Returns (component_totals, rows_fetched, max_id) where max_id is the highest id counted.
+    max_id is None when a page in the middle failed: rows below the highest id were then
+    never counted, so the totals must not be cached as a watermark to resume from.
+    """
+    if component_totals is None:
+        component_totals = defaultdict(int)
+    max_id = after_id
+
+    # Ordering by id keeps pages stable while rows are inserted, and makes the id watermark valid
+    api_url = f"{api_url}?select=id,component_type,component_name&order=id.asc"
+    if after_id is not None:
+        api_url += f"&id=gt.{after_id}"
+
+    def count_batch(batch):
+        nonlocal max_id
+        batch_max_id = aggregate_download_rows(batch, component_totals)
+        if batch_max_id is not None and (max_id is None or batch_max_id > max_id):
+            max_id = batch_max_id
+
+    first_response = fetch_download_page(session, api_url, 0, limit, {'Prefer': 'count=exact'})
+    if first_response is None:
+        return component_totals, 0, max_id
+
+    batch = first_response.json()
+    count_batch(batch)
+    rows_fetched = len(batch)
+
+    if len(batch) < limit:
+        return component_totals, rows_fetched, max_id
+
+    total = parse_content_range_total(first_response.headers.get('content-range', ''))
+
+    if total is None:
+        # No total available: page sequentially until a short page
+        for page in range(1, max_pages):
+            response = fetch_download_page(session, api_url, page * limit, limit)
+            if response is None:
+                break
+
+            batch = response.json()
+            count_batch(batch)
+            rows_fetched += len(batch)
+
+            if len(batch) < limit:
+                break
+
+            # Progress indicator every 10 pages
+            if (page + 1) % 10 == 0:
+                print(f"  Fetched {rows_fetched} records so far...")
+
+        return component_totals, rows_fetched, max_id
+
+    row_limit = min(total, max_pages * limit)
+    offsets = range(limit, row_limit, limit)
+    print(f"  {total} records in {len(offsets) + 1} pages, fetching with {workers} workers...")
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(fetch_download_page, session, api_url, offset, limit) for offset in offsets]
+
+        failed_pages = 0
+        for pages_done, future in enumerate(as_completed(futures), start=2):
+            response = future.result()
+            if response is None:
+                failed_pages += 1
+                continue
+
+            batch = response.json()
+            count_batch(batch)
+            rows_fetched += len(batch)
+
+            # Progress indicator every 10 pages
+            if pages_done % 10 == 0:
+                print(f"  Fetched {rows_fetched} records so far...")
+
+    if failed_pages:
+        print(f"  ⚠️ {failed_pages} pages failed, download totals will not be cached")
+        max_id = None
+    return component_totals, rows_fetched, max_id
+
+def fetch_download_stats(cache_path=None, refresh_cache=False):
     """
     Fetch download statistics from Supabase
     Returns a dictionary with component_type-component_name as key and download count as value
     Supports: agents, commands, mcps, settings, hooks, sandbox, skills, templates, plugins
+    With cache_path, aggregated totals are cached locally and later runs only fetch rows
+    newer than the highest id already counted; refresh_cache refetches everything and rewrites the cache.
     """
     print("📊 Fetching download statistics from Supabase...")
 
@@ -216,90 +615,29 @@ def fetch_download_stats():
     if not supabase_url or not supabase_api_key:
         print("⚠️ Warning: Missing Supabase credentials, skipping download stats")
         return {}
-    
+
     try:
-        headers = {
-            'apikey': supabase_api_key,
-            'Authorization': f'Bearer {supabase_api_key}'
-        }
-        
-        # First, let's query component_downloads to aggregate counts per component
-        # We need to handle pagination since there can be many records
+        session = create_supabase_session(supabase_api_key, SUPABASE_FETCH_WORKERS)
+
+        # Start from the cached totals, if any, and only fetch newer rows
+        cached_totals, after_id = load_download_cache(cache_path) if cache_path and not refresh_cache else (None, None)
+        if after_id is not None:
+            print(f"📦 Loaded cached download totals up to id {after_id}, fetching newer rows only")
+
+        # Query component_downloads and aggregate counts per component while paginating
         api_url = f"{supabase_url}/rest/v1/component_downloads"
-        
-        all_downloads = []
-        offset = 0
-        limit = 1000
-
-        # Fetch all records with pagination
-        max_pages = 200  # Safety limit (200 pages * 1000 records = 200,000 max)
-        for page in range(max_pages):
-            paginated_headers = headers.copy()
-            paginated_headers['Range'] = f'{offset}-{offset + limit - 1}'
-            
-            response = requests.get(api_url, headers=paginated_headers)
-            
-            if response.status_code not in [200, 206]:
-                print(f"  Page {page+1}: Got status {response.status_code}, stopping")
-                break
-                
-            batch = response.json()
-            if not batch:
-                break
-                
-            all_downloads.extend(batch)
-            
-            # Check if we have more records to fetch
-            content_range = response.headers.get('content-range', '')
-            
-            # If we get a range like "45000-45977/*", check if we got less than limit records
-            if len(batch) < limit:
-                break  # We've reached the end
-            
-            # Also check for explicit total if provided
-            if content_range and '/' in content_range:
-                parts = content_range.split('/')
-                if parts[1] != '*':
-                    try:
-                        total = int(parts[1])
-                        if offset + limit >= total:
-                            break
-                    except ValueError:
-                        pass
-            
-            offset += limit
-            
-            # Progress indicator every 10 pages
-            if (page + 1) % 10 == 0:
-                print(f"  Fetched {len(all_downloads)} records so far...")
-        
-        print(f"📊 Total records fetched: {len(all_downloads)}")
-        
-        # If we fetched records, use them
-        if len(all_downloads) > 0:
-            # Process component_downloads data
-            downloads = all_downloads
-            
-            # Aggregate downloads by component
-            download_counts = {}
-            component_totals = defaultdict(int)
-            
-            for download in downloads:
-                component_type = download.get('component_type', '')
-                component_name = download.get('component_name', '')
+        component_totals, rows_fetched, max_id = fetch_component_download_totals(
+            session, api_url, component_totals=cached_totals, after_id=after_id
+        )
 
-                if component_type and component_name:
-                    # Handle case where component_name already includes category
-                    if '/' in component_name:
-                        category = component_name.split('/')[0]
-                        actual_name = component_name.split('/')[-1]
-                    else:
-                        actual_name = component_name
-                        category = 'general'
+        print(f"📊 Total records fetched: {rows_fetched}")
 
-                    # Create a key for aggregation matching trending data structure
-                    key = f"{component_type}|{category}|{actual_name}"
-                    component_totals[key] += 1
+        if cache_path and max_id is not None:
+            save_download_cache(cache_path, component_totals, max_id)
+
+        # If we fetched or cached records, use them
+        if rows_fetched > 0 or component_totals:
+            download_counts = {}
 
             # Convert to the format we need using the TYPE_MAPPING constant
             for key, count in component_totals.items():
@@ -309,20 +647,20 @@ def fetch_download_stats():
                     mapped_type = TYPE_MAPPING.get(component_type, component_type + 's')
                     final_key = f"{mapped_type}/{category}/{component_name}"
                     download_counts[final_key] = count
-            
+
             print(f"✅ Fetched and aggregated {len(download_counts)} component download stats")
             return download_counts
         else:
             # Try alternative: fetch from download_stats table if it exists
             print("⚠️ No data from component_downloads, trying download_stats table...")
             alt_url = f"{supabase_url}/rest/v1/download_stats"
-            alt_response = requests.get(alt_url, headers=headers)
-            
+            alt_response = session.get(alt_url, timeout=30)
+
             if alt_response.status_code == 200:
                 print("📊 Using download_stats table instead...")
                 stats = alt_response.json()
                 download_counts = {}
-                
+
                 for stat in stats:
                     component_type = stat.get('component_type', '')
                     component_name = stat.get('component_name', '')
@@ -340,13 +678,13 @@ def fetch_download_stats():
                     mapped_type = TYPE_MAPPING.get(component_type, component_type + 's')
                     key = f"{mapped_type}/{category}/{actual_name}"
                     download_counts[key] = total_downloads
-                
+
                 print(f"✅ Fetched stats for {len(download_counts)} components from download_stats")
                 return download_counts
             else:
                 print("⚠️ No download stats available")
                 return {}
-        
+
     except Exception as e:
         print(f"⚠️ Error fetching download stats: {e}")
         return {}
@@ -371,28 +709,165 @@ def scan_directory_recursively(directory_path, relative_to_path=None):
     
     return files_list
 
-def generate_components_json():
+def load_build_manifest(manifest_path):
     """
-    Scans the cli-tool/components and cli-tool/templates directories and generates a components.json file
-    for the static website, including the content of each file and download statistics.
+    Load the persistent build manifest used for incremental rebuilds.
+    Returns an empty manifest if the file is missing, unreadable or from another version.
     """
-    components_base_path = 'cli-tool/components'
-    templates_base_path = 'cli-tool/templates'
-    plugins_path = '.claude-plugin/marketplace.json'
-    output_path = 'docs/components.json'
-    components_data = {'agents': [], 'commands': [], 'mcps': [], 'settings': [], 'hooks': [], 'sandbox': [], 'skills': [], 'templates': [], 'plugins': []}
+    empty_manifest = {'version': BUILD_MANIFEST_VERSION, 'files': {}, 'outputs': {}, 'shards': {}}
 
-    # Run security validation
-    security_metadata = run_security_validation()
+    if not os.path.isfile(manifest_path):
+        return empty_manifest
 
-    # Fetch download statistics
-    download_stats = fetch_download_stats()
-    component_types = ['agents', 'commands', 'mcps', 'settings', 'hooks', 'sandbox', 'skills']
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (IOError, ValueError) as e:
+        print(f"⚠️ Could not read build manifest {manifest_path}, doing a full rebuild: {e}")
+        return empty_manifest
+
+    if manifest.get('version') != BUILD_MANIFEST_VERSION:
+        print("⚠️ Build manifest version changed, doing a full rebuild")
+        return empty_manifest
+
+    manifest.setdefault('files', {})
+    manifest.setdefault('outputs', {})
+    manifest.setdefault('shards', {})
+    return manifest
+
+def save_build_manifest(manifest, manifest_path):
+    """
+    Persist the build manifest next to the other build caches.
+    """
+    try:
+        os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+    except IOError as e:
+        print(f"⚠️ Could not write build manifest {manifest_path}: {e}")
 
-    print(f"Starting scan of {components_base_path} and {templates_base_path}...")
+def decode_component_text(raw_bytes):
+    """
+    Decode file bytes the way text mode open() does, including universal newlines.
+    """
+    return raw_bytes.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+
+def parse_component_file(file_path, component_type, raw_bytes=None):
+    """
+    Read a component file and extract its description.
+    Returns a record with the file content and description; both are empty if the file can't be read.
+    """
+    content = ''
+    description = ''
+    try:
+        if raw_bytes is None:
+            with open(file_path, 'rb') as f:
+                raw_bytes = f.read()
+
+        content = decode_component_text(raw_bytes)
+
+        if component_type == 'skills':
+            # Extract description from frontmatter if available
+            if content.startswith('---'):
+                frontmatter_end = content.find('---', 3)
+                if frontmatter_end != -1:
+                    frontmatter = content[3:frontmatter_end]
+                    for line in frontmatter.split('\n'):
+                        if line.startswith('description:'):
+                            description = line.split('description:', 1)[1].strip()
+                            break
+
+        # Extract description field from JSON files
+        elif file_path.endswith('.json'):
+            try:
+                json_data = json.loads(content)
+
+                if component_type == 'mcps':
+                    # Extract description from the first mcpServer entry
+                    if 'mcpServers' in json_data:
+                        for server_name, server_config in json_data['mcpServers'].items():
+                            if isinstance(server_config, dict) and 'description' in server_config:
+                                description = server_config['description']
+                                break  # Use the first description found
+                elif component_type in ['settings', 'hooks']:
+                    # Extract description from settings/hooks JSON files
+                    if 'description' in json_data:
+                        description = json_data['description']
+
+            except json.JSONDecodeError:
+                print(f"Warning: Invalid JSON in {file_path}")
+
+    except Exception as e:
+        print(f"Warning: Could not read file {file_path}: {e}")
+
+    return {'content': content, 'description': description}
+
+def load_component_record(file_path, component_type, manifest):
+    """
+    Return (record, manifest_entry) for a component file, reusing the manifest entry when possible.
+    Unchanged mtime/size skips hashing and parsing; an unchanged sha256 skips re-parsing.
+    The manifest only keeps parsed fields, so the content itself is always read from the file,
+    but only once the mtime/size check has decided whether it also needs hashing.
+    manifest_entry is None when the file couldn't be stat'ed or read.
+    Safe to call from worker threads: the manifest is only read here.
+    """
+    cached = manifest['files'].get(file_path)
+
+    try:
+        stat = os.stat(file_path)
+    except Exception as e:
+        print(f"Warning: Could not read file {file_path}: {e}")
+        return {'content': '', 'description': ''}, None
+
+    unchanged = cached and cached['mtime_ns'] == stat.st_mtime_ns and cached['size'] == stat.st_size
+
+    try:
+        with open(file_path, 'rb') as f:
+            raw_bytes = f.read()
+    except Exception as e:
+        print(f"Warning: Could not read file {file_path}: {e}")
+        return {'content': '', 'description': ''}, None
+
+    if unchanged:
+        return {'content': decode_cached_content(file_path, raw_bytes), **cached['record']}, cached
+
+    sha256 = hashlib.sha256(raw_bytes).hexdigest()
+    if cached and cached['sha256'] == sha256:
+        record = {'content': decode_cached_content(file_path, raw_bytes), **cached['record']}
+    else:
+        record = parse_component_file(file_path, component_type, raw_bytes)
+
+    manifest_entry = {
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha256': sha256,
+        'record': {key: value for key, value in record.items() if key != 'content'}
+    }
+    return record, manifest_entry
+
+def decode_cached_content(file_path, raw_bytes):
+    """
+    Decode the content of a file whose parsed fields come from the manifest.
+    Like parse_component_file, a file that isn't valid UTF-8 warns and gets empty content.
+    """
+    try:
+        return decode_component_text(raw_bytes)
+    except UnicodeDecodeError as e:
+        print(f"Warning: Could not read file {file_path}: {e}")
+        return ''
+
+def collect_component_files(components_base_path, component_types):
+    """
+    Walk the component directories and return the files to scan per component type,
+    sorted by catalog path (the order they appear in components.json).
+    Each item has component_type, category, name, file_name, file_path and path.
+    """
+    scan_items = {}
 
-    # Scan components (existing logic)
     for component_type in component_types:
+        type_items = []
+        scan_items[component_type] = type_items
+
         type_path = os.path.join(components_base_path, component_type)
         if not os.path.isdir(type_path):
             print(f"Warning: Directory not found for type: {component_type}")
@@ -411,127 +886,248 @@ def generate_components_json():
                             # Look for SKILL.md inside the skill directory
                             skill_file_path = os.path.join(skill_dir_path, 'SKILL.md')
                             if os.path.isfile(skill_file_path):
-                                name = skill_dir  # Use directory name as skill name
-
-                                # Read file content
-                                content = ''
-                                description = ''
-                                try:
-                                    with open(skill_file_path, 'r', encoding='utf-8') as f:
-                                        content = f.read()
-
-                                    # Extract description from frontmatter if available
-                                    if content.startswith('---'):
-                                        frontmatter_end = content.find('---', 3)
-                                        if frontmatter_end != -1:
-                                            frontmatter = content[3:frontmatter_end]
-                                            for line in frontmatter.split('\n'):
-                                                if line.startswith('description:'):
-                                                    description = line.split('description:', 1)[1].strip()
-                                                    break
-
-                                except Exception as e:
-                                    print(f"Warning: Could not read file {skill_file_path}: {e}")
-
-                                # Look up download count for this skill
-                                download_key = f"{component_type}/{category}/{name}"
-                                downloads = download_stats.get(download_key, 0)
-
-                                # Look up security metadata for this skill
-                                security_key = f"{component_type}/{category}/{name}"
-                                security = security_metadata.get(security_key, {
-                                    'validated': False,
-                                    'valid': None,
-                                    'score': None,
-                                    'errorCount': 0,
-                                    'warningCount': 0,
-                                    'lastValidated': None
+                                type_items.append({
+                                    'component_type': component_type,
+                                    'category': category,
+                                    'name': skill_dir,  # Use directory name as skill name
+                                    'file_name': 'SKILL.md',
+                                    'file_path': skill_file_path,
+                                    'path': f"{category}/{skill_dir}"  # category/skill-name format
                                 })
 
-                                # Path includes category for proper organization
-                                component = {
-                                    'name': name,  # Just the skill directory name
-                                    'path': f"{category}/{name}",  # category/skill-name format
-                                    'category': category,
-                                    'type': 'skill',
-                                    'content': content,
-                                    'description': description,
-                                    'downloads': downloads,
-                                    'security': security
-                                }
-                                components_data[component_type].append(component)
-                                print(f"  Processed skill: {category}/{name}")
-            continue  # Skip the normal file scanning for skills
-
-        # Normal scanning for other component types
-        for category in os.listdir(type_path):
-            category_path = os.path.join(type_path, category)
-            if os.path.isdir(category_path):
-                for file_name in os.listdir(category_path):
-                    file_path = os.path.join(category_path, file_name)
-                    if os.path.isfile(file_path) and (file_name.endswith('.md') or file_name.endswith('.json')) and not file_name.endswith('.py'):
-                        name = os.path.splitext(file_name)[0]
-                        
-                        # Read file content
-                        content = ''
-                        description = ''
-                        try:
-                            with open(file_path, 'r', encoding='utf-8') as f:
-                                content = f.read()
-                                
-                            # Extract description field from JSON files
-                            if file_name.endswith('.json'):
-                                try:
-                                    import json
-                                    json_data = json.loads(content)
-                                    
-                                    if component_type == 'mcps':
-                                        # Extract description from the first mcpServer entry
-                                        if 'mcpServers' in json_data:
-                                            for server_name, server_config in json_data['mcpServers'].items():
-                                                if isinstance(server_config, dict) and 'description' in server_config:
-                                                    description = server_config['description']
-                                                    break  # Use the first description found
-                                    elif component_type in ['settings', 'hooks']:
-                                        # Extract description from settings/hooks JSON files
-                                        if 'description' in json_data:
-                                            description = json_data['description']
-                                            
-                                except json.JSONDecodeError:
-                                    print(f"Warning: Invalid JSON in {file_path}")
-                                    
-                        except Exception as e:
-                            print(f"Warning: Could not read file {file_path}: {e}")
-
-                        # Look up download count for this component
-                        # The key in download_stats uses the plural form: agents/category/name
-                        download_key = f"{component_type}/{category}/{name}"
-                        downloads = download_stats.get(download_key, 0)
-
-                        # Look up security metadata for this component
-                        security_key = f"{component_type}/{category}/{name}"
-                        security = security_metadata.get(security_key, {
-                            'validated': False,
-                            'valid': None,
-                            'score': None,
-                            'errorCount': 0,
-                            'warningCount': 0,
-                            'lastValidated': None
-                        })
-
-                        component = {
-                            'name': name,
-                            'path': os.path.join(category, file_name).replace("\\", "/"),
-                            'category': category,
-                            'type': component_type[:-1],  # singular form
-                            'content': content,  # Add file content
-                            'description': description,  # Add description for MCPs
-                            'downloads': downloads,  # Add download count
-                            'security': security  # Add security metadata
-                        }
-                        components_data[component_type].append(component)
+        else:
+            # Normal scanning for other component types
+            for category in os.listdir(type_path):
+                category_path = os.path.join(type_path, category)
+                if os.path.isdir(category_path):
+                    for file_name in os.listdir(category_path):
+                        file_path = os.path.join(category_path, file_name)
+                        if os.path.isfile(file_path) and (file_name.endswith('.md') or file_name.endswith('.json')) and not file_name.endswith('.py'):
+                            type_items.append({
+                                'component_type': component_type,
+                                'category': category,
+                                'name': os.path.splitext(file_name)[0],
+                                'file_name': file_name,
+                                'file_path': file_path,
+                                'path': os.path.join(category, file_name).replace("\\", "/")
+                            })
+
+        # Sort components alphabetically by path
+        type_items.sort(key=lambda x: x['path'])
+
+    return scan_items
+
+def ordered_parallel_map(executor, fn, items, window):
+    """
+    Like executor.map, but keeps at most `window` results in flight so that
+    memory stays bounded when the consumer is slower than the workers.
+    Results are yielded in the order of items.
+    """
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+
+    while pending:
+        yield pending.popleft().result()
+
+class CatalogStreamWriter:
+    """
+    Incrementally writes a JSON object, byte-identical to json.dump(data, f, indent=2, ensure_ascii=False),
+    so the catalog never has to be held in memory. Pre-compressed sidecars (.gz, and .br if the brotli
+    module is installed) are written alongside in the same pass.
+    Everything goes to temporary files that only replace the targets on close(), and only when
+    the content hash differs from previous_sha256 or a target is missing.
+    """
+
+    def __init__(self, output_path, previous_sha256=None, compress=('gz',)):
+        self.output_path = output_path
+        self.previous_sha256 = previous_sha256
+        self.sha256 = hashlib.sha256()
+        self.bytes_written = 0
+        self.keys_written = 0
+        self.section_items = 0
+
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+        self.targets = [output_path]
+        self.file = open(f"{output_path}.tmp", 'wb')
+        self.gzip_raw_file = None
+        self.gzip_file = None
+        self.brotli_file = None
+        self.brotli_compressor = None
+
+        if 'gz' in compress:
+            self.targets.append(f"{output_path}.gz")
+            # mtime=0 keeps the gzip bytes reproducible between identical builds
+            self.gzip_raw_file = open(f"{output_path}.gz.tmp", 'wb')
+            self.gzip_file = gzip.GzipFile(filename='', mode='wb', compresslevel=9, fileobj=self.gzip_raw_file, mtime=0)
+        if 'br' in compress:
+            if brotli is None:
+                print(f"⚠️ brotli module not installed, skipping {output_path}.br")
+            else:
+                self.targets.append(f"{output_path}.br")
+                self.brotli_file = open(f"{output_path}.br.tmp", 'wb')
+                self.brotli_compressor = brotli.Compressor()
+
+    def _write(self, text):
+        data = text.encode('utf-8')
+        self.sha256.update(data)
+        self.bytes_written += len(data)
+        self.file.write(data)
+        if self.gzip_file:
+            self.gzip_file.write(data)
+        if self.brotli_compressor:
+            self.brotli_file.write(self.brotli_compressor.process(data))
+
+    def _write_key(self, key):
+        self._write(('{' if self.keys_written == 0 else ',') + '\n  ' + json.dumps(key, ensure_ascii=False) + ': ')
+        self.keys_written += 1
+
+    def add_value(self, key, value):
+        """Write a complete top-level key/value pair"""
+        self._write_key(key)
+        self._write(json.dumps(value, indent=2, ensure_ascii=False).replace('\n', '\n  '))
+
+    def begin_section(self, key):
+        """Start a top-level list whose items are written one at a time with add_item()"""
+        self._write_key(key)
+        self._write('[')
+        self.section_items = 0
+
+    def add_item(self, item):
+        self._write((',' if self.section_items else '') + '\n    ')
+        self._write(json.dumps(item, indent=2, ensure_ascii=False).replace('\n', '\n    '))
+        self.section_items += 1
+
+    def end_section(self):
+        self._write('\n  ]' if self.section_items else ']')
+
+    def close(self):
+        """
+        Finish the files and move them into place. Returns True if the outputs were replaced,
+        False if they were already up to date.
+        """
+        self._write('\n}' if self.keys_written else '{}')
+
+        self.file.close()
+        if self.gzip_file:
+            self.gzip_file.close()
+            self.gzip_raw_file.close()
+        if self.brotli_compressor:
+            self.brotli_file.write(self.brotli_compressor.finish())
+            self.brotli_file.close()
+
+        unchanged = (
+            self.sha256.hexdigest() == self.previous_sha256
+            and all(os.path.isfile(target) for target in self.targets)
+            and os.path.getsize(self.output_path) == self.bytes_written
+        )
+        for target in self.targets:
+            if unchanged:
+                os.remove(f"{target}.tmp")
+            else:
+                os.replace(f"{target}.tmp", target)
+
+        return not unchanged
+
+    def abort(self):
+        """Close and discard the temporary files, leaving the previous outputs in place"""
+        for handle in [self.file, self.gzip_file, self.gzip_raw_file, self.brotli_file]:
+            if handle:
+                handle.close()
+        for target in self.targets:
+            if os.path.exists(f"{target}.tmp"):
+                os.remove(f"{target}.tmp")
+
+def write_component_shard(component_type, component, shards_dir, index_dir, previous_shards, shards):
+    """
+    Write a component's content to its own shard file and return its entry for the catalog index.
+    The index entry keeps everything except `content`, adding a contentHash and the shard URL
+    (relative to the index) so clients can lazy-load content. Shards whose hash is unchanged
+    since the last build are not rewritten. The shard is recorded in `shards` for the manifest.
+    Returns (index_entry, written).
+    """
+    content = component['content']
+    content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+    shard_path = os.path.join(shards_dir, component_type, f"{component['path']}.json")
+
+    written = False
+    if previous_shards.get(shard_path) != content_hash or not os.path.isfile(shard_path):
+        os.makedirs(os.path.dirname(shard_path), exist_ok=True)
+        with open(shard_path, 'w', encoding='utf-8') as f:
+            json.dump({'content': content, 'contentHash': content_hash}, f, ensure_ascii=False)
+        written = True
+    shards[shard_path] = content_hash
+
+    index_entry = {key: value for key, value in component.items() if key != 'content'}
+    index_entry['contentHash'] = content_hash
+    index_entry['shard'] = os.path.relpath(shard_path, index_dir).replace("\\", "/")
+    return index_entry, written
+
+def remove_stale_shards(shards_dir, shards):
+    """
+    Delete shard files of components that no longer exist.
+    """
+    for root, dirs, files in os.walk(shards_dir):
+        for file in files:
+            file_path = os.path.join(root, file)
+            if file_path not in shards:
+                os.remove(file_path)
+
+def generate_components_json(use_cache=True, cache_dir=BUILD_CACHE_DIR, workers=DEFAULT_SCAN_WORKERS, monolithic=True,
+                             compress=('gz',), timer=None):
+    """
+    Scans the cli-tool/components and cli-tool/templates directories and generates a components.json file
+    for the static website, including the content of each file and download statistics.
+    With use_cache, unchanged files are taken from the build manifest in cache_dir instead of being re-parsed,
+    and only downloads newer than the cached totals are fetched from Supabase.
+    Component files are read and parsed on a pool of `workers` threads.
+    Besides the lightweight index and per-component content shards, the full catalog with
+    inline content is written to docs/components.json unless `monolithic` is False.
+    Components are streamed to the outputs as they are scanned, together with the
+    pre-compressed sidecars listed in `compress` ('gz', 'br').
+    Per-phase wall time, counts and bytes are recorded on `timer` (a BuildTimer).
+    Returns the in-memory Catalog (index entries without content), or None if writing failed.
+    """
+    timer = timer or BuildTimer('generate_components_json.py')
+    components_base_path = 'cli-tool/components'
+    templates_base_path = 'cli-tool/templates'
+    plugins_path = '.claude-plugin/marketplace.json'
+    output_path = 'docs/components.json'
+    index_path = 'docs/components-index.json'
+    shards_dir = 'docs/components'
+    manifest_path = os.path.join(cache_dir, BUILD_MANIFEST_NAME)
+    components_data = {'templates': [], 'plugins': []}
+
+    # Previous manifest (read side) and the one describing this build (write side)
+    if use_cache:
+        manifest = load_build_manifest(manifest_path)
+        print(f"📦 Loaded build manifest with {len(manifest['files'])} cached files")
+    else:
+        manifest = {'version': BUILD_MANIFEST_VERSION, 'files': {}, 'outputs': {}, 'shards': {}}
+    new_manifest = {'version': BUILD_MANIFEST_VERSION, 'files': {}, 'outputs': {}, 'shards': {}}
+
+    # Run security validation, re-auditing only components whose content changed
+    with timer.phase('security_audit') as phase:
+        security_metadata = run_security_validation(os.path.join(cache_dir, SECURITY_CACHE_NAME), refresh_cache=not use_cache)
+        phase['count'] = len(security_metadata)
+
+    # Fetch download statistics, only pulling rows newer than the cached totals
+    with timer.phase('supabase_fetch') as phase:
+        download_stats = fetch_download_stats(os.path.join(cache_dir, DOWNLOAD_CACHE_NAME), refresh_cache=not use_cache)
+        phase['count'] = len(download_stats)
+    component_types = ['agents', 'commands', 'mcps', 'settings', 'hooks', 'sandbox', 'skills']
+
+    print(f"Starting scan of {components_base_path} and {templates_base_path}...")
+
+    # Walk the component tree now; the files are read while streaming the output below
+    with timer.phase('collect_files') as phase:
+        scan_items = collect_component_files(components_base_path, component_types)
+        phase['count'] = sum(len(items) for items in scan_items.values())
 
     # Scan templates (new logic)
+    phase_start = time.perf_counter()
     if os.path.isdir(templates_base_path):
         print(f"Scanning for templates in {templates_base_path}...")
         
@@ -617,7 +1213,10 @@ def generate_components_json():
     else:
         print(f"Warning: Templates directory not found: {templates_base_path}")
 
+    timer.record('templates', time.perf_counter() - phase_start, len(components_data['templates']))
+
     # Load components metadata from marketplace.json (Claude Code standard)
+    phase_start = time.perf_counter()
     components_marketplace_path = 'cli-tool/components/.claude-plugin/marketplace.json'
     components_marketplace = None
     if os.path.isfile(components_marketplace_path):
@@ -702,33 +1301,141 @@ def generate_components_json():
     else:
         print(f"Warning: Plugins file not found: {plugins_path}")
 
-    # Sort components alphabetically
-    for component_type in components_data:
-        if component_type in ['templates', 'plugins']:
-            # Sort templates and plugins by name since they don't have path
-            components_data[component_type].sort(key=lambda x: x['name'])
-        else:
-            # Sort other components by path
-            components_data[component_type].sort(key=lambda x: x['path'])
+    timer.record('plugins', time.perf_counter() - phase_start, len(components_data['plugins']))
 
-    # Add marketplace metadata (root level - our public marketplace)
-    if marketplace_full_data:
-        components_data['marketplace'] = marketplace_full_data
-        print("✅ Added public marketplace metadata to components.json")
+    # Sort templates and plugins by name since they don't have path
+    for component_type in components_data:
+        components_data[component_type].sort(key=lambda x: x['name'])
 
-    # Add components marketplace metadata (Claude Code standard)
-    if components_marketplace:
-        components_data['componentsMarketplace'] = components_marketplace
-        print("✅ Added components marketplace metadata to components.json")
+    index_data = {component_type: [] for component_type in component_types}
+    catalog_writer = None
+    index_writer = None
+    previous_outputs = manifest['outputs']
 
     try:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(components_data, f, indent=2, ensure_ascii=False)
-        print(f"Successfully generated {output_path} with file content.")
-        
+        if monolithic:
+            catalog_writer = CatalogStreamWriter(output_path, previous_outputs.get(output_path), compress)
+        shards_written = 0
+        index_dir = os.path.dirname(index_path)
+        previous_shards = manifest['shards'] if use_cache else {}
+
+        # Read, parse and stream components on a worker pool; results come back in catalog order
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            scan_results = ordered_parallel_map(
+                executor,
+                lambda item: load_component_record(item['file_path'], item['component_type'], manifest),
+                [item for component_type in component_types for item in scan_items[component_type]],
+                window=workers * 4
+            )
+
+            for component_type in component_types:
+                if catalog_writer:
+                    catalog_writer.begin_section(component_type)
+
+                for item in scan_items[component_type]:
+                    item_start = time.perf_counter()
+                    record, manifest_entry = next(scan_results)
+                    category = item['category']
+                    name = item['name']
+
+                    if manifest_entry:
+                        new_manifest['files'][item['file_path']] = manifest_entry
+
+                    # Look up download count for this component
+                    # The key in download_stats uses the plural form: agents/category/name
+                    download_key = f"{component_type}/{category}/{name}"
+                    downloads = download_stats.get(download_key, 0)
+
+                    # Look up security metadata for this component
+                    security_key = f"{component_type}/{category}/{name}"
+                    security = security_metadata.get(security_key, {
+                        'validated': False,
+                        'valid': None,
+                        'score': None,
+                        'errorCount': 0,
+                        'warningCount': 0,
+                        'lastValidated': None
+                    })
+
+                    component = {
+                        'name': name,
+                        'path': item['path'],
+                        'category': category,
+                        'type': component_type[:-1],  # singular form
+                        'content': record['content'],  # Add file content
+                        'description': record['description'],  # Add description for MCPs and skills
+                        'downloads': downloads,  # Add download count
+                        'security': security  # Add security metadata
+                    }
+
+                    # Time spent waiting on the pool counts as scanning, the rest as serialization
+                    serialize_start = time.perf_counter()
+                    timer.record(
+                        f'scan:{component_type}', serialize_start - item_start, 1,
+                        manifest_entry['size'] if manifest_entry else 0
+                    )
+
+                    if catalog_writer:
+                        catalog_writer.add_item(component)
+
+                    index_entry, written = write_component_shard(
+                        component_type, component, shards_dir, index_dir, previous_shards, new_manifest['shards']
+                    )
+                    index_data[component_type].append(index_entry)
+                    shards_written += written
+                    timer.record('serialization', time.perf_counter() - serialize_start)
+
+                    if component_type == 'skills':
+                        print(f"  Processed skill: {category}/{name}")
+
+                if catalog_writer:
+                    catalog_writer.end_section()
+
+        phase_start = time.perf_counter()
+        output_bytes = 0
+        remove_stale_shards(shards_dir, new_manifest['shards'])
+
+        # Templates, plugins and marketplace metadata are small and written in one piece
+        index_data.update(components_data)
+
+        # Add marketplace metadata (root level - our public marketplace)
+        if marketplace_full_data:
+            index_data['marketplace'] = marketplace_full_data
+            print("✅ Added public marketplace metadata to components.json")
+
+        # Add components marketplace metadata (Claude Code standard)
+        if components_marketplace:
+            index_data['componentsMarketplace'] = components_marketplace
+            print("✅ Added components marketplace metadata to components.json")
+
+        if catalog_writer:
+            for key in index_data:
+                if key not in component_types:
+                    catalog_writer.add_value(key, index_data[key])
+
+            if catalog_writer.close():
+                print(f"Successfully generated {output_path} with file content.")
+            else:
+                print(f"✅ {output_path} is up to date, skipping write.")
+            new_manifest['outputs'][output_path] = catalog_writer.sha256.hexdigest()
+            output_bytes += catalog_writer.bytes_written
+            catalog_writer = None
+
+        index_writer = CatalogStreamWriter(index_path, previous_outputs.get(index_path), compress)
+        for key, value in index_data.items():
+            index_writer.add_value(key, value)
+        index_writer.close()
+        new_manifest['outputs'][index_path] = index_writer.sha256.hexdigest()
+        output_bytes += index_writer.bytes_written
+        index_writer = None
+        print(f"Successfully generated {index_path} ({shards_written} of {len(new_manifest['shards'])} content shards rewritten).")
+
+        save_build_manifest(new_manifest, manifest_path)
+        timer.record('serialization', time.perf_counter() - phase_start, len(new_manifest['shards']), output_bytes)
+
         # Log summary
         print("\n--- Generation Summary ---")
-        for component_type, components in components_data.items():
+        for component_type, components in index_data.items():
             # Skip marketplace metadata in summary (it's not a component type)
             if component_type in ['marketplace', 'componentsMarketplace']:
                 continue
@@ -753,8 +1460,70 @@ def generate_components_json():
 
         print("--------------------------")
 
+        return Catalog(index_data)
+
     except IOError as e:
         print(f"Error writing to {output_path}: {e}")
+        for writer in [catalog_writer, index_writer]:
+            if writer:
+                writer.abort()
+        return None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate docs/components.json from cli-tool/components")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore the build caches: re-read every component file and refetch all download rows",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=BUILD_CACHE_DIR,
+        help=f"Directory for the build manifest and download cache (default: {BUILD_CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_SCAN_WORKERS,
+        help=f"Number of threads used to read and parse component files (default: {DEFAULT_SCAN_WORKERS})",
+    )
+    parser.add_argument(
+        "--compress",
+        nargs="*",
+        choices=["gz", "br"],
+        default=["gz"],
+        help="Pre-compressed sidecars to write next to each output (default: gz; br needs the brotli module)",
+    )
+    parser.add_argument(
+        "--no-monolithic",
+        action="store_true",
+        help="Only write the components index and content shards, not the full docs/components.json",
+    )
+    parser.add_argument(
+        "--no-api",
+        action="store_true",
+        help="Don't derive the docs/api/*.json endpoints from the catalog",
+    )
+    add_timing_arguments(parser)
+    args = parser.parse_args(argv)
+
+    timer = BuildTimer('generate_components_json.py')
+    with profiled(args.profile):
+        catalog = generate_components_json(
+            use_cache=not args.no_cache,
+            cache_dir=args.cache_dir,
+            workers=args.workers,
+            monolithic=not args.no_monolithic,
+            compress=args.compress,
+            timer=timer
+        )
+
+        # Derive the slim API files from the catalog built above, without re-reading it
+        if catalog and not args.no_api:
+            generate_agents_api(timer=timer, catalog=catalog)
+
+    if args.timing_report:
+        timer.write_report(args.timing_report)
 
 if __name__ == '__main__':
-    generate_components_json()
+    main()
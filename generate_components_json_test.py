@@ -0,0 +1,853 @@
+import gzip
+import json
+import os
+import pstats
+import shutil
+import subprocess
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
+
+import generate_components_json as gen
+from build_timing import BuildTimer, profiled
+from catalog_model import Catalog
+
+
+class StubSupabaseHandler(BaseHTTPRequestHandler):
+    """Minimal PostgREST stand-in serving server.rows with Range pagination"""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, dict(self.headers)))
+
+        if self.path.startswith('/rest/v1/download_stats'):
+            self.send_json(200, server.download_stats, {})
+            return
+
+        if not self.path.startswith('/rest/v1/component_downloads'):
+            self.send_json(404, {'message': 'not found'}, {})
+            return
+
+        # Only the id=gt.N filter used for delta fetches is supported
+        rows = server.rows
+        id_filter = parse_qs(urlsplit(self.path).query).get('id')
+        if id_filter:
+            min_id = int(id_filter[0].split('.', 1)[1])
+            rows = [row for row in rows if row['id'] > min_id]
+
+        start, end = (int(x) for x in self.headers.get('Range', '0-999').split('-'))
+        if start in server.fail_offsets:
+            self.send_json(400, {'message': 'bad range'}, {})
+            return
+        batch = rows[start:end + 1]
+        total = str(len(rows)) if server.report_total and 'count=exact' in self.headers.get('Prefer', '') else '*'
+        content_range = f"{start}-{start + len(batch) - 1}/{total}" if batch else f"*/{total}"
+        self.send_json(206 if batch else 200, batch, {'content-range': content_range})
+
+    def send_json(self, status, payload, headers):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TestFetchDownloadStats(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubSupabaseHandler)
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.rows = []
+        self.server.download_stats = []
+        self.server.report_total = True
+        self.server.fail_offsets = set()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        env = {
+            'SUPABASE_URL': f"http://127.0.0.1:{self.server.server_address[1]}",
+            'SUPABASE_API_KEY': 'test-key'
+        }
+        patcher = mock.patch.dict(os.environ, env)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def make_rows(self, count):
+        """Rows spread over a few components: 3 agents and 2 commands"""
+        names = [
+            ('agent', 'development-team/frontend-developer'),
+            ('agent', 'development-team/backend-architect'),
+            ('agent', 'code-reviewer'),
+            ('command', 'git/feature'),
+            ('command', 'git/release'),
+        ]
+        return [{'id': i, 'component_type': names[i % 5][0], 'component_name': names[i % 5][1]} for i in range(count)]
+
+    def component_requests(self):
+        return [path for path, _ in self.server.requests if path.startswith('/rest/v1/component_downloads')]
+
+    def test_concurrent_pages_aggregate_all_rows(self):
+        """All pages are fetched once and every row is counted"""
+        self.server.rows = self.make_rows(5 * gen.SUPABASE_PAGE_SIZE + 17)
+
+        stats = gen.fetch_download_stats()
+
+        self.assertEqual(len(self.component_requests()), 6)
+        self.assertEqual(sum(stats.values()), len(self.server.rows))
+        self.assertEqual(stats['agents/development-team/frontend-developer'], 1004)
+        self.assertEqual(stats['agents/general/code-reviewer'], 1003)
+        self.assertEqual(stats['commands/git/release'], 1003)
+
+    def test_unknown_total_pages_sequentially(self):
+        """Without a total in content-range, paging stops at the first short page"""
+        self.server.rows = self.make_rows(2 * gen.SUPABASE_PAGE_SIZE + 1)
+        self.server.report_total = False
+
+        stats = gen.fetch_download_stats()
+
+        self.assertEqual(len(self.component_requests()), 3)
+        self.assertEqual(sum(stats.values()), len(self.server.rows))
+
+    def test_single_page(self):
+        """A short first page needs no further requests"""
+        self.server.rows = self.make_rows(10)
+
+        stats = gen.fetch_download_stats()
+
+        self.assertEqual(len(self.component_requests()), 1)
+        self.assertEqual(stats['commands/git/feature'], 2)
+
+    def test_falls_back_to_download_stats_table(self):
+        """An empty component_downloads table falls back to download_stats"""
+        self.server.download_stats = [
+            {'component_type': 'agent', 'component_name': 'data-ai/ml-engineer', 'total_downloads': 42}
+        ]
+
+        stats = gen.fetch_download_stats()
+
+        self.assertEqual(stats, {'agents/data-ai/ml-engineer': 42})
+
+    def test_delta_fetch_uses_cached_totals(self):
+        """A second run only fetches rows above the cached id watermark and merges them"""
+        cache_path = os.path.join(tempfile.mkdtemp(), 'download-stats.json')
+        self.server.rows = self.make_rows(2 * gen.SUPABASE_PAGE_SIZE + 5)
+        first_stats = gen.fetch_download_stats(cache_path)
+
+        self.server.requests.clear()
+        self.server.rows = self.make_rows(2 * gen.SUPABASE_PAGE_SIZE + 15)
+        second_stats = gen.fetch_download_stats(cache_path)
+
+        self.assertEqual(len(self.component_requests()), 1)
+        self.assertIn('id=gt.2004', self.component_requests()[0])
+        self.assertEqual(sum(second_stats.values()), sum(first_stats.values()) + 10)
+        self.assertEqual(second_stats['agents/general/code-reviewer'], first_stats['agents/general/code-reviewer'] + 2)
+
+        # A refresh ignores the cached totals and counts every row once
+        refreshed_stats = gen.fetch_download_stats(cache_path, refresh_cache=True)
+        self.assertEqual(refreshed_stats, second_stats)
+
+    def test_failed_page_is_not_cached(self):
+        """A page that fails in the middle keeps its rows out of the cached watermark"""
+        cache_path = os.path.join(tempfile.mkdtemp(), 'download-stats.json')
+        self.server.rows = self.make_rows(4 * gen.SUPABASE_PAGE_SIZE + 5)
+        self.server.fail_offsets = {2 * gen.SUPABASE_PAGE_SIZE}
+
+        partial_stats = gen.fetch_download_stats(cache_path)
+
+        self.assertEqual(sum(partial_stats.values()), len(self.server.rows) - gen.SUPABASE_PAGE_SIZE)
+        self.assertFalse(os.path.exists(cache_path))
+
+        # The next run fetches every row again instead of resuming past the missing page
+        self.server.fail_offsets = set()
+        stats = gen.fetch_download_stats(cache_path)
+        self.assertEqual(sum(stats.values()), len(self.server.rows))
+        self.assertEqual(gen.fetch_download_stats(cache_path), stats)
+
+    def test_sends_api_key_headers(self):
+        """Every request carries the Supabase credentials from the pooled session"""
+        self.server.rows = self.make_rows(3 * gen.SUPABASE_PAGE_SIZE)
+
+        gen.fetch_download_stats()
+
+        for _, headers in self.server.requests:
+            self.assertEqual(headers.get('apikey'), 'test-key')
+            self.assertEqual(headers.get('Authorization'), 'Bearer test-key')
+
+
+class TestLoadComponentRecord(unittest.TestCase):
+
+    def setUp(self):
+        self.file_path = os.path.join(tempfile.mkdtemp(), 'broken.md')
+        with open(self.file_path, 'wb') as f:
+            f.write(b'\xff\xfe not utf-8')
+        self.manifest = {'version': gen.BUILD_MANIFEST_VERSION, 'files': {}, 'outputs': {}, 'shards': {}}
+
+    def test_invalid_utf8_on_incremental_run(self):
+        """A file that isn't UTF-8 gets empty content on every run instead of raising"""
+        record, entry = gen.load_component_record(self.file_path, 'agents', self.manifest)
+        self.assertEqual(record, {'content': '', 'description': ''})
+
+        # Unchanged mtime/size takes the fast path
+        self.manifest['files'][self.file_path] = entry
+        record, cached_entry = gen.load_component_record(self.file_path, 'agents', self.manifest)
+        self.assertEqual(record, {'content': '', 'description': ''})
+        self.assertIs(cached_entry, entry)
+
+        # Same bytes with a new mtime take the sha256 path
+        os.utime(self.file_path, ns=(entry['mtime_ns'] + 10**9, entry['mtime_ns'] + 10**9))
+        record, _ = gen.load_component_record(self.file_path, 'agents', self.manifest)
+        self.assertEqual(record, {'content': '', 'description': ''})
+
+
+
+MARKETPLACE = {
+    'name': 'claude-code-templates',
+    'owner': {'name': 'Templates Team'},
+    'plugins': [{
+        'name': 'toolkit', 'description': 'Developer toolkit', 'version': '2.0.0', 'keywords': ['dev'],
+        'author': {'name': 'Ana'}, 'commands': ['./cli-tool/components/commands/git/feature.md'],
+        'agents': ['./cli-tool/components/agents/security/auditor.md'], 'mcpServers': []
+    }]
+}
+COMPONENTS_MARKETPLACE = {'name': 'components', 'agents': [{'name': 'auditor'}]}
+
+# A small repository tree covering every kind of entry the generator writes
+CATALOG_FILES = {
+    'cli-tool/components/agents/development/frontend-developer.md': '---\nname: frontend-developer\n---\nBuilds UIs – naïve café\n',
+    'cli-tool/components/agents/development/backend-architect.md': 'Designs APIs\r\nand services\r\n',
+    'cli-tool/components/agents/security/auditor.md': 'Audits code\n',
+    'cli-tool/components/commands/git/feature.md': 'Start a feature branch\n',
+    'cli-tool/components/commands/git/notes.txt': 'Not a component\n',
+    'cli-tool/components/mcps/database/postgres.json': json.dumps({'mcpServers': {'postgres': {'description': 'Query Postgres', 'command': 'npx'}}}),
+    'cli-tool/components/settings/permissions/allow-git.json': json.dumps({'description': 'Allow git commands'}),
+    'cli-tool/components/hooks/automation/format-on-save.json': json.dumps({'description': 'Run the formatter'}),
+    'cli-tool/components/skills/documents/pdf/SKILL.md': '---\nname: pdf\ndescription: Work with PDF files\n---\nBody\n',
+    'cli-tool/components/.claude-plugin/marketplace.json': json.dumps(COMPONENTS_MARKETPLACE),
+    'cli-tool/templates/python/README.md': '# Python\n',
+    'cli-tool/templates/python/examples/django/README.md': '# Django\n',
+    '.claude-plugin/marketplace.json': json.dumps(MARKETPLACE),
+}
+AUDITOR_SECURITY = {
+    'validated': True, 'valid': True, 'score': 95, 'errorCount': 0, 'warningCount': 1,
+    'lastValidated': '2025-01-01T00:00:00Z', 'validators': {}
+}
+DOWNLOAD_STATS = {
+    'agents/development/frontend-developer': 7, 'commands/git/feature': 4,
+    'templates/python': 3, 'templates/django': 1, 'plugins/toolkit': 2
+}
+UNVALIDATED = {'validated': False, 'valid': None, 'score': None, 'errorCount': 0, 'warningCount': 0, 'lastValidated': None}
+COMPONENT_TYPES = ['agents', 'commands', 'mcps', 'settings', 'hooks', 'sandbox', 'skills']
+
+
+def write_files(root, files):
+    for relative_path, content in files.items():
+        file_path = os.path.join(root, relative_path)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, 'wb') as f:
+            f.write(content.encode('utf-8'))
+
+
+def read_tree(root):
+    """{relative path: bytes} of every file under root"""
+    tree = {}
+    for dir_path, _, file_names in os.walk(root):
+        for file_name in file_names:
+            file_path = os.path.join(dir_path, file_name)
+            with open(file_path, 'rb') as f:
+                tree[os.path.relpath(file_path, root)] = f.read()
+    return tree
+
+
+def expected_catalog():
+    """docs/components.json for CATALOG_FILES, as the single-pass json.dump generator wrote it"""
+    def entry(name, path, category, component_type, content, description='', downloads=0, security=UNVALIDATED):
+        return {
+            'name': name, 'path': path, 'category': category, 'type': component_type, 'content': content,
+            'description': description, 'downloads': downloads, 'security': security
+        }
+
+    return {
+        'agents': [
+            entry('backend-architect', 'development/backend-architect.md', 'development', 'agent',
+                  'Designs APIs\nand services\n'),
+            entry('frontend-developer', 'development/frontend-developer.md', 'development', 'agent',
+                  '---\nname: frontend-developer\n---\nBuilds UIs – naïve café\n', downloads=7),
+            entry('auditor', 'security/auditor.md', 'security', 'agent', 'Audits code\n', security=AUDITOR_SECURITY),
+        ],
+        'commands': [
+            entry('feature', 'git/feature.md', 'git', 'command', 'Start a feature branch\n', downloads=4),
+        ],
+        'mcps': [
+            entry('postgres', 'database/postgres.json', 'database', 'mcp',
+                  CATALOG_FILES['cli-tool/components/mcps/database/postgres.json'], 'Query Postgres'),
+        ],
+        'settings': [
+            entry('allow-git', 'permissions/allow-git.json', 'permissions', 'setting',
+                  CATALOG_FILES['cli-tool/components/settings/permissions/allow-git.json'], 'Allow git commands'),
+        ],
+        'hooks': [
+            entry('format-on-save', 'automation/format-on-save.json', 'automation', 'hook',
+                  CATALOG_FILES['cli-tool/components/hooks/automation/format-on-save.json'], 'Run the formatter'),
+        ],
+        'sandbox': [],
+        'skills': [
+            entry('pdf', 'documents/pdf', 'documents', 'skill',
+                  '---\nname: pdf\ndescription: Work with PDF files\n---\nBody\n', 'Work with PDF files'),
+        ],
+        'templates': [
+            {
+                'name': 'django', 'id': 'django', 'type': 'template', 'subtype': 'framework', 'category': 'frameworks',
+                'language': 'python', 'description': 'Django with Python', 'files': ['README.md'],
+                'installCommand': 'npx claude-code-templates@latest --template=django --yes', 'downloads': 1
+            },
+            {
+                'name': 'python', 'id': 'python', 'type': 'template', 'subtype': 'language', 'category': 'languages',
+                'description': 'Python project template', 'files': ['README.md'],
+                'installCommand': 'npx claude-code-templates@latest --template=python --yes', 'downloads': 3
+            },
+        ],
+        'plugins': [
+            {
+                'name': 'toolkit', 'id': 'toolkit', 'type': 'plugin', 'description': 'Developer toolkit',
+                'version': '2.0.0', 'keywords': ['dev'], 'author': 'Ana', 'commands': 1, 'agents': 1,
+                'mcpServers': 0, 'commandsList': ['git/feature'], 'agentsList': ['security/auditor'],
+                'mcpServersList': [], 'installCommand': '/plugin install toolkit@claude-code-templates',
+                'downloads': 2
+            },
+        ],
+        'marketplace': MARKETPLACE,
+        'componentsMarketplace': COMPONENTS_MARKETPLACE,
+    }
+
+
+class CatalogTreeTestCase(unittest.TestCase):
+    """Runs the generator in a temporary copy of CATALOG_FILES, with stubbed audit and downloads"""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        write_files(self.root, CATALOG_FILES)
+
+        cwd = os.getcwd()
+        os.chdir(self.root)
+        self.addCleanup(os.chdir, cwd)
+
+        for name, value in [('run_security_validation', {'agents/security/auditor': AUDITOR_SECURITY}),
+                            ('fetch_download_stats', DOWNLOAD_STATS)]:
+            patcher = mock.patch.object(gen, name, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def build(self, **kwargs):
+        kwargs.setdefault('cache_dir', '.catalog-cache')
+        return gen.generate_components_json(**kwargs)
+
+    def read(self, path):
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def age_tree(self, root):
+        """Backdate every file under root, so a rewrite shows up as a newer mtime"""
+        for file_path in read_tree(root):
+            os.utime(os.path.join(root, file_path), ns=(10**18, 10**18))
+
+    def rewritten_files(self, root):
+        return sorted(
+            file_path for file_path in read_tree(root)
+            if os.stat(os.path.join(root, file_path)).st_mtime_ns != 10**18
+        )
+
+
+class TestGenerateComponentsJson(CatalogTreeTestCase):
+
+    def test_matches_baseline_output(self):
+        """docs/components.json is byte-identical to a json.dump of the whole catalog"""
+        self.build()
+
+        expected = json.dumps(expected_catalog(), indent=2, ensure_ascii=False).encode('utf-8')
+        self.assertEqual(self.read('docs/components.json'), expected)
+        self.assertEqual(gzip.decompress(self.read('docs/components.json.gz')), expected)
+
+    def test_index_and_content_shards(self):
+        """The index holds every entry without content, which lives in a shard per component"""
+        catalog = self.build()
+
+        with open('docs/components-index.json', encoding='utf-8') as f:
+            index = json.load(f)
+        expected = expected_catalog()
+        self.assertEqual(list(index), list(expected))
+
+        for component_type in COMPONENT_TYPES:
+            self.assertEqual(len(index[component_type]), len(expected[component_type]))
+            for entry, component in zip(index[component_type], expected[component_type]):
+                content = component.pop('content')
+                content_hash = gen.hashlib.sha256(content.encode('utf-8')).hexdigest()
+                shard = f"components/{component_type}/{component['path']}.json"
+                self.assertEqual(entry, {**component, 'contentHash': content_hash, 'shard': shard})
+                with open(os.path.join('docs', shard), encoding='utf-8') as f:
+                    self.assertEqual(json.load(f), {'content': content, 'contentHash': content_hash})
+
+        for key in ['templates', 'plugins', 'marketplace', 'componentsMarketplace']:
+            self.assertEqual(index[key], expected[key])
+        self.assertEqual(catalog.data, index)
+
+    def test_removes_stale_shards(self):
+        """Shards of deleted components, and stray files, are removed on the next build"""
+        self.build()
+        os.remove('cli-tool/components/agents/security/auditor.md')
+        write_files('docs/components', {'agents/old/removed.md.json': '{}'})
+
+        self.build()
+
+        shards = sorted(read_tree('docs/components'))
+        self.assertNotIn(os.path.join('agents', 'security', 'auditor.md.json'), shards)
+        self.assertNotIn(os.path.join('agents', 'old', 'removed.md.json'), shards)
+        self.assertEqual(len(shards), 7)
+        with open('docs/components-index.json', encoding='utf-8') as f:
+            self.assertEqual([entry['name'] for entry in json.load(f)['agents']], ['backend-architect', 'frontend-developer'])
+
+    def test_rerun_is_a_noop(self):
+        """An unchanged tree parses nothing and leaves every output file untouched"""
+        self.build()
+        outputs = read_tree('docs')
+        self.age_tree('docs')
+
+        with mock.patch.object(gen, 'parse_component_file', side_effect=AssertionError('re-parsed')):
+            self.build()
+
+        self.assertEqual(read_tree('docs'), outputs)
+        self.assertEqual(self.rewritten_files('docs'), [])
+
+    def test_rerun_reparses_changed_files_only(self):
+        """Edited files are re-parsed; touched files with the same content are not"""
+        self.build()
+        self.age_tree('docs')
+        write_files('.', {'cli-tool/components/hooks/automation/format-on-save.json': json.dumps({'description': 'Format files'})})
+        os.utime('cli-tool/components/agents/security/auditor.md', ns=(10**18, 10**18))
+
+        with mock.patch.object(gen, 'parse_component_file', wraps=gen.parse_component_file) as parse:
+            self.build()
+
+        self.assertEqual([call.args[0] for call in parse.call_args_list],
+                         [os.path.join('cli-tool/components/hooks', 'automation', 'format-on-save.json')])
+        self.assertEqual(self.rewritten_files('docs'), [
+            'components-index.json', 'components-index.json.gz', 'components.json', 'components.json.gz',
+            os.path.join('components', 'hooks', 'automation', 'format-on-save.json.json')
+        ])
+        with open('docs/components-index.json', encoding='utf-8') as f:
+            self.assertEqual(json.load(f)['hooks'][0]['description'], 'Format files')
+
+    def test_no_cache_matches_incremental_build(self):
+        self.build()
+        write_files('.', {'cli-tool/components/commands/git/feature.md': 'Start a feature\n'})
+        self.build()
+        incremental = read_tree('docs')
+
+        shutil.rmtree('docs')
+        self.build(use_cache=False)
+
+        self.assertEqual(read_tree('docs'), incremental)
+
+    def test_output_independent_of_worker_count(self):
+        """Components are written in catalog order however many threads read them"""
+        write_files('.', {
+            f'cli-tool/components/commands/generated/command-{number:02}.md': f'Command {number}\n' * number
+            for number in range(40)
+        })
+        self.build(workers=1, cache_dir='cache-1')
+        serial = read_tree('docs')
+
+        shutil.rmtree('docs')
+        self.build(workers=8, cache_dir='cache-8')
+
+        self.assertEqual(read_tree('docs'), serial)
+
+    def test_without_monolithic_output(self):
+        self.build(monolithic=False)
+
+        self.assertFalse(os.path.exists('docs/components.json'))
+        self.assertTrue(os.path.exists('docs/components-index.json'))
+
+    def test_brotli_sidecar_skipped_without_module(self):
+        with mock.patch.object(gen, 'brotli', None):
+            self.build(compress=('gz', 'br'))
+
+        self.assertTrue(os.path.exists('docs/components.json.gz'))
+        self.assertFalse(os.path.exists('docs/components.json.br'))
+        self.assertEqual([name for name in os.listdir('docs') if name.endswith('.tmp')], [])
+
+    def test_main_writes_timing_report_profile_and_api(self):
+        """main() times every phase, including the API files derived from the in-memory catalog"""
+        gen.main(['--timing-report', 'reports/timing.json', '--profile', 'build.prof'])
+
+        with open('reports/timing.json', encoding='utf-8') as f:
+            report = json.load(f)
+        phases = {phase['name']: phase for phase in report['phases']}
+        self.assertEqual(report['script'], 'generate_components_json.py')
+        for name in ['security_audit', 'supabase_fetch', 'collect_files', 'templates', 'plugins',
+                     'scan:agents', 'scan:skills', 'serialization', 'api:agents', 'api:search-index']:
+            self.assertIn(name, phases)
+        self.assertEqual(phases['collect_files']['count'], 8)
+        self.assertEqual(phases['scan:agents']['count'], 3)
+        self.assertEqual(phases['scan:agents']['calls'], 3)
+        self.assertEqual(phases['scan:agents']['bytes'], sum(
+            os.path.getsize(path) for path in CATALOG_FILES if path.startswith('cli-tool/components/agents/')
+        ))
+        self.assertGreater(pstats.Stats('build.prof').total_calls, 0)
+
+        with open('docs/api/agents.json', encoding='utf-8') as f:
+            self.assertEqual([agent['path'] for agent in json.load(f)['agents']], [
+                'development/backend-architect', 'development/frontend-developer', 'security/auditor'
+            ])
+
+
+class TestCatalogStreamWriter(unittest.TestCase):
+
+    DATA = {
+        'agents': [
+            {'name': 'naïve', 'nested': {'list': [1, 2.5, None], 'empty': {}}, 'tags': []},
+            {'name': 'quote "and" \\ backslash\n', 'ok': True}
+        ],
+        'sandbox': [],
+        'plugins': [{'keywords': ['a']}],
+        'marketplace': {'name': 'm', 'plugins': [{'x': None}], 'emoji': '🔒'},
+        'version': '1.0'
+    }
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output_dir)
+        self.output_path = os.path.join(self.output_dir, 'catalog', 'components.json')
+        self.expected = json.dumps(self.DATA, indent=2, ensure_ascii=False).encode('utf-8')
+
+    def write(self, data=None, **kwargs):
+        """Stream data like the generator: component lists item by item, the rest in one piece"""
+        writer = gen.CatalogStreamWriter(self.output_path, **kwargs)
+        for key, value in (self.DATA if data is None else data).items():
+            if key in ('agents', 'sandbox'):
+                writer.begin_section(key)
+                for item in value:
+                    writer.add_item(item)
+                writer.end_section()
+            else:
+                writer.add_value(key, value)
+        return writer, writer.close()
+
+    def read(self, path):
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def test_matches_json_dump(self):
+        writer, replaced = self.write()
+
+        self.assertTrue(replaced)
+        self.assertEqual(self.read(self.output_path), self.expected)
+        self.assertEqual(writer.bytes_written, len(self.expected))
+        self.assertEqual(writer.sha256.hexdigest(), gen.hashlib.sha256(self.expected).hexdigest())
+        self.assertEqual(sorted(os.listdir(os.path.dirname(self.output_path))), ['components.json', 'components.json.gz'])
+
+    def test_empty_object(self):
+        self.write({})
+
+        self.assertEqual(self.read(self.output_path), json.dumps({}, indent=2).encode('utf-8'))
+
+    def test_gzip_sidecar_is_reproducible(self):
+        self.write()
+        first_gzip = self.read(f'{self.output_path}.gz')
+        os.remove(self.output_path)
+        self.write()
+
+        self.assertEqual(gzip.decompress(first_gzip), self.expected)
+        self.assertEqual(self.read(f'{self.output_path}.gz'), first_gzip)
+
+    @unittest.skipUnless(gen.brotli, 'brotli module not installed')
+    def test_brotli_sidecar(self):
+        self.write(compress=('gz', 'br'))
+
+        self.assertEqual(gen.brotli.decompress(self.read(f'{self.output_path}.br')), self.expected)
+
+    def test_unchanged_output_is_not_replaced(self):
+        writer, _ = self.write()
+        os.utime(self.output_path, ns=(10**18, 10**18))
+
+        _, replaced = self.write(previous_sha256=writer.sha256.hexdigest())
+
+        self.assertFalse(replaced)
+        self.assertEqual(os.stat(self.output_path).st_mtime_ns, 10**18)
+        self.assertEqual(sorted(os.listdir(os.path.dirname(self.output_path))), ['components.json', 'components.json.gz'])
+
+    def test_missing_sidecar_is_rewritten(self):
+        writer, _ = self.write()
+        os.remove(f'{self.output_path}.gz')
+
+        _, replaced = self.write(previous_sha256=writer.sha256.hexdigest())
+
+        self.assertTrue(replaced)
+        self.assertEqual(gzip.decompress(self.read(f'{self.output_path}.gz')), self.expected)
+
+    def test_abort_keeps_previous_output(self):
+        self.write()
+        writer = gen.CatalogStreamWriter(self.output_path)
+        writer.add_value('partial', [1])
+        writer.abort()
+
+        self.assertEqual(self.read(self.output_path), self.expected)
+        self.assertEqual(sorted(os.listdir(os.path.dirname(self.output_path))), ['components.json', 'components.json.gz'])
+
+
+class TestSecurityAuditCache(unittest.TestCase):
+
+    COMPONENT_FILES = {
+        'cli-tool/components/agents/development/frontend-developer.md': 'Builds UIs\n',
+        'cli-tool/components/agents/security/auditor.md': 'Audits code\n',
+        'cli-tool/components/commands/git/feature.md': 'Start a feature branch\n',
+        'cli-tool/components/mcps/database/postgres.json': '{}',
+        'cli-tool/components/skills/documents/pdf/SKILL.md': 'Not audited\n',
+        'cli-tool/src/security-audit.js': '// audit\n',
+        'cli-tool/src/validation/ValidationOrchestrator.js': '// validators\n',
+    }
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        write_files(self.root, self.COMPONENT_FILES)
+        self.components_dir = os.path.join(self.root, 'cli-tool', 'components')
+        self.cache_path = os.path.join(self.root, '.catalog-cache', gen.SECURITY_CACHE_NAME)
+
+        # run_security_validation finds cli-tool next to the script
+        patcher = mock.patch.object(gen, '__file__', os.path.join(self.root, 'generate_components_json.py'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.audits = []
+        self.unaudited = set()
+        self.run_security_audit = gen.run_security_audit
+        patcher = mock.patch.object(gen, 'run_security_audit', side_effect=self.fake_audit)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def fake_audit(self, cli_tool_dir, files_list_path=None):
+        """Audit the listed files (or every .md component), scoring each by its content length"""
+        if files_list_path:
+            with open(files_list_path, encoding='utf-8') as f:
+                file_paths = f.read().split('\n')
+        else:
+            file_paths = [path for path, _ in gen.collect_security_audit_files(self.components_dir).values()]
+        self.audits.append(sorted(os.path.relpath(path, self.components_dir) for path in file_paths))
+
+        lookup = {}
+        for file_path in file_paths:
+            type_dir, category, file_name = os.path.relpath(file_path, self.components_dir).split(os.sep)
+            key = f"{type_dir}/{category}/{os.path.splitext(file_name)[0]}"
+            if key not in self.unaudited:
+                lookup[key] = {'validated': True, 'score': os.path.getsize(file_path)}
+        return lookup
+
+    def edit(self, relative_path, content):
+        write_files(self.root, {relative_path: content})
+
+    def test_second_run_reuses_cached_results(self):
+        first = gen.run_security_validation(self.cache_path)
+        second = gen.run_security_validation(self.cache_path)
+
+        self.assertEqual(self.audits, [[
+            os.path.join('agents', 'development', 'frontend-developer.md'),
+            os.path.join('agents', 'security', 'auditor.md'),
+            os.path.join('commands', 'git', 'feature.md'),
+        ]])
+        self.assertEqual(second, first)
+        self.assertEqual(sorted(first), ['agents/development/frontend-developer', 'agents/security/auditor', 'commands/git/feature'])
+
+    def test_changed_component_is_reaudited(self):
+        gen.run_security_validation(self.cache_path)
+        self.edit('cli-tool/components/agents/security/auditor.md', 'Audits code and dependencies\n')
+
+        results = gen.run_security_validation(self.cache_path)
+
+        self.assertEqual(self.audits[1], [os.path.join('agents', 'security', 'auditor.md')])
+        self.assertEqual(results['agents/security/auditor']['score'], len('Audits code and dependencies\n'))
+        self.assertEqual(results['commands/git/feature']['score'], len('Start a feature branch\n'))
+
+    def test_validator_change_reaudits_everything(self):
+        gen.run_security_validation(self.cache_path)
+        self.edit('cli-tool/src/validation/ValidationOrchestrator.js', '// stricter validators\n')
+
+        gen.run_security_validation(self.cache_path)
+
+        self.assertEqual(self.audits[1], self.audits[0])
+
+    def test_failed_audits_are_retried(self):
+        """Components missing from the audit report are not cached, so the next run retries them"""
+        self.unaudited = {'agents/security/auditor'}
+        first = gen.run_security_validation(self.cache_path)
+        self.assertNotIn('agents/security/auditor', first)
+
+        self.unaudited = set()
+        second = gen.run_security_validation(self.cache_path)
+
+        self.assertEqual(self.audits[1], [os.path.join('agents', 'security', 'auditor.md')])
+        self.assertIn('agents/security/auditor', second)
+
+    def test_refresh_reaudits_everything(self):
+        gen.run_security_validation(self.cache_path)
+        gen.run_security_validation(self.cache_path, refresh_cache=True)
+
+        self.assertEqual(self.audits[1], self.audits[0])
+
+    def test_passes_changed_files_to_security_audit_js(self):
+        """Only the changed files reach `npm run security-audit:json -- --files=<list>`"""
+        gen.run_security_validation(self.cache_path)
+        self.edit('cli-tool/components/commands/git/feature.md', 'Start a release branch\n')
+        commands = []
+
+        def fake_run(command, cwd, **kwargs):
+            commands.append(command)
+            with open(command[-1].split('=', 1)[1], encoding='utf-8') as f:
+                listed = f.read().split('\n')
+            report = {'timestamp': 'now', 'components': [
+                {'component': {'path': os.path.relpath(path, cwd), 'type': 'command'}, 'overall': {'valid': True, 'score': 90}, 'validators': {}}
+                for path in listed
+            ]}
+            with open(os.path.join(cwd, 'security-report.json'), 'w', encoding='utf-8') as f:
+                json.dump(report, f)
+            return subprocess.CompletedProcess(command, 0, '', '')
+
+        with mock.patch.object(gen, 'run_security_audit', new=self.run_security_audit), \
+                mock.patch.object(gen.subprocess, 'run', side_effect=fake_run):
+            results = gen.run_security_validation(self.cache_path)
+
+        files_list_path = os.path.join(self.root, '.catalog-cache', 'security-audit-files.txt')
+        self.assertEqual(commands, [['npm', 'run', 'security-audit:json', '--', f'--files={files_list_path}']])
+        self.assertEqual(results['commands/git/feature']['score'], 90)
+        self.assertTrue(results['agents/security/auditor']['validated'])
+
+
+@unittest.skipUnless(
+    shutil.which('node') and os.path.isdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cli-tool', 'node_modules')),
+    'node and the cli-tool npm dependencies are needed to run security-audit.js'
+)
+class TestSecurityAuditScript(unittest.TestCase):
+
+    def test_files_option_restricts_the_audit(self):
+        """security-audit.js --files=<list> only audits the listed component files"""
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        write_files(root, {
+            'cli-tool/components/agents/security/auditor.md': '---\nname: auditor\ndescription: Audits code\n---\nAudits code\n',
+            'cli-tool/components/commands/git/feature.md': '---\ndescription: Start a feature\n---\nStart a feature branch\n',
+        })
+        cli_tool_dir = os.path.join(root, 'cli-tool')
+        files_list_path = os.path.join(root, 'files.txt')
+        with open(files_list_path, 'w', encoding='utf-8') as f:
+            f.write(os.path.join(cli_tool_dir, 'components', 'commands', 'git', 'feature.md'))
+
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cli-tool', 'src', 'security-audit.js')
+        subprocess.run(
+            ['node', script, '--json', '--output=security-report.json', f'--files={files_list_path}'],
+            cwd=cli_tool_dir, capture_output=True, text=True, timeout=120
+        )
+
+        with open(os.path.join(cli_tool_dir, 'security-report.json'), encoding='utf-8') as f:
+            lookup = gen.extract_security_lookup(json.load(f))
+        self.assertEqual(list(lookup), ['commands/git/feature'])
+
+
+class TestBuildTimer(unittest.TestCase):
+
+    def test_phases_accumulate(self):
+        timer = BuildTimer('script.py')
+        for size in (10, 20):
+            with timer.phase('scan') as phase:
+                phase['count'] += 1
+                phase['bytes'] += size
+        timer.record('write', 0.5, 3, 100)
+
+        report = timer.report()
+
+        self.assertEqual(report['script'], 'script.py')
+        self.assertEqual([phase['name'] for phase in report['phases']], ['scan', 'write'])
+        scan, write = report['phases']
+        self.assertEqual((scan['count'], scan['bytes'], scan['calls']), (2, 30, 2))
+        self.assertEqual(write, {'name': 'write', 'seconds': 0.5, 'count': 3, 'bytes': 100, 'calls': 1})
+        self.assertGreaterEqual(report['totalSeconds'], scan['seconds'])
+
+    def test_phase_is_recorded_when_the_block_raises(self):
+        timer = BuildTimer('script.py')
+        with self.assertRaises(ValueError):
+            with timer.phase('fetch') as phase:
+                phase['count'] = 4
+                raise ValueError
+
+        self.assertEqual(timer.phases['fetch']['count'], 4)
+
+    def test_write_report(self):
+        output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, output_dir)
+        timer = BuildTimer('script.py')
+        timer.record('scan', 0.25, 2, 10)
+
+        report_path = os.path.join(output_dir, 'reports', 'timing.json')
+        timer.write_report(report_path)
+
+        with open(report_path, encoding='utf-8') as f:
+            report = json.load(f)
+        self.assertEqual(report['phases'], timer.report()['phases'])
+        self.assertEqual(report['startedAt'], timer.started_at.isoformat())
+
+    def test_profiled(self):
+        output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, output_dir)
+        profile_path = os.path.join(output_dir, 'run.prof')
+
+        with profiled(profile_path):
+            sorted(range(1000), key=lambda x: -x)
+        with profiled(None):
+            pass
+
+        self.assertGreater(pstats.Stats(profile_path).total_calls, 0)
+        self.assertEqual(os.listdir(output_dir), ['run.prof'])
+
+
+class TestCatalog(unittest.TestCase):
+
+    DATA = {
+        'agents': [{'name': 'a', 'category': 'x'}, {'name': 'b', 'category': 'y'}],
+        'marketplace': {'name': 'metadata'},
+        'commands': [],
+        'version': 2,
+    }
+
+    def test_types_components_and_metadata(self):
+        catalog = Catalog(self.DATA)
+
+        self.assertEqual(catalog.types(), ['agents', 'commands'])
+        self.assertEqual([component['name'] for component in catalog.components('agents')], ['a', 'b'])
+        self.assertEqual(catalog.components('commands'), [])
+        self.assertEqual(catalog.components('plugins'), [])
+        self.assertEqual(catalog.metadata, {'marketplace': {'name': 'metadata'}, 'version': 2})
+
+    def test_from_json_file(self):
+        output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, output_dir)
+        catalog_path = Path(output_dir) / 'components-index.json'
+        catalog_path.write_text(json.dumps(self.DATA), encoding='utf-8')
+
+        self.assertEqual(Catalog.from_json_file(catalog_path).data, self.DATA)
+
+if __name__ == '__main__':
+    unittest.main()